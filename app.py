@@ -5,13 +5,31 @@
 - **CLOUD READY: Uses st.secrets for Google Sheets authentication.**
 """
 
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
 import streamlit as st
 import pandas as pd
-import gspread
-# NOTE: oauth2client is no longer strictly needed for st.secrets method, 
-# but kept here if other libraries rely on it. gspread handles the dict auth.
-from oauth2client.service_account import ServiceAccountCredentials 
 from datetime import datetime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from workshop_analytics import (
+    COL_BACKGROUND, COL_CONFIDENCE, COL_FACILITATOR_RATING, COL_FEEDBACK, COL_ONE_THING,
+    COL_SESSION, COL_FEEDBACK_CLUSTER, COL_FEEDBACK_SENTIMENT, COL_ONE_THING_CLUSTER, COL_ONE_THING_SENTIMENT,
+    FEEDBACK_CATEGORIES, NEGATIVE_POLARITY, PERCENT_METRICS, POSITIVE_POLARITY, SUGGESTION_LABELS,
+    TrendEngine, bootstrap_intervals, compare_workshops, compute_trends, extract_top_quotes, feedback_theme_counts,
+    filter_by_labels, health_score, metric_indicators, prepare_responses, strength_cooccurrence, strength_counts,
+    workshop_fingerprints
+)
+from report_jobs import DEFAULT_QUEUE_FILE, JobQueue, WorkerPool, save_snapshot
+from response_store import open_store
+from sheet_loader import load_responses
+from telemetry import telemetry
 
 # =========================
 # CONFIG
@@ -1137,13 +1155,20 @@ div[data-testid="stVerticalBlock"] > div:nth-child(1) {
 
 @st.cache_data
 def load_data():
+
+    # 0. Local CSV snapshot (synthetic data for benchmarks, offline demos)
+    data_file = os.environ.get("WORKSHOP_DATA_FILE")
+    if data_file:
+        with telemetry.span("dataframe_build", source="csv"):
+            return prepare_responses(pd.read_csv(data_file))
     
     # 1. Attempt to connect using st.secrets (Cloud-Ready Method)
     try:
         # Read credentials from the environment variable (Streamlit Secrets)
         creds = st.secrets["gcp_service_account"]
         
-        # Authenticate using the dictionary data
+        # Authenticate using the dictionary data (gspread loads only on this path)
+        import gspread
         client = gspread.service_account_from_dict(creds)
         
         # Read the sheet name, preferring st.secrets["SHEET_NAME"]
@@ -1153,9 +1178,15 @@ def load_data():
             # Fallback to hardcoded name if SHEET_NAME wasn't explicitly set in secrets
             sheet_name = "75HER Workshop Survey Responses"
 
-        sheet = client.open(sheet_name).sheet1
-        data = sheet.get_all_records()
-        return pd.DataFrame(data)
+        # Several events/cohorts can be merged via a SHEET_SOURCES list in secrets
+        try:
+            sources = [{"sheet": s} if isinstance(s, str) else dict(s) for s in st.secrets["SHEET_SOURCES"]]
+        except KeyError:
+            sources = [{"sheet": sheet_name}]
+        data = load_responses(client, sources)
+
+        with telemetry.span("dataframe_build", rows=len(data)):
+            return prepare_responses(data)
 
     except (KeyError, Exception) as e:
         # 2. If secrets fail or are missing, load dummy data and raise a warning
@@ -1163,21 +1194,84 @@ def load_data():
         
         # Dummy data for demonstration
         data = {
+            'Submission Date': ['2025-03-08 10:15:00', '2025-03-08 11:02:00', '2025-03-09 14:30:00', '2025-03-10 09:45:00'],
             'Which session did you attend?': ['Data Viz Fundamentals', 'Data Viz Fundamentals', 'Advanced Python', 'Advanced Python'],
             'How confident do you feel implementing what you learned today? ': [5, 4, 3, 5],
             'The facilitator today was:': ['🌟 Excellent - Clear, engaging, well-paced', '✅ Good - Helpful and informative', '✅ Good - Helpful and informative', '🌟 Excellent - Clear, engaging, well-paced'],
             'Was the workshop pace/level right for you?': ['Just right - Perfect pace for my level', 'Slightly too slow - I wanted to go deeper', 'Slightly too fast - I could barely keep up', 'Just right - Perfect pace for my level'],
             "Did you create a hands-on deliverable today?": ['Yes - I created/started [code sample / prototype / document / project file]', 'Yes - I followed along but need to finish it', 'No - I ran out of time', 'Yes - I created/started [code sample / prototype / document / project file]'],
             "Your background in this topic:": ["Beginner", "Intermediate", "Expert", "Beginner"],
+            "The facilitator today: (Select all that apply)": ["['Explained concepts clearly', 'Encouraged questions']", "['Explained concepts clearly']", "['Shared real-world examples, tools, and templates']", "['Encouraged questions', 'Shared real-world examples, tools, and templates']"],
             "What did the facilitator do especially well? Any suggestions for improvement?": ["Very clear examples and great energy.", "I wish we had more time for Q&A.", "Too fast for me, slow down!", "Pacing was spot-on. Solid content."],
             "What's ONE thing you'll try this week based on today's workshop?": ["Apply the Gestalt principles to my next report.", "Refactor my old Python script with new functions.", "Nothing yet, need to review my notes.", "Build a new dashboard with Streamlit."]
         }
-        return pd.DataFrame(data)
+        return prepare_responses(pd.DataFrame(data))
+
+
+@st.cache_data
+def load_strength_breakdown() -> pd.DataFrame:
+    """Strength selection counts per workshop, computed once per data load"""
+    return strength_counts(load_data(), by=COL_SESSION)
+
+
+@st.cache_data
+def load_strength_cooccurrence() -> dict:
+    """Strength co-selection matrices per workshop plus an overall one"""
+    df = load_data()
+    matrices = strength_cooccurrence(df, by=COL_SESSION)
+    matrices["All workshops"] = strength_cooccurrence(df)
+    return matrices
+
+
+@st.cache_data
+def load_workshop_comparison() -> pd.DataFrame:
+    """All workshops' metrics and health scores from a single grouped pass"""
+    return compare_workshops(load_data(), by=COL_SESSION)
+
+
+@st.cache_data
+def load_workshop_intervals() -> pd.DataFrame:
+    """95% bootstrap intervals for every workshop, computed once per data load"""
+    return bootstrap_intervals(load_data(), by=COL_SESSION)
+
+
+@st.cache_resource
+def get_trend_engine() -> TrendEngine:
+    """Daily metric totals shared across reruns; only new rows are folded in"""
+    return TrendEngine(freq="D")
+
+
+@st.cache_resource
+def get_response_store():
+    """SQL store named by WORKSHOP_DB (None when unset), seeded with the loaded responses"""
+    return open_store(os.environ.get("WORKSHOP_DB"), load_data())
+
+
+@st.cache_data
+def load_workshop_fingerprints() -> dict:
+    """Per-workshop data versions; a workshop's PDF is re-rendered only when its responses change"""
+    return workshop_fingerprints(load_data())
+
+
+@st.cache_data(max_entries=32)
+def load_store_metrics(version: int, workshop: str, background) -> dict:
+    """calculate_metrics()-shaped numbers from the store, recomputed only when `version` moves"""
+    return get_response_store().workshop_metrics(workshop, background)
+
+
+@st.cache_data(max_entries=8)
+def load_store_responses(version: int, workshop: str, background) -> pd.DataFrame:
+    """One workshop's stored responses (for the quote panel), re-read only when `version` moves"""
+    df_w = get_response_store().responses(workshop)
+    if background is not None:
+        df_w = df_w[df_w[COL_BACKGROUND] == background]
+    return df_w
 
 # =========================
 # METRIC CALCULATION (No changes)
 # =========================
 
+@telemetry.timed("metrics")
 def calculate_metrics(df_w: pd.DataFrame) -> dict:
     total = len(df_w)
     if total == 0:
@@ -1187,58 +1281,13 @@ def calculate_metrics(df_w: pd.DataFrame) -> dict:
             "hands_completion": 0, "hands_created": 0, "hands_followed": 0
         }
 
-    col_conf = "How confident do you feel implementing what you learned today? "
-    col_fac = "The facilitator today was:"
-    col_pace = "Was the workshop pace/level right for you?"
-    col_hands = "Did you create a hands-on deliverable today?"
-
-    conf = pd.to_numeric(df_w[col_conf], errors="coerce").mean()
-
-    # Facilitator
-    fac_counts = df_w[col_fac].value_counts()
-    exc = fac_counts.get("🌟 Excellent - Clear, engaging, well-paced", 0)
-    good = fac_counts.get("✅ Good - Helpful and informative", 0)
-    excellent_pct = (exc / total * 100)
-    good_pct = ((exc + good) / total * 100)
-
-    # Pacing
-    pace_counts = df_w[col_pace].value_counts()
-    just = pace_counts.get("Just right - Perfect pace for my level", 0)
-    fast = (
-        pace_counts.get("Slightly too fast - I could barely keep up", 0)
-        + pace_counts.get("Too advanced - I felt lost", 0)
-    )
-    slow = (
-        pace_counts.get("Slightly too slow - I wanted to go deeper", 0)
-        + pace_counts.get("Too basic - I already knew most of this", 0)
-    )
-    pace_just = (just / total * 100)
-    pace_fast = (fast / total * 100)
-    pace_slow = (slow / total * 100)
-
-    # Hands-on
-    hands_counts = df_w[col_hands].value_counts()
-    created = hands_counts.get(
-        "Yes - I created/started [code sample / prototype / document / project file]", 0
-    )
-    followed = hands_counts.get(
-        "Yes - I followed along but need to finish it", 0
-    )
-    hands_completion = ((created + followed) / total * 100)
-    hands_created = (created / total * 100)
-    hands_followed = (followed / total * 100)
-
+    # Columns are found through the ingest schema, by position
+    means = metric_indicators(df_w).mean()
+    conf = means["confidence"]
     return {
         "total": total,
         "confidence": float(conf) if pd.notna(conf) else 0.0,
-        "excellent_pct": excellent_pct,
-        "good_pct": good_pct,
-        "pace_just": pace_just,
-        "pace_fast": pace_fast,
-        "pace_slow": pace_slow,
-        "hands_completion": hands_completion,
-        "hands_created": hands_created,
-        "hands_followed": hands_followed,
+        **{name: float(means[name]) for name in PERCENT_METRICS},
     }
 
 # =========================
@@ -1246,11 +1295,8 @@ def calculate_metrics(df_w: pd.DataFrame) -> dict:
 # =========================
 
 def render_hero_card(metrics: dict, workshop_name: str, total_responses: int):
-    health_score = (
-        (metrics["confidence"] / 5.0) * 25
-        + (metrics["excellent_pct"] / 100) * 25
-        + (metrics["hands_created"] / 100) * 25
-        + (metrics["pace_just"] / 100) * 25
+    health = health_score(
+        metrics["confidence"], metrics["excellent_pct"], metrics["hands_created"], metrics["pace_just"]
     )
 
     if metrics["confidence"] < 3.5 and metrics["hands_created"] < 40:
@@ -1259,7 +1305,7 @@ def render_hero_card(metrics: dict, workshop_name: str, total_responses: int):
         recommendation = "Slow down or add comprehension checkpoints after key concepts."
     elif metrics["pace_slow"] > 25:
         recommendation = "Increase content density or add optional, deeper content for experts."
-    elif health_score >= 80:
+    elif health >= 80:
         recommendation = "Workshop performing excellently—maintain current structure and content!"
     else:
         recommendation = "Solid foundation. Focus on improving one of the four key metrics below."
@@ -1283,7 +1329,7 @@ def render_hero_card(metrics: dict, workshop_name: str, total_responses: int):
       <div class="hero-title">{workshop_name}</div>
       <div class="hero-row">
         <span class="small-label">Overall Health</span>
-        <span class="hero-health">{health_score:.0f}/100</span>
+        <span class="hero-health">{health:.0f}/100</span>
       </div>
       <div class="hero-insights">
         {' · '.join(insights) if insights else "Steady performance across core metrics."}
@@ -1302,7 +1348,19 @@ def render_hero_card(metrics: dict, workshop_name: str, total_responses: int):
     st.markdown(hero_html, unsafe_allow_html=True)
 
 
-def render_confidence_card(metrics: dict):
+def interval_text(intervals: dict, metric: str, fmt: str = "{:.0f}%") -> str:
+    if not intervals or pd.isna(intervals.get(f"{metric}_low")):
+        return ""
+    return f"{fmt.format(intervals[f'{metric}_low'])}–{fmt.format(intervals[f'{metric}_high'])}"
+
+
+def interval_html(text: str) -> str:
+    if not text:
+        return ""
+    return f'<div style="font-size:0.85rem;color:var(--muted-text);margin-top:0.5rem;">95% interval: {text}</div>'
+
+
+def render_confidence_card(metrics: dict, intervals: dict = None):
     confidence = metrics["confidence"]
     total = metrics["total"]
     
@@ -1331,6 +1389,7 @@ def render_confidence_card(metrics: dict):
       <h3>Confidence Gains</h3>
       <div class="metric-value" style="color:{value_color_var};">{confidence:.1f}<span style="font-size:1.5rem;color:var(--muted-text);">/5.0</span></div>
       <div class="metric-sub">{status_text}</div>
+      {interval_html(interval_text(intervals, "confidence", "{:.1f}"))}
       <div class="progress-bar">
         <div class="target-line" style="left:70%;"></div> 
         <div class="progress-fill {bar_color}" style="width:{width}%;"></div>
@@ -1345,7 +1404,7 @@ def render_confidence_card(metrics: dict):
     st.markdown(html, unsafe_allow_html=True)
 
 
-def render_pacing_card(metrics: dict):
+def render_pacing_card(metrics: dict, intervals: dict = None):
     j, f, s = metrics["pace_just"], metrics["pace_fast"], metrics["pace_slow"]
     
     dominant_pace_html = f"{j:.0f}% <span style='font-size:1.5rem;color:var(--muted-text);'>just right</span>"
@@ -1358,6 +1417,13 @@ def render_pacing_card(metrics: dict):
         dominant_pace_html = f"{s:.0f}% <span style='font-size:1.5rem;color:var(--muted-text);'>too slow</span>"
         pace_text_color = "var(--primary)"
 
+    pace_intervals = ""
+    if interval_text(intervals, "pace_just"):
+        pace_intervals = " · ".join(
+            f"{label} {interval_text(intervals, key)}"
+            for label, key in [("just right", "pace_just"), ("too fast", "pace_fast"), ("too slow", "pace_slow")]
+        )
+
     html = f"""
     <div class="metric-card">
       <h3>Workshop Pacing</h3>
@@ -1372,12 +1438,13 @@ def render_pacing_card(metrics: dict):
         <span style="color:var(--warning);">⚡ Too Fast: {f:.0f}%</span>
         <span style="color:var(--primary);">🐢 Too Slow: {s:.0f}%</span>
       </div>
+      {interval_html(pace_intervals)}
     </div>
     """
     st.markdown(html, unsafe_allow_html=True)
 
 
-def render_facilitator_card(metrics: dict):
+def render_facilitator_card(metrics: dict, intervals: dict = None):
     excellent_pct = metrics["excellent_pct"]
     good_pct = metrics["good_pct"]
 
@@ -1395,6 +1462,7 @@ def render_facilitator_card(metrics: dict):
       <h3>Facilitator Rating</h3>
       <div class="metric-value">{excellent_pct:.0f}%<span style="font-size:1.5rem;color:var(--muted-text);"> excellent</span></div>
       <div class="metric-sub">{status_icon} {status_text}</div>
+      {interval_html(interval_text(intervals, "excellent_pct"))}
       <div class="progress-bar">
         <div class="progress-fill {bar_color}" style="width:{width}%;"></div>
       </div>
@@ -1406,7 +1474,7 @@ def render_facilitator_card(metrics: dict):
     st.markdown(html, unsafe_allow_html=True)
 
 
-def render_hands_on_card(metrics: dict):
+def render_hands_on_card(metrics: dict, intervals: dict = None):
     created = metrics["hands_created"]
     followed = metrics["hands_followed"]
     completion = metrics["hands_completion"]
@@ -1418,11 +1486,14 @@ def render_hands_on_card(metrics: dict):
     else:
         bar_color, status = "warning", "⚠️ Increase Guided Practice"
 
+    completion_interval = interval_text(intervals, "hands_completion")
+
     html = f"""
     <div class="metric-card">
       <h3>Hands-On Engagement</h3>
       <div class="metric-value">{created:.0f}%<span style="font-size:1.5rem;color:var(--muted-text);"> created deliverable</span></div>
       <div class="metric-sub">{status} ({completion:.0f}% total completion)</div>
+      {interval_html(f"completion {completion_interval}" if completion_interval else "")}
       
       <div class="pacing-bar" style="height:8px; margin: 8px 0;">
         <div class="pace-segment progress-fill excellent" style="width:{created}%;"></div>
@@ -1438,15 +1509,108 @@ def render_hands_on_card(metrics: dict):
     st.markdown(html, unsafe_allow_html=True)
 
 
+def render_strengths_card(counts: pd.Series, total: int):
+    counts = counts[counts > 0].sort_values(ascending=False).head(6)
+    if counts.empty or total == 0:
+        return
+
+    rows = ""
+    for strength, count in counts.items():
+        pct = count / total * 100
+        rows += f"""
+      <div style="display:flex; justify-content:space-between; font-size:0.95rem; margin-top:1rem;">
+        <span>{strength}</span>
+        <span style="color:var(--muted-text); font-weight:600;">{count} · {pct:.0f}%</span>
+      </div>
+      <div class="progress-bar" style="height:8px; margin-top:0.5rem;">
+        <div class="progress-fill good" style="width:{pct}%;"></div>
+      </div>"""
+
+    html = f"""
+    <div class="metric-card">
+      <h3>Facilitator Strengths</h3>
+      <div class="metric-sub">What builders said the facilitator did (select all that apply)</div>
+      {rows}
+    </div>
+    """
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def render_workshop_comparison(comparison: pd.DataFrame):
+    st.markdown('<h2>🏆 Workshop Comparison</h2>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="subtitle">Every workshop side by side, ranked by overall health.</div>',
+        unsafe_allow_html=True,
+    )
+
+    table = comparison.reset_index()[[
+        "rank", "workshop", "health", "total", "confidence", "excellent_pct",
+        "good_pct", "pace_just", "pace_fast", "pace_slow", "hands_created", "hands_completion",
+    ]]
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "rank": st.column_config.NumberColumn("Rank", format="#%d"),
+            "workshop": st.column_config.TextColumn("Workshop"),
+            "health": st.column_config.ProgressColumn("Health", min_value=0, max_value=100, format="%.0f"),
+            "total": st.column_config.NumberColumn("Responses"),
+            "confidence": st.column_config.NumberColumn("Confidence", format="%.1f"),
+            "excellent_pct": st.column_config.NumberColumn("Excellent", format="%.0f%%"),
+            "good_pct": st.column_config.NumberColumn("Good or better", format="%.0f%%"),
+            "pace_just": st.column_config.NumberColumn("Pace: just right", format="%.0f%%"),
+            "pace_fast": st.column_config.NumberColumn("Pace: too fast", format="%.0f%%"),
+            "pace_slow": st.column_config.NumberColumn("Pace: too slow", format="%.0f%%"),
+            "hands_created": st.column_config.NumberColumn("Created deliverable", format="%.0f%%"),
+            "hands_completion": st.column_config.NumberColumn("Hands-on completion", format="%.0f%%"),
+        },
+    )
+
+
+def render_trend_charts(trend: pd.DataFrame, window: int):
+    st.markdown('<h2>📈 Trends Over Time</h2>', unsafe_allow_html=True)
+    if trend.empty:
+        st.info("No submission timestamps found, so trends can't be plotted yet.")
+        return
+
+    rolling = f" (rolling {window})"
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"#### Confidence (daily and {window}-day rolling)")
+        st.line_chart(
+            trend[["confidence", "confidence" + rolling]].rename(columns={"confidence" + rolling: "rolling"}),
+            use_container_width=True,
+        )
+    with col2:
+        st.markdown(f"#### Key rates, {window}-day rolling (%)")
+        rates = trend[[m + rolling for m in ["excellent_pct", "pace_just", "pace_fast", "pace_slow", "hands_completion"]]]
+        rates.columns = ["Excellent", "Pace: just right", "Pace: too fast", "Pace: too slow", "Hands-on completion"]
+        st.line_chart(rates, use_container_width=True)
+
+
 def render_summary_quotes(df_w: pd.DataFrame):
-    pos_col = "What did the facilitator do especially well? Any suggestions for improvement?"
-    act_col = "What's ONE thing you'll try this week based on today's workshop?"
+    pos_col = COL_FEEDBACK
+    act_col = COL_ONE_THING
     
     if pos_col in df_w.columns:
-        positive_feedback = [q for q in df_w[pos_col].dropna() if all(k not in q.lower() for k in ["suggestion", "improve", "faster", "slower"])][:5]
-        suggestions = [q for q in df_w[pos_col].dropna() if any(k in q.lower() for k in ["suggestion", "improve", "faster", "slower"])][:5]
+        feedback = df_w[df_w[pos_col].notna()]
+        praise = filter_by_labels(feedback, SUGGESTION_LABELS, exclude=True)
+        positive_feedback = extract_top_quotes(
+            praise[pos_col], n=5, mode='ranked',
+            sentiment=praise.get(COL_FEEDBACK_SENTIMENT), clusters=praise.get(COL_FEEDBACK_CLUSTER)
+        )
+        constructive = filter_by_labels(feedback, SUGGESTION_LABELS)
+        suggestions = extract_top_quotes(
+            constructive[pos_col], n=5, clusters=constructive.get(COL_FEEDBACK_CLUSTER)
+        )
+        themes = feedback_theme_counts(df_w)
 
         with st.expander("💬 Review Feedback & Suggestions", expanded=True):
+            st.markdown(
+                "**Themes (distinct comments):** "
+                + " · ".join(f"{theme.title()} {count}" for theme, count in themes.items())
+            )
             
             st.markdown("### 💚 What builders loved")
             if positive_feedback:
@@ -1464,13 +1628,206 @@ def render_summary_quotes(df_w: pd.DataFrame):
     
     st.markdown("### 🚀 Commitment to Action")
     if act_col in df_w.columns:
-        action_items = df_w[act_col].dropna().head(4)
-        if not action_items.empty:
+        action_items = extract_top_quotes(
+            df_w[act_col], n=4, mode='ranked',
+            sentiment=df_w.get(COL_ONE_THING_SENTIMENT), clusters=df_w.get(COL_ONE_THING_CLUSTER)
+        )
+        if action_items:
             for q in action_items:
                 st.markdown(f'<div class="quote-card">"{q}"</div>', unsafe_allow_html=True)
         else:
             st.info("No actionable commitments recorded yet.")
 
+# =========================
+# LIVE SECTIONS
+# =========================
+
+# Seconds between store polls while "Live updates" is on; each poll is one
+# MAX(rowid) query, and the cards are only recomputed when it has moved
+LIVE_REFRESH_SECONDS = 10
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_metrics(workshop: str, background, intervals: dict = None):
+    """Hero and metric cards that refresh on their own as responses reach the store"""
+    metrics = load_store_metrics(get_response_store().version(), workshop, background)
+    if metrics["total"] == 0:
+        st.info("No stored responses for this selection yet.")
+        return
+
+    render_hero_card(metrics, workshop, metrics["total"])
+    st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+    st.markdown('<h2>📊 Core Metric Analysis</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        render_confidence_card(metrics, intervals)
+        render_hands_on_card(metrics, intervals)
+    with col2:
+        render_facilitator_card(metrics, intervals)
+        render_pacing_card(metrics, intervals)
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_quotes(workshop: str, background):
+    """Quote panel that refreshes on its own as responses reach the store"""
+    df_w = load_store_responses(get_response_store().version(), workshop, background)
+    render_summary_quotes(df_w)
+
+# =========================
+# PDF EXPORT
+# =========================
+
+# WeasyPrint layouts at once; more requests wait in the pool's queue
+PDF_EXPORT_WORKERS = 2
+# Finished PDFs kept per server process (oldest dropped first)
+PDF_CACHE_ENTRIES = 16
+# How often the export panel checks on a pending render; it only polls while
+# a render is pending
+PDF_POLL_SECONDS = 2
+
+
+class PdfExports:
+    """Bounded process pool for PDF renders, with results kept by (data version, selection)
+
+    WeasyPrint layout is pure Python and holds the GIL, so renders run in
+    their own processes rather than stalling every session's reruns. The
+    server is multi-threaded, so workers are spawned rather than forked.
+    """
+
+    def __init__(self, workers: int = PDF_EXPORT_WORKERS, entries: int = PDF_CACHE_ENTRIES):
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._futures = OrderedDict()
+        self._entries = entries
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._futures:
+                self._futures.move_to_end(key)
+            return self._futures.get(key)
+
+    def submit(self, key, fn, *args):
+        """Start a render unless one for `key` is already running or done"""
+        with self._lock:
+            if key not in self._futures:
+                self._futures[key] = self._pool.submit(fn, *args)
+                while len(self._futures) > self._entries:
+                    self._futures.popitem(last=False)
+            return self._futures[key]
+
+    def discard(self, key):
+        with self._lock:
+            self._futures.pop(key, None)
+
+
+@st.cache_resource
+def get_pdf_exports() -> PdfExports:
+    return PdfExports()
+
+
+@st.fragment
+def render_pdf_export(workshop: str, df_w: pd.DataFrame, cache_key: tuple, themes=()):
+    """Prepare/Download buttons; the render runs in a worker process and the panel never waits on it"""
+    exports = get_pdf_exports()
+    future = exports.get(cache_key)
+    if future is None:
+        if not st.button("🖨️ Prepare PDF", key="prepare_pdf", help="Render this view with the branded PDF template"):
+            return
+        # Module-level function, so the worker process can import it by name
+        from workshop_report_pdf import render_pdf_bytes
+        future = exports.submit(cache_key, render_pdf_bytes, df_w, workshop, list(themes) or None)
+
+    if not future.done():
+        follow_pdf_export(cache_key)
+        return
+    if future.exception() is not None or future.result() is None:
+        error = future.exception()
+        exports.discard(cache_key)
+        st.error(f"Could not render the PDF: {error.__class__.__name__}: {error}" if error else "Nothing to export for this view.")
+        return
+
+    st.download_button(
+        "📥 Download PDF",
+        data=future.result(),
+        file_name=f"workshop_report_{datetime.now().strftime('%Y%m%d')}.pdf",
+        mime="application/pdf",
+        key="download_pdf",
+    )
+
+
+@st.fragment(run_every=PDF_POLL_SECONDS)
+def follow_pdf_export(cache_key: tuple):
+    """Pending-render notice that re-checks on its own schedule
+
+    It only exists while a render is pending: once the render is done it
+    reruns the page, which shows the download button without this poller.
+    """
+    future = get_pdf_exports().get(cache_key)
+    if future is None or future.done():
+        st.rerun()
+    st.caption("⏳ Rendering the PDF in the background...")
+
+# =========================
+# REPORT JOBS
+# =========================
+
+# Job status refresh, only while an organizer packet is queued or being built
+JOB_POLL_SECONDS = 2
+JOB_OUTPUT_DIR = "reports"
+
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Shared report job queue (WORKSHOP_JOBS_DB), with one in-process worker
+
+    CLI workers (report_jobs.py worker) can drain the same queue file too.
+    """
+    queue = JobQueue(os.environ.get("WORKSHOP_JOBS_DB", DEFAULT_QUEUE_FILE))
+    WorkerPool(queue, workers=1).start()
+    return queue
+
+
+@st.fragment
+def render_packet_job():
+    """Submit an organizer-packet job and follow it without blocking the page"""
+    queue = get_job_queue()
+    job_id = st.session_state.get("packet_job")
+    if st.button("📦 Build Organizer Packet (PDF)", key="build_packet",
+                 help="Cover, contents and every workshop in one PDF, built in the background"):
+        snapshot = save_snapshot(load_data(), JOB_OUTPUT_DIR)
+        job_id = st.session_state["packet_job"] = queue.submit(
+            "bundle", {"snapshot": os.path.abspath(snapshot), "output_dir": os.path.abspath(JOB_OUTPUT_DIR)}
+        )
+
+    job = queue.get(job_id) if job_id else None
+    if job is None:
+        return
+    if job["status"] in ("queued", "running"):
+        follow_packet_job(job_id)
+    elif job["status"] == "done" and os.path.exists(job["result"]):
+        with open(job["result"], "rb") as f:
+            st.download_button("📥 Download Organizer Packet", data=f.read(),
+                               file_name=os.path.basename(job["result"]), mime="application/pdf", key="download_packet")
+    else:
+        error = (job["error"] or "unknown error").splitlines()[0]
+        st.error(f"Job #{job['id']} failed after {job['attempts']} attempt(s): {error}")
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def follow_packet_job(job_id: int):
+    """Progress bar for a queued or running job, refreshed on its own schedule
+
+    Once the job finishes it reruns the page, so the finished state is drawn
+    (and the packet read from disk) once, without this poller.
+    """
+    job = get_job_queue().get(job_id)
+    if job is None or job["status"] not in ("queued", "running"):
+        st.rerun()
+    label = job["message"] or ("Waiting for a worker..." if job["status"] == "queued" else "Working...")
+    retry = f" (attempt {job['attempts']})" if job["attempts"] > 1 else ""
+    st.progress(job["progress"], text=f"Job #{job['id']}: {label}{retry}")
+
 # =========================
 # THEME TOGGLE
 # =========================
@@ -1481,6 +1838,112 @@ def toggle_theme():
     
     st.session_state['theme'] = 'light' if st.session_state['theme'] == 'dark' else 'dark'
 
+# =========================
+# DEBUG PROFILING
+# =========================
+
+PROFILE_HISTORY_LIMIT = 50  # reruns kept in the sidebar history
+
+# Byte counting wraps ScriptRunContext._enqueue, which is private; it is only
+# switched on for the Streamlit releases it was checked against, and newer ones
+# just profile wall time until this range is widened
+PROFILE_STREAMLIT_VERSIONS = ((1, 37), (1, 66))
+
+
+def _can_count_bytes(ctx) -> bool:
+    version = tuple(int(part) for part in st.__version__.split(".")[:2] if part.isdigit())
+    low, high = PROFILE_STREAMLIT_VERSIONS
+    return low <= version <= high and callable(getattr(ctx, "_enqueue", None))
+
+
+class RerunProfiler:
+    """Wall time and bytes sent to the browser for each stage of one rerun"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.rerun = st.session_state.get("profile_reruns", 0) + 1
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = []
+        self.sent_bytes = 0
+
+        # Count every message this rerun sends to the browser
+        self._ctx = get_script_run_ctx() if enabled else None
+        self.counting = self._ctx is not None and _can_count_bytes(self._ctx)
+        self._enqueue = self._ctx._enqueue if self.counting else None
+        if self._enqueue is not None:
+            def counting_enqueue(msg):
+                self.sent_bytes += msg.ByteSize()
+                self._enqueue(msg)
+            self._ctx._enqueue = counting_enqueue
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block of main(); always recorded as a telemetry span"""
+        start_bytes = self.sent_bytes
+        start = time.perf_counter()
+        try:
+            with telemetry.span(name):
+                yield
+        finally:
+            if self.enabled:
+                self.stages.append({
+                    "Stage": name,
+                    "ms": round((time.perf_counter() - start) * 1000, 1),
+                    "KB sent": round((self.sent_bytes - start_bytes) / 1024, 1) if self.counting else None,
+                })
+
+    def finish(self) -> list:
+        """Stop counting and append this rerun to the session's rolling history"""
+        if self._enqueue is not None:
+            self._ctx._enqueue = self._enqueue
+        st.session_state["profile_reruns"] = self.rerun
+        if not self.enabled:
+            return []
+
+        history = st.session_state.get("profile_history", [])
+        history.append({
+            "rerun": self.rerun,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 1),
+            "total_kb": round(self.sent_bytes / 1024, 1) if self.counting else None,
+            "stages": self.stages,
+        })
+        st.session_state["profile_history"] = history[-PROFILE_HISTORY_LIMIT:]
+        return st.session_state["profile_history"]
+
+
+def render_profile_panel(history: list):
+    """Sidebar table of the latest rerun's stages plus a downloadable history"""
+    if not history:
+        return
+    latest = history[-1]
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown(f"### 🐞 Rerun #{latest['rerun']} Profile")
+        if latest["total_kb"] is None:
+            st.caption(f"{latest['total_ms']:.0f} ms total • bytes sent not counted on Streamlit {st.__version__}")
+        else:
+            st.caption(f"{latest['total_ms']:.0f} ms total • {latest['total_kb']:.1f} KB sent")
+        st.dataframe(pd.DataFrame(latest["stages"]), hide_index=True, use_container_width=True)
+
+        if len(history) > 1:
+            totals = pd.DataFrame(history).set_index("rerun")[["total_ms"]]
+            st.line_chart(totals, height=150)
+
+        rows = pd.DataFrame([
+            {"rerun": run["rerun"], "started": run["started"], **stage}
+            for run in history
+            for stage in run["stages"]
+        ])
+        st.download_button(
+            "⬇️ Download profile history (CSV)",
+            rows.to_csv(index=False),
+            file_name=f"dashboard_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True,
+        )
+
 # =========================
 # MAIN
 # =========================
@@ -1514,75 +1977,178 @@ def main():
         - Pacing balance
         - Hands-on engagement
         """)
+        st.markdown("---")
+        if os.environ.get("WORKSHOP_DB"):
+            st.checkbox(
+                "📡 Live updates",
+                value=True,
+                key="live_updates",
+                help=f"Refresh the metric cards and quotes from the response store every {LIVE_REFRESH_SECONDS}s",
+            )
+        debug = st.checkbox(
+            "🐞 Debug profiling",
+            key="debug_profiling",
+            help="Record wall time and bytes sent for each dashboard stage on every rerun",
+        )
 
+    profiler = RerunProfiler(enabled=debug)
+    try:
+        render_report(profiler)
+    finally:
+        render_profile_panel(profiler.finish())
+
+
+def render_report(profiler: RerunProfiler):
     st.title("✨ #75HER Workshop Facilitator Report")
     st.markdown('<div class="subtitle">Actionable insights derived from participant feedback.</div>', unsafe_allow_html=True)
 
-    df = load_data()
+    with profiler.stage("load_data"):
+        df = load_data()
 
-    workshop_col = "Which session did you attend?"
-    bg_col = "Your background in this topic:"
+    workshop_col = COL_SESSION
+    bg_col = COL_BACKGROUND
     
     if df.empty or workshop_col not in df.columns:
         st.error("Data could not be loaded or is empty. Please check the data source and configuration.")
         st.markdown("</div>", unsafe_allow_html=True)
         return
 
-    workshops = df[workshop_col].dropna().unique()
-    
-    # Enhanced Filter Section
-    st.markdown('<div class="filter-section">', unsafe_allow_html=True)
-    st.markdown("### 🎯 Workshop Selection & Filters")
-    
-    col_select, col_filter = st.columns([2, 1])
-
-    with col_select:
-        selected = st.selectbox(
-            "Select Workshop Focus",
-            sorted(workshops),
-            key="workshop_select",
-            help="Choose which workshop to analyze"
-        )
-        
-    df_w = df[df[workshop_col] == selected].copy()
-
-    with col_filter:
-        opts = ["All backgrounds"] + sorted(df_w[bg_col].dropna().unique().tolist())
-        choice = st.selectbox(
-            "Filter by Background",
-            opts,
-            key="background_filter",
-            help="Filter responses by participant experience level"
-        )
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    if choice != "All backgrounds":
-        df_w = df_w[df_w[bg_col] == choice]
-    
-    if len(df_w) == 0:
-        st.warning(f"No responses for **{selected}** with the background: **{choice}**.")
+    dashboard_mode = st.radio(
+        "Dashboard Mode",
+        ["🎯 Single Workshop", "🏆 Compare All Workshops"],
+        horizontal=True,
+        key="dashboard_mode",
+    )
+    if dashboard_mode == "🏆 Compare All Workshops":
+        with profiler.stage("workshop_comparison"):
+            render_workshop_comparison(load_workshop_comparison())
+        with st.expander("📦 Organizer Packet"):
+            render_packet_job()
         st.markdown("</div>", unsafe_allow_html=True)
         return
 
-    metrics = calculate_metrics(df_w)
+    with profiler.stage("filters"):
+        workshops = df[workshop_col].dropna().unique()
 
-    # Hero Card
-    render_hero_card(metrics, selected, len(df_w))
+        # Enhanced Filter Section
+        st.markdown('<div class="filter-section">', unsafe_allow_html=True)
+        st.markdown("### 🎯 Workshop Selection & Filters")
 
-    # Section Divider
-    st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+        col_select, col_filter, col_theme = st.columns([2, 1, 1])
 
-    # Metric Cards
-    st.markdown('<h2>📊 Core Metric Analysis</h2>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        render_confidence_card(metrics)
-        render_hands_on_card(metrics)
-    with col2:
-        render_facilitator_card(metrics)
-        render_pacing_card(metrics)
+        with col_select:
+            selected = st.selectbox(
+                "Select Workshop Focus",
+                sorted(workshops),
+                key="workshop_select",
+                help="Choose which workshop to analyze"
+            )
+
+        df_w = df[df[workshop_col] == selected].copy()
+
+        with col_filter:
+            opts = ["All backgrounds"] + sorted(df_w[bg_col].dropna().unique().tolist())
+            choice = st.selectbox(
+                "Filter by Background",
+                opts,
+                key="background_filter",
+                help="Filter responses by participant experience level"
+            )
+
+        with col_theme:
+            themes = st.multiselect(
+                "Filter by Feedback Theme",
+                list(FEEDBACK_CATEGORIES),
+                key="theme_filter",
+                help="Only include responses whose comments mention these themes"
+            )
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        if choice != "All backgrounds":
+            df_w = df_w[df_w[bg_col] == choice]
+
+        if themes:
+            df_w = filter_by_labels(df_w, themes)
+
+    if len(df_w) == 0:
+        st.warning(f"No responses for **{selected}** with the background: **{choice}**.")
+        st.markdown("</div>", unsafe_allow_html=True)
+        return
+
+    # With a SQL store, unthemed views are answered by one grouped query, and
+    # with live updates on the cards and quotes poll it in their own fragments
+    store = get_response_store()
+    background = None if choice == "All backgrounds" else choice
+    live = store is not None and not themes and st.session_state.get("live_updates", False)
+
+    with profiler.stage("intervals"):
+        # Uncertainty intervals: cached per workshop unless extra filters narrow the sample
+        if choice == "All backgrounds" and not themes:
+            all_intervals = load_workshop_intervals()
+            intervals = all_intervals.loc[selected].to_dict() if selected in all_intervals.index else None
+        else:
+            intervals = bootstrap_intervals(df_w).iloc[0].to_dict()
+
+    if live:
+        with profiler.stage("metric_cards"):
+            render_live_metrics(selected, background, intervals)
+    else:
+        with profiler.stage("calculate_metrics"):
+            metrics = None
+            if store is not None and not themes:
+                metrics = store.workshop_metrics(selected, background)
+            if not metrics or metrics["total"] == 0:
+                metrics = calculate_metrics(df_w)
+
+        # Hero Card
+        with profiler.stage("hero_card"):
+            render_hero_card(metrics, selected, len(df_w))
+
+        # Section Divider
+        st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+
+        # Metric Cards
+        st.markdown('<h2>📊 Core Metric Analysis</h2>', unsafe_allow_html=True)
+
+        with profiler.stage("metric_cards"):
+            col1, col2 = st.columns(2)
+            with col1:
+                render_confidence_card(metrics, intervals)
+                render_hands_on_card(metrics, intervals)
+            with col2:
+                render_facilitator_card(metrics, intervals)
+                render_pacing_card(metrics, intervals)
+
+    with profiler.stage("strengths"):
+        # Unfiltered views reuse the cached per-workshop breakdown
+        if choice == "All backgrounds" and not themes:
+            breakdown = load_strength_breakdown()
+            strengths = breakdown.loc[selected] if selected in breakdown.index else pd.Series(dtype="int64")
+        else:
+            strengths = strength_counts(df_w)
+        render_strengths_card(strengths, len(df_w))
+
+        cooccurrence = load_strength_cooccurrence()
+        if selected in cooccurrence:
+            with st.expander("🔗 Strengths Selected Together"):
+                scope = st.radio(
+                    "Scope",
+                    [selected, "All workshops"],
+                    horizontal=True,
+                    key="cooccurrence_scope",
+                )
+                st.caption("How many builders picked both strengths; the diagonal is each strength's total.")
+                st.dataframe(cooccurrence[scope], use_container_width=True)
+
+    with profiler.stage("trends"):
+        # Trends: unfiltered views read the incrementally maintained daily totals
+        trend_window = 7
+        if choice == "All backgrounds" and not themes:
+            trend = get_trend_engine().sync(df).trends(group=selected, window=trend_window)
+        else:
+            trend = compute_trends(df_w, window=trend_window)
+        render_trend_charts(trend, trend_window)
 
     # Section Divider
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
@@ -1590,41 +2156,59 @@ def main():
     # View Toggle - Move Higher
     st.markdown('<h2>💬 Participant Feedback</h2>', unsafe_allow_html=True)
     
-    view_mode = st.radio(
-        "Response View",
-        ["📋 Summary (Quotes & Actions)", "📈 Detailed Distributions (Charts)"],
-        horizontal=True,
-    )
-    
-    if view_mode == "📋 Summary (Quotes & Actions)":
-        render_summary_quotes(df_w)
-    else:
-        st.markdown("### 📈 Detailed Response Distributions")
-        
-        conf_col = "How confident do you feel implementing what you learned today? "
-        if conf_col in df_w.columns:
-            st.markdown("#### Confidence Level (1-5)")
-            conf_data = df_w[conf_col].value_counts().reset_index()
-            conf_data.columns = ['Confidence Score', 'Count']
-            conf_data['Confidence Score'] = conf_data['Confidence Score'].astype(str)
-
-            st.bar_chart(conf_data.set_index('Confidence Score'), use_container_width=True, color='#6597f7')
-            
-        fac_col = "The facilitator today was:"
-        if fac_col in df_w.columns:
-            st.markdown("#### Facilitator Rating")
-            fac_data = df_w[fac_col].value_counts().reset_index()
-            fac_data.columns = ['Rating', 'Count']
-            
-            st.dataframe(fac_data, use_container_width=True, hide_index=True)
+    with profiler.stage("feedback"):
+        view_mode = st.radio(
+            "Response View",
+            ["📋 Summary (Quotes & Actions)", "📈 Detailed Distributions (Charts)"],
+            horizontal=True,
+        )
+
+        if view_mode == "📋 Summary (Quotes & Actions)" and live:
+            render_live_quotes(selected, background)
+        elif view_mode == "📋 Summary (Quotes & Actions)":
+            render_summary_quotes(df_w)
+        else:
+            st.markdown("### 📈 Detailed Response Distributions")
+
+            conf_col = COL_CONFIDENCE
+            if conf_col in df_w.columns:
+                st.markdown("#### Confidence Level (1-5)")
+                conf_data = df_w[conf_col].value_counts().reset_index()
+                conf_data.columns = ['Confidence Score', 'Count']
+                conf_data['Confidence Score'] = conf_data['Confidence Score'].astype(str)
+
+                st.bar_chart(conf_data.set_index('Confidence Score'), use_container_width=True, color='#6597f7')
+
+            fac_col = COL_FACILITATOR_RATING
+            if fac_col in df_w.columns:
+                st.markdown("#### Facilitator Rating")
+                fac_data = df_w[fac_col].value_counts().reset_index()
+                fac_data.columns = ['Rating', 'Count']
+
+                st.dataframe(fac_data, use_container_width=True, hide_index=True)
+
+            if COL_FEEDBACK_SENTIMENT in df_w.columns:
+                scores = df_w[COL_FEEDBACK_SENTIMENT].dropna()
+                if not scores.empty:
+                    st.markdown("#### Feedback Sentiment")
+                    tone = pd.cut(
+                        scores,
+                        [-1.01, NEGATIVE_POLARITY, POSITIVE_POLARITY, 1.01],
+                        labels=["😟 Negative", "😐 Neutral", "😊 Positive"],
+                    )
+                    tone_data = tone.value_counts(sort=False).rename_axis('Tone').to_frame('Count')
+                    st.bar_chart(tone_data, use_container_width=True, color='#6597f7')
 
     # Section Divider
     st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
     
-    # Export instructions
+    # Export: server-side PDF, or the browser's print dialog
     with st.expander("📄 Export & Share This Report"):
+        version = load_workshop_fingerprints().get(selected)
+        render_pdf_export(selected, df_w, (version, selected, choice, tuple(themes)), tuple(themes))
+
         st.markdown("""
-        ### How to Generate a PDF
+        ### Or Print from Your Browser
         
         Use your browser's print function to generate a clean PDF report optimized for sharing.
         
@@ -1660,4 +2244,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    telemetry.service = "dashboard"
+    with telemetry.span("rerun"):
+        main()
+    telemetry.export_from_env()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+75HER Workshop Benchmarks
+Times each pipeline stage on synthetic survey data and saves the results as
+JSON, so regressions between versions show up as numbers
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from synthetic_survey import generate_responses
+from workshop_analytics import COL_SESSION, prepare_responses
+
+# ============================================
+# CONFIGURATION
+# ============================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(HERE, 'app.py')
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+STAGES = ['cold_start', 'ingest', 'calculate_metrics', 'sql_metrics', 'records', 'generate_report', 'generate_html_report', 'pdf', 'dashboard']
+
+# Entry points started in a fresh interpreter for the cold_start stage
+COLD_START_TARGETS = {
+    'workshop_report --help': ['workshop_report.py', '--help'],
+    'workshop_report_pdf --help': ['workshop_report_pdf.py', '--help'],
+    'import app': ['-c', 'import app'],
+    'import workshop_analytics': ['-c', 'import workshop_analytics'],
+}
+# Dependencies that should only load on the code paths that need them
+HEAVY_MODULES = ('gspread', 'oauth2client', 'weasyprint', 'textblob', 'nltk', 'scipy')
+COLD_START_PROBE = (
+    "import runpy, sys\n"
+    "args = sys.argv[1:]\n"
+    "try:\n"
+    "    if args[0] == '-c':\n"
+    "        exec(args[1])\n"
+    "    else:\n"
+    "        sys.argv = args\n"
+    "        runpy.run_path(args[0], run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print(','.join(m for m in %r if m in sys.modules), file=sys.stderr)\n" % (HEAVY_MODULES,)
+)
+
+# A stage this much slower than the baseline is flagged as a regression
+REGRESSION_RATIO = 1.2
+
+# ============================================
+# HELPERS
+# ============================================
+
+def best_time(fn, repeat=3):
+    """Fastest wall time of `repeat` calls, plus the last call's return value"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def quiet():
+    """Swallow the report generators' status prints while timing them"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def code_version():
+    """git describe of the working tree, or 'unknown' outside a checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], cwd=HERE,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+# ============================================
+# BENCHMARK STAGES
+# ============================================
+
+def bench_cold_start(repeat):
+    """Fresh-interpreter startup time of each entry point, and the heavy modules it pulled in"""
+    results = []
+    print("\n🧊 Cold start")
+    for target, argv in COLD_START_TARGETS.items():
+        best, loaded = float('inf'), ''
+        for _ in range(repeat):
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, '-c', COLD_START_PROBE, *argv], cwd=HERE,
+                capture_output=True, text=True,
+            )
+            best = min(best, time.perf_counter() - start)
+            loaded = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ''
+        heavy = [m for m in loaded.split(',') if m in HEAVY_MODULES]
+        results.append({'stage': f'cold_start: {target}', 'rows': 0, 'seconds': round(best, 6), 'heavy_modules': heavy})
+        print(f"   {target:<28} {best * 1000:>10.1f} ms   loaded: {', '.join(heavy) or 'none'}")
+    return results
+
+
+def bench_size(rows, stages, repeat, workdir):
+    """Run every selected stage against `rows` synthetic responses"""
+    results = []
+
+    def load(stage, module):
+        # Imports happen outside the timed calls so one-off startup cost
+        # doesn't land on the first stage that needs the module
+        try:
+            return importlib.import_module(module)
+        except Exception as e:
+            results.append({'stage': stage, 'rows': rows, 'error': f"{e.__class__.__name__}: {e}"})
+            print(f"   {stage:<28} ⚠️ skipped ({e.__class__.__name__}: {e})")
+            return None
+
+    def record(stage, fn, times=repeat):
+        try:
+            seconds, value = best_time(fn, times)
+            results.append({'stage': stage, 'rows': rows, 'seconds': round(seconds, 6)})
+            print(f"   {stage:<28} {seconds * 1000:>10.1f} ms")
+            return value
+        except Exception as e:
+            results.append({'stage': stage, 'rows': rows, 'error': f"{e.__class__.__name__}: {e}"})
+            print(f"   {stage:<28} ⚠️ skipped ({e.__class__.__name__}: {e})")
+            return None
+
+    print(f"\n📏 {rows:,} responses")
+    raw = generate_responses(rows)
+    workshop = raw[COL_SESSION].iloc[0]
+    cache = os.path.join(workdir, f'sentiment_cache_{rows}.json')
+
+    # Ingest runs once cold (empty sentiment cache), then warm like a rerun would
+    def ingest():
+        with quiet():
+            return prepare_responses(raw, sentiment_cache=cache)
+
+    df = None
+    if 'ingest' in stages:
+        record('ingest (cold)', ingest, times=1)
+        df = record('ingest', ingest)
+    if df is None:
+        df = ingest()
+    if 'ingest' in stages:
+        results[-1]['bytes'] = int(df.memory_usage(deep=True).sum())
+        print(f"   {'':<28} {results[-1]['bytes'] / 1e6:>10.1f} MB cached DataFrame")
+
+    if 'calculate_metrics' in stages and (app := load('calculate_metrics', 'app')):
+        record('calculate_metrics',
+               lambda: [app.calculate_metrics(group) for _, group in df.groupby(COL_SESSION)])
+
+    if 'sql_metrics' in stages and (response_store := load('sql_metrics', 'response_store')):
+        store = response_store.ResponseStore(':memory:')
+        record('sql_append', lambda: store.append(df), times=1)
+        record('sql_metrics', store.metrics)
+        store.close()
+
+    if 'records' in stages and (response_records := load('records', 'response_records')):
+        rows_in = raw.to_dict('records')
+        buffer = record('records_append', lambda: response_records.ResponseBuffer().extend(rows_in), times=1)
+        if buffer is not None:
+            results[-1]['bytes'] = buffer.nbytes()
+            frame_bytes = int(raw.memory_usage(deep=True).sum())
+            print(f"   {'':<28} {buffer.nbytes() / 1e6:>10.1f} MB packed vs {frame_bytes / 1e6:.1f} MB as a DataFrame")
+
+    if 'generate_report' in stages and (report := load('generate_report', 'workshop_report')):
+        def markdown_report():
+            with quiet():
+                return report.generate_report(df, workshop)
+        record('generate_report', markdown_report)
+
+    html = None
+    wants_html = 'generate_html_report' in stages or 'pdf' in stages
+    if wants_html and (pdf_report := load('generate_html_report', 'workshop_report_pdf')):
+        def html_report():
+            with quiet():
+                return pdf_report.generate_html_report(df, workshop)
+        html = record('generate_html_report', html_report)
+
+    if 'pdf' in stages and html and (weasyprint := load('pdf', 'weasyprint')):
+        record('pdf', lambda: weasyprint.HTML(string=html).write_pdf(), times=1)
+
+    if 'dashboard' in stages:
+        data_file = os.path.join(workdir, f'responses_{rows}.csv')
+        raw.to_csv(data_file, index=False)
+        os.environ['WORKSHOP_DATA_FILE'] = data_file
+        try:
+            from streamlit.testing.v1 import AppTest
+            app = AppTest.from_file(APP_FILE, default_timeout=600)
+            record('dashboard (first run)', app.run, times=1)
+            record('dashboard rerun', app.run)
+        finally:
+            os.environ.pop('WORKSHOP_DATA_FILE', None)
+
+    return results
+
+
+def compare(results, baseline_path):
+    """Print each stage's time relative to a saved baseline run"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['stage'], r['rows']): r.get('seconds') for r in json.load(f)['results']}
+
+    print(f"\n📊 Compared with {baseline_path}")
+    regressions = 0
+    for r in results:
+        before = baseline.get((r['stage'], r['rows']))
+        if not before or 'seconds' not in r:
+            continue
+        ratio = r['seconds'] / before
+        flag = '🚨' if ratio > REGRESSION_RATIO else '✅'
+        regressions += ratio > REGRESSION_RATIO
+        print(f"   {flag} {r['stage']:<40} {r['rows']:>10,} rows  {ratio:>6.2f}x")
+    return regressions
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the 75HER report pipeline on synthetic data")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="response counts to test (default: 100 1000 10000)")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage; the fastest is kept")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE_JSON', help="earlier results to compare against")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   75HER WORKSHOP PIPELINE BENCHMARKS")
+    print("=" * 60)
+
+    results = bench_cold_start(args.repeat) if 'cold_start' in args.stages else []
+    # cold_start doesn't depend on the data; only generate and ingest it for the other stages
+    size_stages = [stage for stage in args.stages if stage != 'cold_start']
+    if size_stages:
+        with tempfile.TemporaryDirectory() as workdir:
+            for rows in args.sizes:
+                results.extend(bench_size(rows, size_stages, args.repeat, workdir))
+
+    report = {
+        'version': code_version(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to: {args.output}")
+
+    if args.compare and compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
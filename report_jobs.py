@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+75HER Workshop Report Jobs
+SQLite-backed queue for report generation: jobs run on a worker pool with
+status, progress, retries, and finished results reused for identical requests
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime
+
+import pandas as pd
+
+from report_watcher import render
+from sheet_loader import SHEET_SOURCES_FILE
+from telemetry import telemetry
+from workshop_analytics import COL_SESSION, prepare_responses, workshop_fingerprints
+from workshop_report import get_survey_data
+from workshop_report_pdf import generate_pdf_bundle
+
+# ============================================
+# CONFIGURATION
+# ============================================
+DEFAULT_QUEUE_FILE = 'report_jobs.db'
+DEFAULT_OUTPUT_DIR = 'reports'
+DEFAULT_WORKERS = 2
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 5             # seconds, multiplied by the attempt number
+POLL_INTERVAL = 1.0         # seconds an idle worker waits before looking again
+LEASE_SECONDS = 60          # a running job whose worker hasn't checked in for this long is reclaimed
+HEARTBEAT_INTERVAL = LEASE_SECONDS / 4
+SNAPSHOT_KEEP = 8           # newest response snapshots kept per directory
+
+STATUSES = ('queued', 'running', 'done', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    cache_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    worker_id TEXT,
+    lease_until REAL
+)
+"""
+INDEX = "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)"
+
+# ============================================
+# DATA
+# ============================================
+
+_data_cache = {}
+_data_lock = threading.Lock()
+
+
+def data_version(params: dict):
+    """Identifies the input data of a job, or None when it can't be known up front (live sheets)"""
+    path = params.get('snapshot') or params.get('data_file')
+    if not path:
+        return None
+    stat = os.stat(path)
+    return f'{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def load_job_data(params: dict) -> pd.DataFrame:
+    """Prepared responses for a job: a pickled snapshot, a CSV export, or the live sheets
+
+    Snapshots and CSVs are loaded once per worker process and version.
+    """
+    version = data_version(params)
+    with _data_lock:
+        if version is not None and version in _data_cache:
+            return _data_cache[version]
+
+    if params.get('snapshot'):
+        df = pd.read_pickle(params['snapshot'])
+    elif params.get('data_file'):
+        df = prepare_responses(pd.read_csv(params['data_file']))
+    else:
+        df = get_survey_data(params.get('sources') or SHEET_SOURCES_FILE)
+    if df is None or len(df) == 0:
+        raise RuntimeError("No survey responses to report on")
+
+    if version is not None:
+        with _data_lock:
+            _data_cache.clear()     # one dataset at a time is plenty
+            _data_cache[version] = df
+    return df
+
+
+def save_snapshot(df: pd.DataFrame, directory=DEFAULT_OUTPUT_DIR, keep=SNAPSHOT_KEEP) -> str:
+    """Pickle prepared responses for jobs, named by content so equal data shares a file
+
+    Only the `keep` most recently used snapshots stay on disk.
+    """
+    digest = hashlib.sha1(json.dumps(workshop_fingerprints(df), sort_keys=True).encode()).hexdigest()[:16]
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'responses_{digest}.pkl')
+    if os.path.exists(path):
+        os.utime(path)      # reused: counts as recent
+    else:
+        df.to_pickle(f'{path}.tmp')
+        os.replace(f'{path}.tmp', path)
+    prune_snapshots(directory, keep)
+    return path
+
+
+def prune_snapshots(directory=DEFAULT_OUTPUT_DIR, keep=SNAPSHOT_KEEP) -> int:
+    """Delete all but the `keep` newest snapshots in `directory`; returns how many went"""
+    snapshots = [
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.startswith('responses_') and name.endswith('.pkl')
+    ]
+    snapshots.sort(key=os.path.getmtime, reverse=True)
+    removed = 0
+    for path in snapshots[keep:]:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass        # another process pruned it first
+    return removed
+
+# ============================================
+# JOB KINDS
+# ============================================
+
+def run_reports(params, progress):
+    """Markdown/PDF report per workshop (every workshop unless 'workshops' lists some)"""
+    df = load_job_data(params)
+    workshops = params.get('workshops') or sorted(df[COL_SESSION].dropna().unique())
+    output_dir = params.get('output_dir', DEFAULT_OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    failed = []
+    for i, workshop in enumerate(workshops):
+        progress(i / len(workshops), f"Rendering {workshop}")
+        if not render(df, workshop, params.get('formats', ['markdown']), output_dir):
+            failed.append(workshop)
+    if failed:
+        raise RuntimeError(f"Reports not written for {len(failed)} workshop(s): {', '.join(failed)}")
+    return output_dir
+
+
+def run_bundle(params, progress):
+    """Organizer packet PDF, optionally split per workshop"""
+    df = load_job_data(params)
+    progress(0.2, "Laying out the packet")
+    output_dir = params.get('output_dir', DEFAULT_OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, f"workshop_packet_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+    split_dir = os.path.join(output_dir, 'facilitators') if params.get('split') else None
+    result = generate_pdf_bundle(df, params.get('workshops'), filename=filename, split_dir=split_dir)
+    if result is None:
+        raise RuntimeError("The PDF packet could not be rendered")
+    return result
+
+
+# kind -> handler(params, progress) returning the result path
+JOB_KINDS = {
+    'reports': run_reports,
+    'bundle': run_bundle,
+}
+
+# ============================================
+# QUEUE
+# ============================================
+
+class JobQueue:
+    """Jobs table in a SQLite file; safe to share between threads and processes"""
+
+    def __init__(self, path=DEFAULT_QUEUE_FILE):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+            conn.execute(INDEX)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, kind, params=None, max_attempts=MAX_ATTEMPTS) -> int:
+        """Queue a job and return its id
+
+        An identical request (same kind, parameters and input data) that is
+        still pending or already finished returns the existing job instead.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}' (expected one of {', '.join(JOB_KINDS)})")
+        params = params or {}
+        encoded = json.dumps(params, sort_keys=True)
+        version = data_version(params)
+        cache_key = hashlib.sha1(f'{kind}|{encoded}|{version}'.encode()).hexdigest() if version else None
+
+        conn = self._connect()
+        try:
+            # Lookup and insert in one write transaction, so two identical
+            # requests racing each other still end up as a single job
+            conn.execute('BEGIN IMMEDIATE')
+            if cache_key:
+                existing = conn.execute(
+                    "SELECT id, status, result FROM jobs WHERE cache_key = ? AND status != 'failed' "
+                    "ORDER BY id DESC LIMIT 1", (cache_key,),
+                ).fetchone()
+                if existing and (existing['status'] != 'done' or os.path.exists(existing['result'] or '')):
+                    conn.rollback()
+                    telemetry.count('jobs_reused', kind=kind)
+                    return existing['id']
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, params, cache_key, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, encoded, cache_key, max_attempts, time.time(), _now()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        telemetry.count('jobs_submitted', kind=kind)
+        return cursor.lastrowid
+
+    def get(self, job_id) -> dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def list(self, limit=20) -> list:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [_job(row) for row in rows]
+
+    def claim(self, worker_id=None):
+        """Atomically take the oldest runnable job for `worker_id`, or None
+
+        The job is leased to the worker for LEASE_SECONDS; progress() and
+        heartbeat() renew the lease, and jobs whose lease ran out are
+        reclaimed here first.
+        """
+        worker_id = worker_id or default_worker_id()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            self._requeue_expired(conn)
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND available_at <= ? ORDER BY id LIMIT 1",
+                (time.time(),),
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, error = NULL, "
+                "worker_id = ?, lease_until = ? WHERE id = ?",
+                (_now(), worker_id, time.time() + LEASE_SECONDS, row['id']),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return self.get(row['id'])
+
+    def progress(self, job_id, worker_id, fraction, message=None) -> bool:
+        """Record progress and renew the lease; False once the worker no longer holds the job"""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, lease_until = ? "
+                "WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (max(0.0, min(1.0, fraction)), message, time.time() + LEASE_SECONDS, job_id, worker_id),
+            ).rowcount == 1
+
+    def heartbeat(self, job_id, worker_id) -> bool:
+        """Renew a running job's lease; False once another worker has reclaimed it"""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (time.time() + LEASE_SECONDS, job_id, worker_id),
+            ).rowcount == 1
+
+    def complete(self, job_id, worker_id, result) -> bool:
+        """Record the job's result; False (and nothing recorded) once the worker no longer holds it"""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'done', progress = 1, message = NULL, result = ?, finished_at = ?, "
+                "worker_id = NULL, lease_until = NULL WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (result, _now(), job_id, worker_id),
+            ).rowcount == 1
+
+    def fail(self, job_id, worker_id, error) -> bool:
+        """Record a failed attempt; the job is queued again until it runs out of attempts
+
+        Returns False (and records nothing) once the worker no longer holds the job.
+        """
+        with self._connect() as conn:
+            job = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job['attempts'] < job['max_attempts']:
+                update = "status = 'queued', error = ?, available_at = ?"
+                values = (error, time.time() + RETRY_DELAY * job['attempts'])
+            else:
+                update = "status = 'failed', error = ?, finished_at = ?"
+                values = (error, _now())
+            return conn.execute(
+                f"UPDATE jobs SET {update}, worker_id = NULL, lease_until = NULL "
+                "WHERE id = ? AND status = 'running' AND worker_id = ?",
+                (*values, job_id, worker_id),
+            ).rowcount == 1
+
+    def requeue_stale(self):
+        """Put jobs left 'running' by a worker that died (lease expired) back in the queue"""
+        with self._connect() as conn:
+            return self._requeue_expired(conn)
+
+    @staticmethod
+    def _requeue_expired(conn):
+        return conn.execute(
+            "UPDATE jobs SET status = 'queued', worker_id = NULL, lease_until = NULL "
+            "WHERE status = 'running' AND lease_until < ?", (time.time(),),
+        ).rowcount
+
+    def wait(self, job_id, timeout=None, poll=POLL_INTERVAL) -> dict:
+        """Block until the job is done or failed (or the timeout passes)"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in ('done', 'failed'):
+                return job
+            if deadline is not None and time.time() > deadline:
+                return job
+            time.sleep(poll)
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def default_worker_id():
+    """host:pid:thread, unique among the workers sharing a queue file"""
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}'
+
+
+def _job(row) -> dict:
+    job = dict(row)
+    job['params'] = json.loads(job['params'])
+    return job
+
+# ============================================
+# WORKERS
+# ============================================
+
+class LeaseLost(RuntimeError):
+    """The job was reclaimed by another worker while this one was running it"""
+
+
+def _keep_leased(queue: JobQueue, job: dict, done: threading.Event, lost: threading.Event):
+    """Renew a job's lease until `done` is set, so long render steps don't look dead;
+    sets `lost` and stops if another worker has taken the job over"""
+    while not done.wait(HEARTBEAT_INTERVAL):
+        if not queue.heartbeat(job['id'], job['worker_id']):
+            lost.set()
+            return
+
+
+def run_job(queue: JobQueue, job: dict):
+    """Run one claimed job and record its outcome
+
+    A worker that loses its lease stops at the handler's next progress
+    step and records nothing; the job belongs to whoever reclaimed it.
+    """
+    job_id, worker_id = job['id'], job['worker_id']
+    done, lost = threading.Event(), threading.Event()
+    threading.Thread(
+        target=_keep_leased, args=(queue, job, done, lost), name=f'job-{job_id}-lease', daemon=True
+    ).start()
+
+    def progress(fraction, message=None):
+        if lost.is_set() or not queue.progress(job_id, worker_id, fraction, message):
+            raise LeaseLost(f"Job #{job_id} is no longer leased to {worker_id}")
+
+    with telemetry.span('job', kind=job['kind'], job=job_id, attempt=job['attempts']) as span:
+        try:
+            result = JOB_KINDS[job['kind']](job['params'], progress)
+        except LeaseLost:
+            span['error'] = 'LeaseLost'
+            telemetry.count('jobs_lease_lost', kind=job['kind'])
+            return
+        except Exception as e:
+            span['error'] = e.__class__.__name__
+            if queue.fail(job_id, worker_id, f"{e.__class__.__name__}: {e}\n{traceback.format_exc(limit=3)}"):
+                telemetry.count('jobs_failed', kind=job['kind'])
+            else:
+                telemetry.count('jobs_lease_lost', kind=job['kind'])
+            return
+        finally:
+            done.set()
+    if queue.complete(job_id, worker_id, result):
+        telemetry.count('jobs_completed', kind=job['kind'])
+    else:
+        telemetry.count('jobs_lease_lost', kind=job['kind'])
+
+
+class WorkerPool:
+    """Threads that keep claiming and running jobs until stopped"""
+
+    def __init__(self, queue: JobQueue, workers=DEFAULT_WORKERS, poll=POLL_INTERVAL):
+        self.queue = queue
+        self.poll = poll
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, name=f'report-job-{i}', daemon=True) for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._stop.wait(self.poll)
+                continue
+            run_job(self.queue, job)
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+
+def print_job(job):
+    if job is None:
+        print("❓ No such job")
+        return
+    icon = {'queued': '⏳', 'running': '🏃', 'done': '✅', 'failed': '❌'}[job['status']]
+    line = f"{icon} #{job['id']} {job['kind']:<8} {job['status']:<8} {job['progress'] * 100:>4.0f}%"
+    detail = job['result'] if job['status'] == 'done' else job['message'] or ''
+    print(f"{line}  {detail}")
+    if job['status'] == 'failed' and job['error']:
+        print(f"   {job['error'].splitlines()[0]}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Queue and run 75HER report jobs")
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_FILE, help="SQLite queue file (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help="queue a job and print its id")
+    submit.add_argument('kind', choices=list(JOB_KINDS))
+    submit.add_argument('--workshops', nargs='+', help="workshop names (default: every workshop)")
+    submit.add_argument('--formats', nargs='+', choices=['markdown', 'pdf'], default=['markdown'])
+    submit.add_argument('--split', action='store_true', help="bundle: also save per-workshop PDFs")
+    submit.add_argument('--data-file', metavar='CSV', help="report on a CSV export instead of the live sheets")
+    submit.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    submit.add_argument('--wait', action='store_true', help="block until the job finishes")
+
+    status = commands.add_parser('status', help="show one job, or the most recent ones")
+    status.add_argument('job_id', type=int, nargs='?')
+
+    worker = commands.add_parser('worker', help="run jobs until interrupted")
+    worker.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    queue = JobQueue(args.queue)
+
+    if args.command == 'submit':
+        params = {'output_dir': os.path.abspath(args.output_dir)}
+        if args.workshops:
+            params['workshops'] = args.workshops
+        if args.data_file:
+            params['data_file'] = os.path.abspath(args.data_file)
+        if args.kind == 'reports':
+            params['formats'] = args.formats
+        if args.kind == 'bundle' and args.split:
+            params['split'] = True
+        job_id = queue.submit(args.kind, params)
+        print(f"📥 Job #{job_id} submitted")
+        if args.wait:
+            print_job(queue.wait(job_id))
+
+    elif args.command == 'status':
+        for job in ([queue.get(args.job_id)] if args.job_id else queue.list()):
+            print_job(job)
+
+    else:
+        telemetry.service = 'report_jobs'
+        requeued = queue.requeue_stale()
+        if requeued:
+            print(f"♻️ Re-queued {requeued} interrupted job(s)")
+        pool = WorkerPool(queue, args.workers).start()
+        print(f"👷 {args.workers} worker(s) waiting for jobs in {args.queue}")
+        try:
+            while True:
+                time.sleep(60)
+                telemetry.export_from_env()
+        except KeyboardInterrupt:
+            print("\n👋 Stopping workers (finishing current jobs)")
+            pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+75HER Workshop Report Watcher
+Polls the survey data on an interval and regenerates the Markdown/PDF
+reports of only the workshops that received new responses
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from response_store import open_store
+from sheet_loader import SHEET_SOURCES_FILE
+from telemetry import telemetry
+from workshop_analytics import SchemaError, apply_schema, prepare_responses, workshop_fingerprints
+
+# ============================================
+# CONFIGURATION
+# ============================================
+DEFAULT_INTERVAL = 60           # seconds between polls
+DEFAULT_OUTPUT_DIR = 'reports'
+STATE_FILE = 'watch_state.json'  # last rendered fingerprints, kept in the output dir
+FORMATS = ('markdown', 'pdf')
+ALL_WORKSHOPS = 'All Workshops'
+
+# ============================================
+# HELPERS
+# ============================================
+
+def report_path(output_dir, workshop, extension):
+    """Stable file name per workshop, so each cycle overwrites the last report"""
+    slug = re.sub(r'[^a-z0-9]+', '_', workshop.lower()).strip('_')[:60]
+    return os.path.join(output_dir, f'{slug}.{extension}')
+
+
+def load_state(path) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def fetch_responses(args):
+    """Raw responses from the CSV given with --data-file, else from Google Sheets"""
+    if args.data_file:
+        return pd.read_csv(args.data_file)
+    from workshop_report import get_survey_data
+    return get_survey_data(args.sources, prepare=False)
+
+# ============================================
+# REPORTS
+# ============================================
+
+def render(df, workshop, formats, output_dir, store=None) -> bool:
+    """Write one workshop's reports (workshop=None for the combined report)
+
+    Returns True only when every requested format was written.
+    """
+    name = workshop or ALL_WORKSHOPS
+    written = True
+    if 'markdown' in formats:
+        from workshop_report import generate_report
+        report = generate_report(df, workshop, store=store)
+        if report is not None:
+            path = report_path(output_dir, name, 'md')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(report)
+            telemetry.count('reports_generated', format='markdown')
+            print(f"📝 {path}")
+        else:
+            written = False
+    if 'pdf' in formats:
+        from workshop_report_pdf import generate_html_report, generate_pdf
+        html = generate_html_report(df, workshop, store=store)
+        pdf = generate_pdf(html, name, filename=report_path(output_dir, name, 'pdf')) if html is not None else None
+        written = written and pdf is not None
+    return written
+
+
+def combined_fingerprint(fingerprints) -> str:
+    """Fingerprint of the all-workshops report: moves when any workshop's does"""
+    digest = hashlib.sha1()
+    for workshop, fingerprint in sorted(fingerprints.items()):
+        digest.update(f'{workshop}={fingerprint}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def run_cycle(args, state) -> dict:
+    """Fetch once and re-render the workshops whose fingerprint moved; returns the new state
+
+    A workshop's fingerprint is only recorded once its reports were written,
+    so a failed render is retried on the next cycle.
+    """
+    raw = fetch_responses(args)
+    if raw is None or len(raw) == 0:
+        print("⚠️ No responses this cycle")
+        return state
+    try:
+        raw = apply_schema(raw)
+    except SchemaError as e:
+        print(f"❌ {e}")
+        return state
+
+    fingerprints = workshop_fingerprints(raw)
+    changed = [workshop for workshop, fingerprint in fingerprints.items() if state.get(workshop) != fingerprint]
+    combined = combined_fingerprint(fingerprints) if args.combined else None
+    stamp = datetime.now().strftime('%H:%M:%S')
+    if not changed and state.get(ALL_WORKSHOPS) == combined:
+        print(f"💤 [{stamp}] No new responses in {len(fingerprints)} workshop(s)")
+        return state
+
+    print(f"🔄 [{stamp}] New responses for {len(changed)} of {len(fingerprints)} workshop(s)")
+    with telemetry.span('watch_render', workshops=len(changed)):
+        # With a store only the new rows are prepared; reports read from SQL
+        store = open_store(args.db, raw=raw)
+        df = prepare_responses(raw) if store is None else None
+        new_state = {workshop: fingerprint for workshop, fingerprint in fingerprints.items() if workshop not in changed}
+        failed = []
+        for workshop in changed:
+            if render(df, workshop, args.formats, args.output_dir, store):
+                new_state[workshop] = fingerprints[workshop]
+            else:
+                failed.append(workshop)
+        if args.combined:
+            if render(df, None, args.formats, args.output_dir, store):
+                new_state[ALL_WORKSHOPS] = combined
+            else:
+                failed.append(ALL_WORKSHOPS)
+        if store is not None:
+            store.close()
+    if failed:
+        print(f"⚠️ {len(failed)} report(s) not written; retrying them next cycle")
+    return new_state
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Keep 75HER workshop reports up to date as responses arrive")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="seconds between polls (default: %(default)s)")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['markdown'])
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--combined', action='store_true', help="also refresh the all-workshops report when anything changes")
+    parser.add_argument('--sources', default=SHEET_SOURCES_FILE,
+                        help="JSON list of spreadsheets/tabs to merge (default: %(default)s, else the main sheet)")
+    parser.add_argument('--data-file', metavar='CSV', help="poll a local CSV export instead of Google Sheets")
+    parser.add_argument('--db', metavar='PATH', help="sync responses into this SQLite file and compute metrics there")
+    parser.add_argument('--once', action='store_true', help="run a single cycle and exit")
+    parser.add_argument('--force', action='store_true', help="ignore the saved state and re-render every workshop")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    telemetry.service = 'report_watcher'
+    print("="*60)
+    print("   75HER WORKSHOP REPORT WATCHER")
+    print("="*60)
+    print()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    state_path = os.path.join(args.output_dir, STATE_FILE)
+    state = {} if args.force else load_state(state_path)
+    print(f"👀 Polling every {args.interval:g}s, writing {', '.join(args.formats)} reports to {args.output_dir}/")
+
+    try:
+        while True:
+            with telemetry.span('watch_cycle'):
+                new_state = run_cycle(args, state)
+            if new_state is not state:
+                save_state(state_path, new_state)
+                state = new_state
+            telemetry.export_from_env()
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+75HER Compact Response Records
+Array-backed storage for responses on the non-pandas paths (streaming
+ingest, webhooks, incremental updates): fixed-choice answers become small
+integer codes, confidence a float, and free text is kept as UTF-8 in one
+buffer per question, referenced by offsets
+"""
+
+import math
+import re
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from workshop_analytics import COL_CONFIDENCE, COL_STRENGTHS, QUOTED_ITEM, SCHEMA_FIELDS, resolve_schema
+
+# ============================================
+# CONFIGURATION
+# ============================================
+# Fixed-choice questions, stored as codes into a per-field vocabulary
+CHOICE_FIELDS = ('session', 'background', 'rating', 'pace', 'hands_on', 'after_workshop', 'event', 'cohort')
+
+# Free-text fields, stored in a byte buffer plus an offsets array
+TEXT_FIELDS = ('submission_id', 'feedback', 'one_thing')
+
+# Code 0 always means "no answer"
+MISSING_CODE = 0
+
+# array typecodes: up to 4 billion distinct answers per question (free-typed
+# "Other" answers can pass 65k), 32 strength options
+CODE_TYPE = 'I'
+STRENGTHS_TYPE = 'I'
+MAX_STRENGTH_OPTIONS = 32
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# ============================================
+# PARSING
+# ============================================
+
+def _is_missing(value) -> bool:
+    return value is None or value == '' or (isinstance(value, float) and math.isnan(value))
+
+
+def split_answers(value) -> list:
+    """One multi-select answer as a list, by the same rules as parse_multi_select"""
+    if _is_missing(value):
+        return []
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        text = str(value).strip()
+        if text.startswith('['):
+            items = [m.group('item') for m in re.finditer(QUOTED_ITEM, text)]
+        else:
+            items = re.split(r'\s*\n\s*', text)
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_epoch(value) -> float:
+    """Submission time as epoch seconds; naive times are UTC, aware ones are converted
+
+    ISO strings skip the slow pandas parser; either way the result doesn't
+    depend on the machine's time zone.
+    """
+    if _is_missing(value):
+        return math.nan
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        parsed = pd.to_datetime(value, errors='coerce')
+        if pd.isna(parsed):
+            return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _format_epoch(seconds):
+    """Epoch seconds back to a naive UTC time string, as _to_epoch() reads it"""
+    return None if math.isnan(seconds) else pd.Timestamp(seconds, unit='s').strftime(TIME_FORMAT)
+
+# ============================================
+# RECORDS
+# ============================================
+
+class ResponseRecord:
+    """One response decoded from a ResponseBuffer (no per-instance __dict__)"""
+
+    __slots__ = ('submission_id', 'submitted_at', 'confidence', 'strengths', *CHOICE_FIELDS, 'feedback', 'one_thing')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def as_row(self) -> dict:
+        """Back to sheet headers, as get_all_records() would have returned it"""
+        row = {SCHEMA_FIELDS[name][0]: getattr(self, name) for name in (*CHOICE_FIELDS, *TEXT_FIELDS)}
+        row[COL_CONFIDENCE] = self.confidence
+        row[COL_STRENGTHS] = repr(list(self.strengths or ()))
+        row[SCHEMA_FIELDS['submitted_at'][0]] = self.submitted_at
+        return row
+
+    def __repr__(self):
+        return f"ResponseRecord(session={self.session!r}, rating={self.rating!r}, confidence={self.confidence!r})"
+
+
+class Vocabulary:
+    """Answer <-> small integer code for one fixed-choice question"""
+
+    def __init__(self):
+        self.values = [None]        # code -> answer; code 0 is "missing"
+        self._codes = {}
+
+    def encode(self, value) -> int:
+        if _is_missing(value):
+            return MISSING_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code):
+        return self.values[code]
+
+
+class TextColumn:
+    """Append-only strings as one UTF-8 buffer plus end offsets
+
+    A missing answer takes no bytes and is flagged separately, so it reads
+    back as None rather than an empty string.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array('Q')
+        self.missing = bytearray()              # 1 per row with no answer
+
+    def append(self, value):
+        missing = _is_missing(value)
+        if not missing:
+            self.data += str(value).encode('utf-8')
+        self.ends.append(len(self.data))
+        self.missing.append(missing)
+
+    def __getitem__(self, i):
+        if self.missing[i]:
+            return None
+        start = self.ends[i - 1] if i else 0
+        return self.data[start:self.ends[i]].decode('utf-8')
+
+    def nbytes(self):
+        return len(self.data) + self.ends.itemsize * len(self.ends) + len(self.missing)
+
+
+class ResponseBuffer:
+    """Columnar, array-backed store for many in-flight responses"""
+
+    def __init__(self):
+        self.vocab = {field: Vocabulary() for field in CHOICE_FIELDS}
+        self.codes = {field: array(CODE_TYPE) for field in CHOICE_FIELDS}
+        self.confidence = array('d')
+        self.submitted_at = array('d')          # epoch seconds, NaN when unknown
+        self.strengths = array(STRENGTHS_TYPE)  # bitmask over strength_options
+        self.strength_options = Vocabulary()
+        self.text = {field: TextColumn() for field in TEXT_FIELDS}
+        self._headers = {}                      # header tuple -> {field: header}
+
+    def __len__(self):
+        return len(self.confidence)
+
+    def _columns(self, row: dict) -> dict:
+        """Resolve a row's headers to fields, once per distinct header layout"""
+        key = tuple(row)
+        columns = self._headers.get(key)
+        if columns is None:
+            columns = self._headers[key] = resolve_schema(key, required=()).columns
+        return columns
+
+    def append(self, row: dict):
+        """Add one response given as a get_all_records()/webhook dict"""
+        columns = self._columns(row)
+
+        def value(field):
+            header = columns.get(field)
+            return row.get(header) if header is not None else None
+
+        for field in CHOICE_FIELDS:
+            self.codes[field].append(self.vocab[field].encode(value(field)))
+        for field in TEXT_FIELDS:
+            self.text[field].append(value(field))
+
+        self.confidence.append(_to_float(value('confidence')))
+        self.submitted_at.append(_to_epoch(value('submitted_at')))
+
+        mask = 0
+        for option in split_answers(value('strengths')):
+            code = self.strength_options.encode(option) - 1
+            if code >= MAX_STRENGTH_OPTIONS:
+                raise ValueError(f"More than {MAX_STRENGTH_OPTIONS} distinct strength options")
+            mask |= 1 << code
+        self.strengths.append(mask)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    # ============================================
+    # READS
+    # ============================================
+
+    def record(self, i) -> ResponseRecord:
+        options = self.strength_options.values[1:]
+        mask = self.strengths[i]
+        return ResponseRecord(
+            confidence=None if math.isnan(self.confidence[i]) else self.confidence[i],
+            submitted_at=_format_epoch(self.submitted_at[i]),
+            strengths=tuple(option for bit, option in enumerate(options) if mask >> bit & 1),
+            **{field: self.vocab[field].decode(self.codes[field][i]) for field in CHOICE_FIELDS},
+            **{field: self.text[field][i] for field in TEXT_FIELDS},
+        )
+
+    def __iter__(self):
+        return (self.record(i) for i in range(len(self)))
+
+    def code_array(self, field) -> np.ndarray:
+        """Zero-copy numpy view of a choice field's codes"""
+        return np.frombuffer(self.codes[field], dtype=np.uint32) if len(self) else np.zeros(0, np.uint32)
+
+    def counts(self, field) -> pd.Series:
+        """Answer counts for one choice field without decoding any rows"""
+        vocab = self.vocab[field].values
+        counts = np.bincount(self.code_array(field), minlength=len(vocab))
+        return pd.Series(counts[1:], index=vocab[1:], dtype='int64')
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Sheet-shaped DataFrame; choice answers come back as categoricals"""
+        data = {}
+        for field in CHOICE_FIELDS:
+            codes = self.code_array(field).astype(np.int64) - 1
+            data[SCHEMA_FIELDS[field][0]] = pd.Categorical.from_codes(codes, self.vocab[field].values[1:])
+        for field in TEXT_FIELDS:
+            column = self.text[field]
+            values = (column[i] for i in range(len(self)))
+            data[SCHEMA_FIELDS[field][0]] = [math.nan if value is None else value for value in values]
+        data[COL_CONFIDENCE] = np.frombuffer(self.confidence, dtype=np.float64) if len(self) else np.zeros(0)
+        data[SCHEMA_FIELDS['submitted_at'][0]] = [_format_epoch(seconds) for seconds in self.submitted_at]
+        options = self.strength_options.values[1:]
+        data[COL_STRENGTHS] = [
+            repr([option for bit, option in enumerate(options) if mask >> bit & 1]) for mask in self.strengths
+        ]
+        return pd.DataFrame(data)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the buffer (vocabularies included)"""
+        arrays = [*self.codes.values(), self.confidence, self.submitted_at, self.strengths]
+        vocab_bytes = sum(len(str(v)) for vocab in (*self.vocab.values(), self.strength_options) for v in vocab.values)
+        return sum(a.itemsize * len(a) for a in arrays) + sum(t.nbytes() for t in self.text.values()) + vocab_bytes
@@ -0,0 +1,665 @@
+"""
+75HER Workshop Response Store
+Embedded SQL backend (SQLite, or DuckDB when installed) for large response
+histories: metrics run as grouped queries and only aggregates and quote
+candidates come back to Python
+"""
+
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from workshop_analytics import (
+    COL_AFTER_WORKSHOP, COL_BACKGROUND, COL_COHORT, COL_CONFIDENCE, COL_EVENT, COL_FACILITATOR_RATING, COL_FEEDBACK,
+    COL_FEEDBACK_CLUSTER, COL_FEEDBACK_LABELS, COL_FEEDBACK_SENTIMENT, COL_HANDS_ON, COL_ONE_THING, COL_ONE_THING_CLUSTER,
+    COL_ONE_THING_SENTIMENT, COL_PACE, COL_SESSION, COL_STRENGTHS, COL_SUBMISSION_ID, HANDS_CREATED,
+    HANDS_FOLLOWED, MIN_QUOTE_LENGTH, NEGATIVE_POLARITY, PACE_JUST_RIGHT, PACE_TOO_FAST, PACE_TOO_SLOW,
+    FEEDBACK_CATEGORIES, POSITIVE_POLARITY, RATING_EXCELLENT, RATING_GOOD, STRENGTH_PREFIX, SUBMISSION_TIME_COLUMNS,
+    QUOTE_LENGTH_BAND, QUOTE_WEIGHTS, answer_hashes, apply_schema, classify_feedback, drop_duplicate_submissions,
+    extract_top_quotes, health_score, lsh_clusters, minhash_signatures, parse_multi_select, prepare_responses,
+    row_keys, strength_columns, submission_times
+)
+
+# ============================================
+# CONFIGURATION
+# ============================================
+DEFAULT_DB_FILE = 'workshop_responses.db'
+ENGINES = ('sqlite', 'duckdb')
+
+# SQL column -> sheet column (after prepare_responses)
+STORE_COLUMNS = {
+    'submission_id': COL_SUBMISSION_ID,
+    'event': COL_EVENT,
+    'cohort': COL_COHORT,
+    'session': COL_SESSION,
+    'background': COL_BACKGROUND,
+    'confidence': COL_CONFIDENCE,
+    'rating': COL_FACILITATOR_RATING,
+    'pace': COL_PACE,
+    'hands_on': COL_HANDS_ON,
+    'strengths': COL_STRENGTHS,
+    'after_workshop': COL_AFTER_WORKSHOP,
+    'feedback': COL_FEEDBACK,
+    'one_thing': COL_ONE_THING,
+    'feedback_labels': COL_FEEDBACK_LABELS,
+    'feedback_sentiment': COL_FEEDBACK_SENTIMENT,
+    'one_thing_sentiment': COL_ONE_THING_SENTIMENT,
+    'feedback_cluster': COL_FEEDBACK_CLUSTER,
+    'one_thing_cluster': COL_ONE_THING_CLUSTER,
+}
+NUMERIC_COLUMNS = ('confidence', 'feedback_sentiment', 'one_thing_sentiment')
+CLUSTER_COLUMNS = ('feedback_cluster', 'one_thing_cluster')
+
+# Layout version recorded in store_meta; bump it (and add a step to
+# ResponseStore._migrate) whenever stored keys or tables change meaning
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    submission_id TEXT UNIQUE,
+    submitted_at TEXT,
+    event TEXT,
+    cohort TEXT,
+    session TEXT,
+    background TEXT,
+    confidence DOUBLE,
+    rating TEXT,
+    pace TEXT,
+    hands_on TEXT,
+    strengths TEXT,
+    after_workshop TEXT,
+    feedback TEXT,
+    one_thing TEXT,
+    feedback_labels TEXT,
+    feedback_sentiment DOUBLE,
+    one_thing_sentiment DOUBLE,
+    feedback_cluster BIGINT,
+    one_thing_cluster BIGINT,
+    feedback_keywords INTEGER,
+    one_thing_keywords INTEGER,
+    fingerprint BIGINT
+)
+"""
+INDEX = "CREATE INDEX IF NOT EXISTS responses_session ON responses (session, background)"
+FINGERPRINT_INDEX = "CREATE INDEX IF NOT EXISTS responses_fingerprint ON responses (fingerprint)"
+META_SCHEMA = "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)"
+
+# One row per selected facilitator strength, so strength counts and
+# co-occurrence are plain GROUP BYs and self-joins; the key also lets a
+# retried insert skip strengths already stored
+STRENGTHS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS response_strengths (
+    submission_id TEXT,
+    strength TEXT,
+    PRIMARY KEY (submission_id, strength)
+)
+"""
+
+# Submission ids or fingerprints looked up per IN (...) query, well under SQLite's variable limit
+ID_LOOKUP_CHUNK = 500
+# Free-text question -> (text, sentiment, keyword count, cluster) SQL columns.
+# The keyword count is how many feedback labels the text matches, stored at
+# ingest so a quote's whole score_quote() score can be computed in SQL
+QUOTE_SOURCES = {
+    COL_FEEDBACK: ('feedback', 'feedback_sentiment', 'feedback_keywords', 'feedback_cluster'),
+    COL_ONE_THING: ('one_thing', 'one_thing_sentiment', 'one_thing_keywords', 'one_thing_cluster'),
+}
+KEYWORD_COLUMNS = {keywords: text for text, _, keywords, _ in QUOTE_SOURCES.values()}
+INSERT_COLUMNS = ['submitted_at', *STORE_COLUMNS, *KEYWORD_COLUMNS, 'fingerprint']
+# Usable responses fetched per page of a quote query; ranked queries keep
+# paging until no unfetched response can still reach the top N
+QUOTE_CANDIDATE_LIMIT = 2000
+
+# score_quote() for every response in SQL: length band, sentiment, keyword
+# coverage and recency over the filtered history (the same positions the
+# pandas path scores), best first
+QUOTE_RANK_QUERY = """
+SELECT pos, text, sentiment, cluster, recency,
+       ? * (CASE WHEN LENGTH(TRIM(text)) BETWEEN ? AND ? THEN 1.0
+                 WHEN LENGTH(TRIM(text)) < ? THEN LENGTH(TRIM(text)) * 1.0 / ?
+                 ELSE ? * 1.0 / LENGTH(TRIM(text)) END)
+       + ? * COALESCE((sentiment + 1) / 2.0, 0.5)
+       + ? * COALESCE(keywords, 0) * 1.0 / ?
+       + ? * recency AS score
+FROM (
+    SELECT rowid AS pos, {text} AS text, {sentiment} AS sentiment, {keywords} AS keywords, {cluster} AS cluster,
+           (ROW_NUMBER() OVER (ORDER BY rowid) - 1) * 1.0
+           / CASE WHEN COUNT(*) OVER () > 1 THEN COUNT(*) OVER () - 1 ELSE 1 END AS recency
+    FROM responses {where}
+) scored
+WHERE LENGTH(TRIM(text)) > ?
+ORDER BY score DESC, pos
+"""
+
+# Every headline count in one grouped pass; CASE keeps it portable across engines.
+# Only sums and counts, so the results for separate row ranges add up
+METRICS_QUERY = """
+SELECT session AS workshop,
+       COUNT(*) AS total,
+       COUNT(confidence) AS rated,
+       COALESCE(SUM(confidence), 0) AS confidence_sum,
+       SUM(CASE WHEN rating = ? THEN 1 ELSE 0 END) AS excellent,
+       SUM(CASE WHEN rating = ? THEN 1 ELSE 0 END) AS good,
+       SUM(CASE WHEN pace = ? THEN 1 ELSE 0 END) AS just_right,
+       SUM(CASE WHEN pace IN (?, ?) THEN 1 ELSE 0 END) AS too_fast,
+       SUM(CASE WHEN pace IN (?, ?) THEN 1 ELSE 0 END) AS too_slow,
+       SUM(CASE WHEN hands_on = ? THEN 1 ELSE 0 END) AS created,
+       SUM(CASE WHEN hands_on = ? THEN 1 ELSE 0 END) AS followed,
+       COUNT(feedback_sentiment) AS scored,
+       COALESCE(SUM(feedback_sentiment), 0) AS sentiment_sum,
+       SUM(CASE WHEN feedback_sentiment > ? THEN 1 ELSE 0 END) AS positive,
+       SUM(CASE WHEN feedback_sentiment < ? THEN 1 ELSE 0 END) AS negative
+FROM responses
+{where}
+GROUP BY session
+"""
+METRICS_PARAMS = [
+    RATING_EXCELLENT, RATING_GOOD, PACE_JUST_RIGHT, *PACE_TOO_FAST, *PACE_TOO_SLOW,
+    HANDS_CREATED, HANDS_FOLLOWED, POSITIVE_POLARITY, NEGATIVE_POLARITY,
+]
+
+# ============================================
+# STORE
+# ============================================
+
+def _filters(workshop=None, background=None, labels=None):
+    """WHERE clause and parameters for the optional workshop/background/theme filters
+
+    `labels` keeps rows tagged with any of the given feedback labels, as
+    filter_by_labels() does.
+    """
+    clauses, params = [], []
+    if workshop is not None:
+        clauses.append('session = ?')
+        params.append(workshop)
+    if background is not None:
+        clauses.append('background = ?')
+        params.append(background)
+    if labels:
+        clauses.append('(' + ' OR '.join(
+            "instr(', ' || COALESCE(feedback_labels, '') || ', ', ?) > 0" for _ in labels
+        ) + ')')
+        params.extend(f', {label}, ' for label in labels)
+    return ('WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def _and(where, clause):
+    return f"{where} AND {clause}" if where else f"WHERE {clause}"
+
+
+def _pct(part, total):
+    return (part / total * 100) if total > 0 else 0
+
+
+def fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """answer_hashes() as signed 64-bit integers, the form the store indexes them in"""
+    return answer_hashes(df).to_numpy().view(np.int64)
+
+
+def keyword_counts(text: pd.Series) -> pd.Series:
+    """How many feedback labels each answer matches (the keyword part of score_quote())"""
+    return classify_feedback(text).sum(axis=1).astype(int)
+
+
+class ResponseStore:
+    """Append-only table of survey responses with pushed-down aggregations"""
+
+    def __init__(self, path=DEFAULT_DB_FILE, engine='sqlite'):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (expected one of {', '.join(ENGINES)})")
+        self.path = path
+        self.engine = engine
+        self._lock = threading.Lock()
+
+        if engine == 'duckdb':
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError("The DuckDB backend needs the duckdb package: pip install duckdb") from e
+            self._conn = duckdb.connect(path)
+        else:
+            # Streamlit reruns on different threads; the lock serializes access
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock:
+            self._conn.execute(SCHEMA)
+            self._conn.execute(INDEX)
+            self._conn.execute(FINGERPRINT_INDEX)
+            self._conn.execute(META_SCHEMA)
+            self._conn.execute(STRENGTHS_SCHEMA)
+            self._migrate()
+            self._commit()
+
+    def _migrate(self):
+        """Record the layout version of a new store, and refuse one written by a newer version"""
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO store_meta (key, value) VALUES ('version', ?)", [str(STORE_VERSION)])
+        elif int(row[0]) > STORE_VERSION:
+            raise ValueError(f"{self.path} was written by a newer store (version {row[0]}, expected {STORE_VERSION})")
+
+    def _commit(self):
+        if self.engine == 'sqlite':
+            self._conn.commit()
+
+    def _query(self, sql, params=()):
+        """Run a read query and return the result as a DataFrame"""
+        with self._lock:
+            cursor = self._conn.execute(sql, list(params))
+            columns = [d[0] for d in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ============================================
+    # WRITES
+    # ============================================
+
+    def _rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Prepared responses mapped onto the table's columns"""
+        rows = pd.DataFrame(index=df.index)
+        times = submission_times(df)
+        rows['submitted_at'] = times.dt.strftime('%Y-%m-%d %H:%M:%S')
+        for name, col in STORE_COLUMNS.items():
+            rows[name] = df[col] if col in df.columns else None
+        for name in NUMERIC_COLUMNS:
+            rows[name] = pd.to_numeric(rows[name], errors='coerce')
+        rows['submission_id'] = row_keys(df)
+        rows['fingerprint'] = fingerprints(df)
+        for name, text in KEYWORD_COLUMNS.items():
+            rows[name] = keyword_counts(rows[text])
+
+        # Cluster ids restart at 0 for every ingest batch; shift them past the
+        # stored ones so separate batches never look like near-duplicates
+        offset = self._query(
+            f"SELECT COALESCE(MAX({CLUSTER_COLUMNS[0]}), -1), COALESCE(MAX({CLUSTER_COLUMNS[1]}), -1) FROM responses"
+        ).iloc[0].max() + 1
+        for name in CLUSTER_COLUMNS:
+            rows[name] = pd.to_numeric(rows[name], errors='coerce') + offset
+
+        rows = rows[INSERT_COLUMNS].astype(object)
+        return rows.where(rows.notna(), None)
+
+    def _insert(self, table, rows: pd.DataFrame):
+        """Bulk INSERT OR IGNORE of a DataFrame whose columns match the table's (lock held)"""
+        columns = ', '.join(rows.columns)
+        if self.engine == 'duckdb':
+            self._conn.register('incoming', rows)
+            self._conn.execute(f"INSERT OR IGNORE INTO {table} ({columns}) SELECT {columns} FROM incoming")
+            self._conn.unregister('incoming')
+        else:
+            placeholders = ', '.join('?' for _ in rows.columns)
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None),
+            )
+
+    def _insert_strengths(self, rows: pd.DataFrame):
+        if len(rows):
+            self._insert('response_strengths', rows)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Insert prepared responses, skipping submission ids already stored; returns rows added"""
+        if df is None or len(df) == 0:
+            return 0
+        rows = self._rows(df)
+        new = ~rows['submission_id'].isin(self.stored_ids(rows['submission_id'])) & ~rows['submission_id'].duplicated()
+        if not new.any():
+            return 0
+        rows, df = rows[new.to_numpy()], df[new.to_numpy()]
+        with self._lock:
+            # Responses and their strength rows land together or not at all
+            if self.engine == 'duckdb':
+                self._conn.begin()
+            try:
+                self._insert('responses', rows)
+                self._insert_strengths(_strength_rows(df, rows['submission_id']))
+            except Exception:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+        return len(rows)
+
+    # ============================================
+    # READS
+    # ============================================
+
+    def count(self, workshop=None, labels=None) -> int:
+        """Stored responses, optionally for one workshop and/or feedback themes"""
+        where, params = _filters(workshop, labels=labels)
+        return int(self._query(f"SELECT COUNT(*) AS n FROM responses {where}", params)['n'].iloc[0])
+
+    def _lookup(self, select, key, values):
+        """Stored rows whose `key` is one of `values`, one DataFrame per chunked IN (...) query"""
+        values = list(values)
+        for start in range(0, len(values), ID_LOOKUP_CHUNK):
+            chunk = values[start:start + ID_LOOKUP_CHUNK]
+            placeholders = ', '.join('?' for _ in chunk)
+            yield self._query(f"SELECT {select} FROM responses WHERE {key} IN ({placeholders})", chunk)
+
+    def stored_ids(self, ids) -> set:
+        """The given submission ids that are already in the store"""
+        found = set()
+        for rows in self._lookup('submission_id', 'submission_id', [str(i) for i in ids]):
+            found.update(rows['submission_id'])
+        return found
+
+    def resubmission_candidates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Stored responses sharing a submission id or answer fingerprint with `df`, oldest first
+
+        Read back under the sheet's column names, ready for
+        find_duplicate_submissions(earlier=...); the fingerprint index keeps
+        this to a few lookups however long the history is.
+        """
+        select = 'rowid AS pos, ' + ', '.join(INSERT_COLUMNS)
+        rows = pd.concat([
+            self._query(f"SELECT {select} FROM responses LIMIT 0"),     # the columns, even with no matches
+            *self._lookup(select, 'submission_id', row_keys(df).astype(str).unique()),
+            *self._lookup(select, 'fingerprint', [int(v) for v in np.unique(fingerprints(df))]),
+        ], ignore_index=True)
+        rows = rows.drop_duplicates('pos').sort_values('pos').drop(columns='pos').reset_index(drop=True)
+        return rows.rename(columns={'submitted_at': SUBMISSION_TIME_COLUMNS[0], **STORE_COLUMNS})
+
+    def version(self) -> int:
+        """Changes whenever responses are added; the table is append-only, so the
+        newest rowid is enough and avoids counting every row on each poll"""
+        return int(self._query("SELECT COALESCE(MAX(rowid), 0) AS v FROM responses")['v'].iloc[0])
+
+    def responses(self, workshop=None) -> pd.DataFrame:
+        """Stored rows back under the sheet's column names, oldest first"""
+        where, params = _filters(workshop)
+        rows = self._query(f"SELECT {', '.join(INSERT_COLUMNS)} FROM responses {where} ORDER BY rowid", params)
+        return rows.rename(columns={'submitted_at': SUBMISSION_TIME_COLUMNS[0], **STORE_COLUMNS})
+
+    def workshops(self) -> list:
+        return self._query("SELECT DISTINCT session FROM responses WHERE session IS NOT NULL ORDER BY session")['session'].tolist()
+
+    def last_rowid(self) -> int:
+        """rowid of the newest stored response (0 when empty); rows only ever append"""
+        return int(self._query("SELECT COALESCE(MAX(rowid), 0) AS n FROM responses")['n'].iloc[0])
+
+    def metric_counts(self, workshop=None, background=None, labels=None, rowids=None) -> pd.DataFrame:
+        """Per-workshop sums and counts behind metrics()
+
+        `rowids=(after, upto)` counts only the rows stored in that range, so
+        running totals can be topped up with just the newest rows.
+        """
+        where, params = _filters(workshop, background, labels)
+        if rowids is not None:
+            where = _and(where, 'rowid > ? AND rowid <= ?')
+            params += list(rowids)
+        return self._query(METRICS_QUERY.format(where=where), METRICS_PARAMS + params).set_index('workshop')
+
+    def metrics(self, workshop=None, background=None, labels=None) -> pd.DataFrame:
+        """Per-workshop counts and percentages from one grouped query
+
+        Percentage columns use the same names and units as the dashboard's
+        calculate_metrics().
+        """
+        return metric_rates(self.metric_counts(workshop, background, labels))
+
+    def _totals(self, workshop=None, background=None, labels=None) -> pd.Series:
+        """One workshop's metrics row, or every workshop combined"""
+        counts = self.metric_counts(workshop, background, labels)
+        if counts.empty:
+            return None
+        if workshop is None:
+            # Sums and counts add up across workshops; rates are only taken after,
+            # so averages are over answered questions just as the pandas path's are
+            counts = counts.sum(numeric_only=True).to_frame().T
+        return metric_rates(counts).iloc[0]
+
+    def workshop_metrics(self, workshop=None, background=None) -> dict:
+        """Metrics in the same shape as the dashboard's calculate_metrics()"""
+        row = self._totals(workshop, background)
+        keys = ('confidence', 'excellent_pct', 'good_pct', 'pace_just', 'pace_fast', 'pace_slow',
+                'hands_completion', 'hands_created', 'hands_followed')
+        if row is None:
+            return {'total': 0, **{key: 0 for key in keys}}
+        return {'total': int(row['total']), **{key: float(row[key]) for key in keys}}
+
+    def report_metrics(self, workshop=None, labels=None) -> dict:
+        """The report generators' analyze_* results, computed in SQL"""
+        row = self._totals(workshop, labels=labels)
+        if row is None:
+            return None
+        total = int(row['total'])
+        return {
+            'total': total,
+            'confidence': float(row['confidence']),
+            'facilitator_rating': {
+                'excellent': int(row['excellent']),
+                'excellent_pct': _pct(row['excellent'], total),
+                'good': int(row['good']),
+                'good_pct': _pct(row['good'], total),
+                'total': total,
+            },
+            'pace': {
+                'just_right': int(row['just_right']),
+                'just_right_pct': float(row['pace_just']),
+                'too_fast': int(row['too_fast']),
+                'too_fast_pct': float(row['pace_fast']),
+                'too_slow': int(row['too_slow']),
+                'too_slow_pct': float(row['pace_slow']),
+            },
+            'hands_on': {
+                'created': int(row['created']),
+                'followed': int(row['followed']),
+                'completion_rate': float(row['hands_completion']),
+            },
+            'sentiment': {
+                'scored': int(row['scored']),
+                'average': float(row['sentiment']),
+                'positive_pct': float(row['positive_pct']),
+                'negative_pct': float(row['negative_pct']),
+            },
+        }
+
+    def comparison(self, labels=None) -> pd.DataFrame:
+        """compare_workshops() from the grouped metrics query: one row per workshop, best health first"""
+        counts = self.metrics(labels=labels)
+        counts = counts[counts.index.notna()]
+        columns = ['total', 'confidence', 'excellent_pct', 'good_pct', 'pace_just', 'pace_fast', 'pace_slow',
+                   'hands_created', 'hands_followed', 'hands_completion']
+        comparison = counts[columns].astype(float)
+        comparison['total'] = counts['total'].astype(int)
+        comparison['health'] = health_score(
+            comparison['confidence'], comparison['excellent_pct'],
+            comparison['hands_created'], comparison['pace_just'],
+        )
+        comparison = comparison.sort_values('health', ascending=False, kind='stable')
+        comparison.insert(0, 'rank', range(1, len(comparison) + 1))
+        comparison.index.name = 'workshop'
+        return comparison
+
+    def top_strengths(self, workshop=None, labels=None, n=6) -> list:
+        """analyze_facilitator_strengths(): top N (strength, count) pairs, most selected first"""
+        where, params = _filters(workshop, labels=labels)
+        counts = self._query(
+            "SELECT s.strength AS strength, COUNT(*) AS n FROM response_strengths s "
+            f"JOIN responses ON responses.submission_id = s.submission_id {where} "
+            "GROUP BY s.strength ORDER BY n DESC, s.strength LIMIT ?",
+            params + [n],
+        )
+        return [(strength, int(count)) for strength, count in counts.itertuples(index=False)]
+
+    def strength_cooccurrence(self, workshop=None, labels=None) -> pd.DataFrame:
+        """strength_cooccurrence(): strengths x strengths co-selection counts from a self-join"""
+        where, params = _filters(workshop, labels=labels)
+        pairs = self._query(
+            "SELECT a.strength AS first, b.strength AS second, COUNT(*) AS n FROM response_strengths a "
+            "JOIN response_strengths b ON b.submission_id = a.submission_id "
+            f"JOIN responses ON responses.submission_id = a.submission_id {where} "
+            "GROUP BY a.strength, b.strength",
+            params,
+        )
+        if pairs.empty:
+            return pd.DataFrame()
+        matrix = pairs.pivot(index='first', columns='second', values='n')
+        strengths = sorted(matrix.index)
+        matrix = matrix.reindex(index=strengths, columns=strengths).fillna(0).astype('int64')
+        matrix.index.name = matrix.columns.name = None
+        return matrix
+
+    def theme_counts(self, workshop=None, labels=None) -> pd.Series:
+        """feedback_theme_counts(): labelled responses per theme, one per near-duplicate cluster"""
+        where, params = _filters(workshop, labels=labels)
+        where = _and(where, "feedback_labels <> ''")
+        themes = list(FEEDBACK_CATEGORIES)
+        counts = self._query(
+            "SELECT " + ', '.join(
+                f"SUM(CASE WHEN instr(', ' || feedback_labels || ', ', ?) > 0 THEN 1 ELSE 0 END) AS t{i}"
+                for i in range(len(themes))
+            ) + " FROM responses WHERE rowid IN "
+            f"(SELECT MIN(rowid) FROM responses {where} GROUP BY feedback_cluster)",
+            [f', {theme}, ' for theme in themes] + params,
+        ).iloc[0]
+        return pd.Series(counts.fillna(0).astype('int64').to_numpy(), index=themes)
+
+    def quotes(self, column=COL_FEEDBACK, workshop=None, n=5, mode='ranked', limit=QUOTE_CANDIDATE_LIMIT, labels=None):
+        """Top quotes for one free-text question, as extract_top_quotes() would pick them
+
+        Ranked quotes are scored across every stored response in SQL, best
+        first, and paging stops once no unfetched response can reach the top N.
+        Near-duplicates are found by re-clustering the fetched candidates, not
+        the whole history, so clusters (and therefore which of two similar
+        quotes survives) can differ from the pandas path's.
+        """
+        text_col, sentiment_col, keywords_col, cluster_col = QUOTE_SOURCES[column]
+        where, params = _filters(workshop, labels=labels)
+        if mode != 'ranked':
+            candidates = self._query(
+                f"SELECT {text_col} AS text, {cluster_col} AS cluster FROM responses "
+                f"{_and(where, f'LENGTH(TRIM({text_col})) > {MIN_QUOTE_LENGTH}')} ORDER BY rowid LIMIT ?",
+                params + [limit],
+            )
+            return extract_top_quotes(candidates['text'], n=n, clusters=_quote_clusters(candidates))
+
+        low, high = QUOTE_LENGTH_BAND
+        weights = [QUOTE_WEIGHTS.get('length', 0), low, high, low, low, high, QUOTE_WEIGHTS.get('sentiment', 0),
+                   QUOTE_WEIGHTS.get('keywords', 0), len(FEEDBACK_CATEGORIES), QUOTE_WEIGHTS.get('recency', 0)]
+        sql = QUOTE_RANK_QUERY.format(text=text_col, sentiment=sentiment_col, keywords=keywords_col,
+                                      cluster=cluster_col, where=where)
+        with self._lock:
+            cursor = self._conn.execute(sql, weights + params + [MIN_QUOTE_LENGTH])
+            columns = [d[0] for d in cursor.description]
+            rows = []
+            while True:
+                page = cursor.fetchmany(limit)
+                rows.extend(page)
+                # Rows come best first, so nothing unfetched can beat the last one
+                if len(page) < limit or _quote_cutoff(pd.DataFrame(rows, columns=columns), n) > page[-1][-1]:
+                    break
+        if not rows:
+            return []
+
+        # Back in response order, so ties still go to the earlier response
+        candidates = pd.DataFrame(rows, columns=columns).sort_values('pos', ignore_index=True)
+        return extract_top_quotes(
+            candidates['text'], n=n, mode='ranked',
+            sentiment=candidates['sentiment'].astype(float), clusters=_quote_clusters(candidates),
+            recency=candidates['recency'].astype(float),
+        )
+
+
+def _quote_clusters(candidates: pd.DataFrame) -> pd.Series:
+    """Near-duplicate clusters among fetched quote candidates
+
+    Stored cluster ids only group rows of one ingest batch, so the candidates
+    are also re-clustered together; two candidates are near-duplicates when
+    either clustering says so.
+    """
+    texts = candidates['text'].astype(str).str.strip().tolist()
+    clusters = pd.Series(lsh_clusters(minhash_signatures(texts)))
+    stored = pd.to_numeric(candidates['cluster'], errors='coerce').reset_index(drop=True)
+    # Rows without a stored cluster stand alone
+    stored = stored.fillna(pd.Series(-1.0 - np.arange(len(stored))))
+    while True:
+        merged = clusters.groupby(stored).transform('min').groupby(clusters).transform('min')
+        if merged.equals(clusters):
+            return clusters.astype('Int64')
+        clusters = merged
+
+
+def _quote_cutoff(candidates: pd.DataFrame, n):
+    """Score of the Nth best distinct-cluster candidate fetched so far (-inf when fewer)"""
+    best = candidates['score'].groupby(_quote_clusters(candidates).to_numpy()).max().sort_values(ascending=False)
+    return best.iloc[n - 1] if len(best) >= n else float('-inf')
+
+
+def metric_rates(counts: pd.DataFrame) -> pd.DataFrame:
+    """metric_counts() with the averages and percentages added"""
+    counts = counts.copy()
+    total = counts['total'].where(counts['total'] > 0)
+    rated = counts['rated'].where(counts['rated'] > 0)
+    scored = counts['scored'].where(counts['scored'] > 0)
+
+    counts['confidence'] = (counts['confidence_sum'] / rated).astype(float).fillna(0.0)
+    counts['excellent_pct'] = counts['excellent'] / total * 100
+    counts['good_pct'] = (counts['excellent'] + counts['good']) / total * 100
+    counts['pace_just'] = counts['just_right'] / total * 100
+    counts['pace_fast'] = counts['too_fast'] / total * 100
+    counts['pace_slow'] = counts['too_slow'] / total * 100
+    counts['hands_created'] = counts['created'] / total * 100
+    counts['hands_followed'] = counts['followed'] / total * 100
+    counts['hands_completion'] = (counts['created'] + counts['followed']) / total * 100
+    counts['sentiment'] = (counts['sentiment_sum'] / scored).astype(float).fillna(0.0)
+    counts['positive_pct'] = counts['positive'] / scored * 100
+    counts['negative_pct'] = counts['negative'] / scored * 100
+    return counts.fillna(0)
+
+
+def _strength_rows(df: pd.DataFrame, ids: pd.Series) -> pd.DataFrame:
+    """(submission_id, strength) per selected strength, from the ingest indicator columns
+    or, failing those, the raw multi-select answers"""
+    columns = strength_columns(df)
+    if columns:
+        names = [c[len(STRENGTH_PREFIX):] for c in columns]
+        selected = np.column_stack([df[c].to_numpy(dtype=bool) for c in columns])
+    elif COL_STRENGTHS in df.columns and len(df):
+        indicators = parse_multi_select(df[COL_STRENGTHS])
+        names, selected = list(indicators.columns), indicators.to_numpy(dtype=bool)
+    else:
+        return pd.DataFrame(columns=['submission_id', 'strength'])
+    rows, cols = np.nonzero(selected)
+    return pd.DataFrame({
+        'submission_id': ids.astype(str).to_numpy()[rows],
+        'strength': np.asarray(names, dtype=object)[cols],
+    })
+
+
+def sync_responses(store: ResponseStore, raw: pd.DataFrame) -> int:
+    """Add a sheet's new responses to the store, preparing only those rows
+
+    Resubmissions are dropped across the whole sheet first, so a row dedup
+    removed once is never added on a later sync.
+    """
+    if raw is None or len(raw) == 0:
+        return 0
+    raw, _ = drop_duplicate_submissions(apply_schema(raw))
+    ids = row_keys(raw)
+    new = ~ids.isin(store.stored_ids(ids)).to_numpy()
+    if not new.any():
+        return 0
+    batch = raw[new].copy()
+    batch[COL_SUBMISSION_ID] = ids[new].to_numpy()
+    return store.append(prepare_responses(batch, dedup=False))
+
+
+def open_store(path, df=None, engine='sqlite', raw=None):
+    """Open the store at `path` (None when no path is given) and sync in any new responses
+
+    Pass prepared responses as `df`, or the raw sheet as `raw` to prepare only
+    the rows the store doesn't have yet.
+    """
+    if not path:
+        return None
+    store = ResponseStore(path, engine=engine)
+    if df is not None or raw is not None:
+        added = store.append(df) if df is not None else sync_responses(store, raw)
+        print(f"🗄️ Synced {added} new responses into {path} ({store.count()} stored)")
+    return store
@@ -0,0 +1,129 @@
+"""
+75HER Workshop Sheet Loader
+Fetches survey responses from many spreadsheets / worksheet tabs concurrently
+and merges them into one DataFrame tagged with their event and cohort
+"""
+
+import asyncio
+import json
+import os
+
+import pandas as pd
+
+from telemetry import telemetry
+from workshop_analytics import COL_COHORT, COL_EVENT, resolve_schema
+
+# ============================================
+# CONFIGURATION
+# ============================================
+# Optional JSON list of sources; without it only the default sheet is read
+SHEET_SOURCES_FILE = 'sheet_sources.json'
+
+# Sheets fetched at once; keeps us well inside the Sheets API rate limits
+MAX_CONCURRENT_FETCHES = 4
+
+# Worksheet value meaning "every tab in the spreadsheet"
+ALL_WORKSHEETS = '*'
+
+# ============================================
+# SOURCES
+# ============================================
+
+def load_sources(path=SHEET_SOURCES_FILE, default_sheet=None) -> list:
+    """Sheet sources to read
+
+    Each source is a dict with 'sheet' (spreadsheet title) and optionally
+    'worksheet' (tab title, or '*' for every tab), 'event' and 'cohort'.
+    Event defaults to the spreadsheet title and cohort to the tab title.
+    """
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            sources = json.load(f)
+        return [{'sheet': s} if isinstance(s, str) else s for s in sources]
+    return [{'sheet': default_sheet}] if default_sheet else []
+
+
+def normalize_headers(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rename drifted headers to the canonical questions so tabs line up when merged"""
+    renames = resolve_schema(frame.columns, required=()).rename_map()
+    return frame.rename(columns=lambda col: renames.get(col, str(col).strip()))
+
+
+def _worksheets(client, source) -> list:
+    """Blocking: open one spreadsheet and pick the tabs to read"""
+    spreadsheet = client.open(source['sheet'])
+    tab = source.get('worksheet')
+    if tab == ALL_WORKSHEETS:
+        return spreadsheet.worksheets()
+    return [spreadsheet.worksheet(tab) if tab else spreadsheet.sheet1]
+
+
+def _read_worksheet(source, worksheet) -> pd.DataFrame:
+    """Blocking: one tab's responses under the common schema"""
+    frame = normalize_headers(pd.DataFrame(worksheet.get_all_records()))
+    frame[COL_EVENT] = source.get('event') or worksheet.spreadsheet.title
+    frame[COL_COHORT] = source.get('cohort') or worksheet.title
+    return frame
+
+
+async def _limited(semaphore, fn, *args):
+    """Run a blocking gspread call in a worker thread, at most `limit` at a time"""
+    async with semaphore:
+        return await asyncio.to_thread(fn, *args)
+
+
+def _report_failures(labels, results):
+    """Warn about failed fetches and return the successful results"""
+    ok = []
+    for label, result in zip(labels, results):
+        if isinstance(result, Exception):
+            # One missing or unshared sheet shouldn't sink the whole report
+            print(f"⚠️ Warning: Could not read '{label}' - {result.__class__.__name__}: {result}")
+            telemetry.count('sheet_fetch_errors', sheet=label)
+        else:
+            ok.append(result)
+    return ok
+
+
+async def fetch_sources(client, sources, limit=MAX_CONCURRENT_FETCHES) -> pd.DataFrame:
+    """Fetch every source concurrently (at most `limit` requests at a time) and merge them
+
+    Spreadsheets are opened in parallel first, then every selected tab is read
+    in parallel, so total time tracks the slowest tab rather than the sum.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    opened = await asyncio.gather(
+        *(_limited(semaphore, _worksheets, client, source) for source in sources),
+        return_exceptions=True,
+    )
+    tabs = [
+        (source, worksheet)
+        for source, worksheets in zip(sources, opened) if not isinstance(worksheets, Exception)
+        for worksheet in worksheets
+    ]
+    _report_failures([source['sheet'] for source in sources], opened)
+
+    read = await asyncio.gather(
+        *(_limited(semaphore, _read_worksheet, source, worksheet) for source, worksheet in tabs),
+        return_exceptions=True,
+    )
+    frames = _report_failures([f"{source['sheet']} / {worksheet.title}" for source, worksheet in tabs], read)
+
+    if not frames:
+        # Nothing readable at all: surface the first error to the caller
+        errors = [r for r in opened + read if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+        return pd.DataFrame()
+    # Sheets with extra or missing questions still line up by header
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def load_responses(client, sources, limit=MAX_CONCURRENT_FETCHES) -> pd.DataFrame:
+    """Synchronous entry point for scripts and the dashboard"""
+    with telemetry.span('sheets_fetch', sources=len(sources)) as span:
+        df = asyncio.run(fetch_sources(client, sources, limit))
+        span['rows'] = len(df)
+    telemetry.count('responses_fetched', len(df))
+    return df
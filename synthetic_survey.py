@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+75HER Synthetic Survey Generator
+Creates realistic fake JotForm responses (same columns and answer options as
+the live sheet) for demos, load tests and benchmarks
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from workshop_analytics import (
+    COL_BACKGROUND, COL_CONFIDENCE, COL_FACILITATOR_RATING, COL_FEEDBACK, COL_HANDS_ON, COL_ONE_THING,
+    COL_PACE, COL_SESSION, COL_STRENGTHS, COL_SUBMISSION_ID, HANDS_CREATED, HANDS_FOLLOWED, PACE_JUST_RIGHT,
+    PACE_TOO_FAST, PACE_TOO_SLOW, RATING_EXCELLENT, RATING_GOOD
+)
+
+# ============================================
+# CONFIGURATION
+# ============================================
+COL_SUBMISSION_DATE = 'Submission Date'
+COL_AFTER_WORKSHOP = "After today's workshop, I feel:"
+
+WORKSHOPS = [
+    'Building a Production AI Agent : Women in Tech and Innovation',
+    'Making Your Confidence VISIBLE : Women Creators and Technologists',
+    'Voice & Pitch for Power: Communicating Technical Ideas With Clarity and Authority',
+]
+
+# Answer options with rough real-world frequencies
+RATINGS = {
+    RATING_EXCELLENT: 0.55,
+    RATING_GOOD: 0.30,
+    '😐 Okay - Some parts were unclear': 0.11,
+    '📉 Needs improvement - Hard to follow': 0.04,
+}
+PACES = {
+    PACE_JUST_RIGHT: 0.60,
+    PACE_TOO_FAST[0]: 0.15,
+    PACE_TOO_FAST[1]: 0.05,
+    PACE_TOO_SLOW[0]: 0.12,
+    PACE_TOO_SLOW[1]: 0.08,
+}
+HANDS_ON = {
+    HANDS_CREATED: 0.45,
+    HANDS_FOLLOWED: 0.35,
+    'No - I ran out of time': 0.15,
+    'No - This workshop did not have a hands-on portion': 0.05,
+}
+CONFIDENCE = {5: 0.30, 4: 0.38, 3: 0.20, 2: 0.08, 1: 0.04}
+BACKGROUNDS = {'Beginner': 0.45, 'Intermediate': 0.40, 'Expert': 0.15}
+AFTER_WORKSHOP = {
+    'Ready to apply this right away': 0.40,
+    'Inspired but need more practice': 0.35,
+    'Curious to learn more': 0.18,
+    'Overwhelmed': 0.07,
+}
+STRENGTHS = [
+    'Explained concepts clearly',
+    'Encouraged questions',
+    'Shared real-world examples, tools, and templates',
+    'Kept the energy high',
+    'Gave us time to build',
+    'Was well prepared',
+]
+
+# Free-text phrase banks, combined at random
+FEEDBACK_OPENERS = [
+    'Very clear examples and great energy.', 'Loved the live demo.', 'The slides were really helpful.',
+    'Great pacing and structure.', 'The hard parts were explained so well.', 'Solid content overall.',
+    'Really engaging session.', 'The hands-on exercise was the best part.', 'Audio was a bit choppy.',
+    'Too fast for me, slow down!',
+]
+FEEDBACK_CLOSERS = [
+    '', ' I wish we had more time for Q&A.', ' Maybe share the code before the session.',
+    ' Could go slower on the setup steps.', ' Thank you so much!', ' Would love an advanced follow-up.',
+    ' Please send the recording link.', ' More examples next time would help.',
+]
+ONE_THING_ACTIONS = [
+    'Build', 'Refactor', 'Practice', 'Write', 'Share', 'Prototype', 'Record', 'Update',
+]
+ONE_THING_OBJECTS = [
+    'a small AI agent for my team', 'my portfolio with a new project', 'my elevator pitch',
+    'a LinkedIn post about what I learned', 'my old Python script with new functions',
+    'a dashboard with Streamlit', 'my resume summary', 'a demo video of my project',
+]
+
+BLANK_TEXT_RATE = 0.15      # share of free-text answers left empty
+RESUBMIT_RATE = 0.02        # share of rows that repeat an earlier comment nearly verbatim
+
+# ============================================
+# GENERATION
+# ============================================
+
+def _choice(rng, options: dict, n):
+    """Draw n answers from an {answer: probability} mapping"""
+    answers = list(options)
+    return np.asarray(answers, dtype=object)[rng.choice(len(answers), size=n, p=list(options.values()))]
+
+
+def _phrases(rng, left, right, n, joiner=''):
+    """Vectorized random combination of two phrase banks"""
+    left = pd.Series(left, dtype=object).to_numpy()
+    right = pd.Series(right, dtype=object).to_numpy()
+    return left[rng.integers(0, len(left), n)] + joiner + right[rng.integers(0, len(right), n)]
+
+
+def generate_responses(n, seed=75, start='2025-03-01', days=75, workshops=None, id_offset=0) -> pd.DataFrame:
+    """n synthetic survey responses following the live sheet's column schema"""
+    rng = np.random.default_rng(seed)
+    workshops = workshops or WORKSHOPS
+
+    # Timestamps spread over the festival, in submission order
+    seconds = np.sort(rng.integers(0, max(1, int(days * 24 * 3600)), n))
+    submitted = pd.Timestamp(start) + pd.to_timedelta(seconds, unit='s')
+
+    feedback = _phrases(rng, FEEDBACK_OPENERS, FEEDBACK_CLOSERS, n)
+    one_thing = _phrases(rng, ONE_THING_ACTIONS, ONE_THING_OBJECTS, n, joiner=' ') + '.'
+
+    # Group submissions paste near-identical comments
+    repeats = np.flatnonzero(rng.random(n) < RESUBMIT_RATE)
+    repeats = repeats[repeats > 0]
+    feedback[repeats] = feedback[rng.integers(0, repeats)] + ' Agreed!'
+
+    feedback[rng.random(n) < BLANK_TEXT_RATE] = ''
+    one_thing[rng.random(n) < BLANK_TEXT_RATE] = ''
+
+    # Select-all-that-apply answers arrive as string-encoded lists; each row's
+    # picks form a bitmask that indexes a table of every possible answer
+    picks = rng.random((n, len(STRENGTHS))) < 0.35
+    masks = picks @ (1 << np.arange(len(STRENGTHS)))
+    answers = np.asarray([
+        '[' + ', '.join(f"'{s}'" for bit, s in enumerate(STRENGTHS) if mask >> bit & 1) + ']'
+        for mask in range(1 << len(STRENGTHS))
+    ], dtype=object)
+    strengths = answers[masks]
+
+    return pd.DataFrame({
+        COL_SUBMISSION_DATE: submitted.strftime('%Y-%m-%d %H:%M:%S'),
+        COL_SUBMISSION_ID: np.arange(id_offset, id_offset + n) + 6_000_000_000_000_000_000,
+        COL_SESSION: np.asarray(workshops, dtype=object)[rng.integers(0, len(workshops), n)],
+        COL_BACKGROUND: _choice(rng, BACKGROUNDS, n),
+        COL_CONFIDENCE: _choice(rng, CONFIDENCE, n),
+        COL_FACILITATOR_RATING: _choice(rng, RATINGS, n),
+        COL_PACE: _choice(rng, PACES, n),
+        COL_HANDS_ON: _choice(rng, HANDS_ON, n),
+        COL_STRENGTHS: strengths,
+        COL_AFTER_WORKSHOP: _choice(rng, AFTER_WORKSHOP, n),
+        COL_FEEDBACK: feedback,
+        COL_ONE_THING: one_thing,
+    })
+
+
+def iter_responses(n, chunk_size=1_000_000, seed=75, start='2025-03-01', days=75, **kwargs):
+    """Yield n responses in chunks so multi-million-row sets never sit in memory at once
+
+    Each chunk covers its own slice of the date range, so the concatenated
+    chunks stay in submission order.
+    """
+    for i, first in enumerate(range(0, n, chunk_size)):
+        size = min(chunk_size, n - first)
+        chunk_start = pd.Timestamp(start) + pd.Timedelta(days=days * first / n)
+        yield generate_responses(size, seed=seed + i, start=chunk_start, days=days * size / n,
+                                 id_offset=first, **kwargs)
+
+
+def write_responses(path, n, chunk_size=1_000_000, seed=75):
+    """Stream n synthetic responses to a CSV file"""
+    for i, chunk in enumerate(iter_responses(n, chunk_size=chunk_size, seed=seed)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    return path
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic 75HER survey responses")
+    parser.add_argument('rows', type=int, help="number of responses (100 to 10,000,000+)")
+    parser.add_argument('--output', default='synthetic_responses.csv', help="CSV file to write")
+    parser.add_argument('--seed', type=int, default=75)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {args.rows:,} synthetic responses...")
+    write_responses(args.output, args.rows, chunk_size=args.chunk_size, seed=args.seed)
+    print(f"✅ Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
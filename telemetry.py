@@ -0,0 +1,176 @@
+"""
+75HER Workshop Telemetry
+Lightweight timing spans and counters for the report pipeline, exportable as
+JSON lines or Prometheus text format
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+# ============================================
+# CONFIGURATION
+# ============================================
+# Set to a .prom/.txt path for Prometheus text format, anything else for JSON lines
+TELEMETRY_FILE_ENV = 'WORKSHOP_TELEMETRY_FILE'
+METRIC_PREFIX = 'workshop_'
+
+# Finished spans kept for JSON-lines export; older ones are dropped once the
+# dashboard has been up for a while (Prometheus totals are kept regardless)
+MAX_PENDING_SPANS = 10_000
+
+PROMETHEUS_EXTENSIONS = ('.prom', '.txt')
+
+# ============================================
+# RECORDER
+# ============================================
+
+class Telemetry:
+    """Collects timing spans and counters for one process"""
+
+    def __init__(self, service='workshop'):
+        self.service = service
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending = deque(maxlen=MAX_PENDING_SPANS)
+        self._stage_totals = {}     # stage -> [count, total seconds, max seconds]
+        self._counters = {}         # (name, sorted label items) -> value
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """Time a block; yields a dict the block can add attributes to (e.g. rows)"""
+        stack = self._local.__dict__.setdefault('stack', [])
+        parent = stack[-1] if stack else None
+        stack.append(stage)
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except Exception as e:
+            attrs['error'] = e.__class__.__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            record = {
+                'type': 'span', 'service': self.service, 'stage': stage, 'parent': parent,
+                'start': datetime.fromtimestamp(started, timezone.utc).isoformat(timespec='milliseconds'),
+                'seconds': round(seconds, 6), **attrs,
+            }
+            with self._lock:
+                self._pending.append(record)
+                totals = self._stage_totals.setdefault(stage, [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += seconds
+                totals[2] = max(totals[2], seconds)
+
+    def timed(self, stage):
+        """Decorator form of span()"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, value=1, **labels):
+        """Add to a monotonically increasing counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def stage_summary(self):
+        """{stage: {'count', 'total_seconds', 'max_seconds'}} since startup"""
+        with self._lock:
+            return {
+                stage: {'count': n, 'total_seconds': total, 'max_seconds': peak}
+                for stage, (n, total, peak) in self._stage_totals.items()
+            }
+
+    # ============================================
+    # EXPORT
+    # ============================================
+
+    def to_jsonl(self, clear=True):
+        """Spans finished since the last export plus current counters, one JSON object per line"""
+        with self._lock:
+            spans = list(self._pending)
+            if clear:
+                self._pending.clear()
+            counters = dict(self._counters)
+        lines = [json.dumps(span, default=str) for span in spans]
+        lines += [
+            json.dumps({'type': 'counter', 'service': self.service, 'name': name, 'value': value, **dict(labels)})
+            for (name, labels), value in counters.items()
+        ]
+        return ''.join(line + '\n' for line in lines)
+
+    def to_prometheus(self):
+        """Cumulative stage timings and counters in Prometheus text exposition format"""
+        summary = self.stage_summary()
+        with self._lock:
+            counters = dict(self._counters)
+
+        metric = f'{METRIC_PREFIX}stage_duration_seconds'
+        lines = [
+            f'# HELP {metric} Wall time spent in each pipeline stage.',
+            f'# TYPE {metric} summary',
+        ]
+        for stage, totals in sorted(summary.items()):
+            labels = _prometheus_labels(service=self.service, stage=stage)
+            lines.append(f'{metric}_sum{labels} {totals["total_seconds"]:.6f}')
+            lines.append(f'{metric}_count{labels} {totals["count"]}')
+
+        peak = f'{METRIC_PREFIX}stage_duration_max_seconds'
+        lines += [f'# HELP {peak} Slowest single run of each pipeline stage.', f'# TYPE {peak} gauge']
+        for stage, totals in sorted(summary.items()):
+            lines.append(f'{peak}{_prometheus_labels(service=self.service, stage=stage)} {totals["max_seconds"]:.6f}')
+
+        for name in sorted({name for name, _ in counters}):
+            full_name = f'{METRIC_PREFIX}{name}_total'
+            lines.append(f'# TYPE {full_name} counter')
+            for (counter, labels), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f'{full_name}{_prometheus_labels(service=self.service, **dict(labels))} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """Append JSON lines, or rewrite a Prometheus textfile-collector file"""
+        if path.endswith(PROMETHEUS_EXTENSIONS):
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.to_jsonl())
+        return path
+
+    def export_from_env(self):
+        """Export to $WORKSHOP_TELEMETRY_FILE if it is set"""
+        path = os.environ.get(TELEMETRY_FILE_ENV)
+        if path:
+            try:
+                self.export(path)
+            except OSError as e:
+                print(f"⚠️ Could not write telemetry to {path}: {e}")
+        return path
+
+
+def _prometheus_labels(**labels):
+    """{key="value",...} with Prometheus label escaping"""
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels.items()) + '}'
+
+
+# One recorder per process; entry points set .service to tell their data apart
+telemetry = Telemetry()
+atexit.register(telemetry.export_from_env)
@@ -0,0 +1,76 @@
+"""
+Report job queue leases: only the worker holding a job can record its outcome
+
+Run with: python -m unittest test_report_jobs  (or pytest)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import report_jobs
+from report_jobs import JobQueue, run_job
+
+
+class JobLeaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.tmp.name, 'jobs.db'))
+        self.job_id = self.queue.submit('reports', {'output_dir': self.tmp.name})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expire_lease(self):
+        with self.queue._connect() as conn:
+            conn.execute("UPDATE jobs SET lease_until = 0 WHERE id = ?", (self.job_id,))
+
+    def test_reclaimed_job_ignores_the_old_worker(self):
+        first = self.queue.claim('worker-a')
+        self.expire_lease()
+        second = self.queue.claim('worker-b')
+        self.assertEqual((first['id'], second['id']), (self.job_id, self.job_id))
+
+        self.assertFalse(self.queue.heartbeat(self.job_id, 'worker-a'))
+        self.assertFalse(self.queue.progress(self.job_id, 'worker-a', 0.5))
+        self.assertFalse(self.queue.complete(self.job_id, 'worker-a', 'stale.md'))
+        self.assertFalse(self.queue.fail(self.job_id, 'worker-a', 'stale error'))
+        self.assertEqual(self.queue.get(self.job_id)['status'], 'running')
+
+        self.assertTrue(self.queue.complete(self.job_id, 'worker-b', 'fresh.md'))
+        job = self.queue.get(self.job_id)
+        self.assertEqual((job['status'], job['result']), ('done', 'fresh.md'))
+
+    def test_worker_stops_once_its_lease_is_lost(self):
+        job = self.queue.claim('worker-a')
+        steps = []
+
+        def handler(params, progress):
+            progress(0.1, 'first step')
+            steps.append(1)
+            self.expire_lease()
+            self.queue.claim('worker-b')
+            progress(0.5, 'second step')
+            steps.append(2)
+            return 'never'
+
+        with mock.patch.dict(report_jobs.JOB_KINDS, {'reports': handler}):
+            run_job(self.queue, job)
+        self.assertEqual(steps, [1])
+        job = self.queue.get(self.job_id)
+        self.assertEqual((job['status'], job['worker_id'], job['result']), ('running', 'worker-b', None))
+
+    def test_failure_requeues_until_attempts_run_out(self):
+        for attempt in range(1, report_jobs.MAX_ATTEMPTS + 1):
+            with self.queue._connect() as conn:
+                conn.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (self.job_id,))
+            self.queue.claim('worker-a')
+            self.assertTrue(self.queue.fail(self.job_id, 'worker-a', 'boom'))
+            expected = 'failed' if attempt == report_jobs.MAX_ATTEMPTS else 'queued'
+            self.assertEqual(self.queue.get(self.job_id)['status'], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
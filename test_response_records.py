@@ -0,0 +1,67 @@
+"""
+Compact response records: submission times written in any format the sheet
+or a webhook uses read back as the same naive UTC time
+
+Run with: python -m unittest test_response_records  (or pytest)
+"""
+
+import os
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pandas as pd
+
+from response_records import ResponseBuffer
+from workshop_analytics import COL_SESSION, SUBMISSION_TIME_COLUMNS
+
+COL_SUBMITTED_AT = SUBMISSION_TIME_COLUMNS[0]
+EXPECTED = '2025-03-03 01:36:23'
+
+# The same moment as the sheet, a webhook or a pandas frame might spell it
+MIXED_TIMES = [
+    '2025-03-03 01:36:23',
+    '2025-03-03T01:36:23',
+    '2025-03-03T01:36:23Z',
+    '2025-03-02T20:36:23-05:00',
+    '03/03/2025 01:36:23',
+    'March 3, 2025 1:36:23 AM',
+    datetime(2025, 3, 3, 1, 36, 23),
+    datetime(2025, 3, 3, 2, 36, 23, tzinfo=timezone(timedelta(hours=1))),
+    pd.Timestamp('2025-03-03 01:36:23'),
+]
+
+
+def buffered(times):
+    return ResponseBuffer().extend({COL_SESSION: 'Workshop', COL_SUBMITTED_AT: value} for value in times)
+
+
+class SubmissionTimeTest(unittest.TestCase):
+
+    def assertRoundTrips(self):
+        buffer = buffered(MIXED_TIMES + [None, '', 'not a date'])
+        expected = [EXPECTED] * len(MIXED_TIMES) + [None] * 3
+        self.assertEqual([record.submitted_at for record in buffer], expected)
+        column = buffer.to_dataframe()[COL_SUBMITTED_AT]
+        self.assertEqual(column.astype(object).where(column.notna(), None).tolist(), expected)
+
+    def test_mixed_formats_read_back_alike(self):
+        self.assertRoundTrips()
+
+    @unittest.skipUnless(hasattr(time, 'tzset'), 'needs time.tzset to switch the local time zone')
+    def test_local_time_zone_does_not_shift_times(self):
+        self.addCleanup(time.tzset)
+        for zone in ('America/New_York', 'Asia/Kolkata'):
+            with self.subTest(zone=zone), mock.patch.dict(os.environ, {'TZ': zone}):
+                time.tzset()
+                self.assertRoundTrips()
+
+    def test_records_round_trip_through_rows(self):
+        buffer = buffered(MIXED_TIMES[:2])
+        again = ResponseBuffer().extend(record.as_row() for record in buffer)
+        self.assertEqual([record.submitted_at for record in again], [EXPECTED, EXPECTED])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Response store against the pandas path: the same responses give the same
+headline numbers whether they are computed in SQL or on the DataFrame
+
+Run with: python -m unittest test_response_store  (or pytest)
+"""
+
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from response_store import ResponseStore
+from synthetic_survey import generate_responses
+from workshop_analytics import (
+    COL_CONFIDENCE, COL_SESSION, analyze_facilitator_strengths, feedback_theme_counts, prepare_responses,
+    summarize_sentiment
+)
+from workshop_report import analyze_facilitator_rating, analyze_hands_on, analyze_pace, calculate_confidence_score
+
+
+def responses_with_blank_ratings(count=300, seed=11):
+    """Prepared responses where every fifth confidence answer was left blank"""
+    raw = generate_responses(count, seed=seed)
+    raw.loc[raw.index[::5], COL_CONFIDENCE] = ''
+    return prepare_responses(raw)
+
+
+class ResponseStoreTest(unittest.TestCase):
+    engine = 'sqlite'
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResponseStore(os.path.join(self.tmp.name, 'responses.db'), engine=self.engine)
+        self.df = responses_with_blank_ratings()
+        self.assertEqual(self.store.append(self.df), len(self.df))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def assertMatchesPandas(self, pushed_down, df):
+        self.assertEqual(pushed_down['total'], len(df))
+        self.assertAlmostEqual(pushed_down['confidence'], calculate_confidence_score(df))
+        for name, expected in (('facilitator_rating', analyze_facilitator_rating(df)), ('pace', analyze_pace(df)),
+                               ('hands_on', analyze_hands_on(df)), ('sentiment', summarize_sentiment(df))):
+            for key, value in expected.items():
+                self.assertAlmostEqual(pushed_down[name][key], value, msg=f'{name}.{key}')
+
+    def test_all_workshops_totals_match_pandas(self):
+        self.assertMatchesPandas(self.store.report_metrics(), self.df)
+
+    def test_each_workshop_matches_pandas(self):
+        for workshop, group in self.df.groupby(COL_SESSION):
+            self.assertMatchesPandas(self.store.report_metrics(workshop), group)
+
+    def test_strengths_and_themes_match_pandas(self):
+        self.assertEqual(self.store.top_strengths(n=6), analyze_facilitator_strengths(self.df, n=6))
+        self.assertEqual(self.store.theme_counts().to_dict(), feedback_theme_counts(self.df).to_dict())
+
+    def test_rerun_append_adds_nothing(self):
+        self.assertEqual(self.store.append(self.df), 0)
+        self.assertEqual(self.store.count(), len(self.df))
+
+    def test_reopened_store_keeps_its_rows(self):
+        self.store.close()
+        self.store = ResponseStore(os.path.join(self.tmp.name, 'responses.db'), engine=self.engine)
+        self.assertEqual(self.store.count(), len(self.df))
+        self.assertEqual(self.store.append(self.df), 0)
+
+    def test_failed_append_stores_nothing(self):
+        store = ResponseStore(os.path.join(self.tmp.name, 'partial.db'), engine=self.engine)
+        self.addCleanup(store.close)
+        with mock.patch.object(store, '_insert_strengths', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                store.append(self.df)
+        self.assertEqual(store.count(), 0)
+        self.assertEqual(store.append(self.df), len(self.df))
+        self.assertEqual(store.top_strengths(n=6), analyze_facilitator_strengths(self.df, n=6))
+
+
+@unittest.skipUnless(importlib.util.find_spec('duckdb'), 'duckdb is not installed')
+class DuckDBResponseStoreTest(ResponseStoreTest):
+    engine = 'duckdb'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Sheet loader against a stub gspread client: tabs are read, tagged with their
+event and cohort, and lined up under the canonical headers
+
+Run with: python -m unittest test_sheet_loader  (or pytest)
+"""
+
+import unittest
+
+from sheet_loader import ALL_WORKSHEETS, load_responses
+from synthetic_survey import generate_responses
+from workshop_analytics import COL_COHORT, COL_CONFIDENCE, COL_EVENT, COL_SESSION
+
+
+class StubWorksheet:
+    def __init__(self, spreadsheet, title, records):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.records = records
+
+    def get_all_records(self):
+        return self.records
+
+
+class StubSpreadsheet:
+    def __init__(self, title, tabs):
+        self.title = title
+        self.tabs = [StubWorksheet(self, name, records) for name, records in tabs.items()]
+        self.sheet1 = self.tabs[0]
+
+    def worksheets(self):
+        return self.tabs
+
+    def worksheet(self, title):
+        return next(tab for tab in self.tabs if tab.title == title)
+
+
+class StubClient:
+    """Just the slice of gspread.Client the loader calls"""
+
+    def __init__(self, spreadsheets):
+        self.spreadsheets = {s.title: s for s in spreadsheets}
+
+    def open(self, title):
+        if title not in self.spreadsheets:
+            raise LookupError(f'no spreadsheet {title!r}')
+        return self.spreadsheets[title]
+
+
+def records(count, seed, rename=None):
+    frame = generate_responses(count, seed=seed)
+    return frame.rename(columns=rename or {}).to_dict('records')
+
+
+class SheetLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        # The second tab drifted: the confidence question lost its trailing space
+        drifted = {COL_CONFIDENCE: COL_CONFIDENCE.strip()}
+        self.client = StubClient([
+            StubSpreadsheet('Spring Series', {'Cohort A': records(4, 1), 'Cohort B': records(3, 2, drifted)}),
+            StubSpreadsheet('Fall Series', {'Form Responses': records(2, 3)}),
+        ])
+
+    def test_every_tab_is_tagged_and_merged(self):
+        sources = [
+            {'sheet': 'Spring Series', 'worksheet': ALL_WORKSHEETS},
+            {'sheet': 'Fall Series', 'event': 'Fall 2026', 'cohort': 'Evening'},
+        ]
+        df = load_responses(self.client, sources)
+
+        self.assertEqual(len(df), 9)
+        self.assertEqual(df.groupby([COL_EVENT, COL_COHORT]).size().to_dict(), {
+            ('Spring Series', 'Cohort A'): 4,
+            ('Spring Series', 'Cohort B'): 3,
+            ('Fall 2026', 'Evening'): 2,
+        })
+        # Drifted headers land in the canonical column rather than a new one
+        self.assertNotIn(COL_CONFIDENCE.strip(), df.columns)
+        self.assertFalse(df[COL_CONFIDENCE].isna().any())
+        self.assertFalse(df[COL_SESSION].isna().any())
+
+    def test_unreadable_sheet_is_skipped(self):
+        sources = [{'sheet': 'Fall Series'}, {'sheet': 'Missing Sheet'}]
+        df = load_responses(self.client, sources)
+        self.assertEqual(len(df), 2)
+
+    def test_all_sources_failing_raises(self):
+        with self.assertRaises(LookupError):
+            load_responses(self.client, [{'sheet': 'Missing Sheet'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
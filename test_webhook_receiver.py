@@ -0,0 +1,148 @@
+"""
+Webhook receiver round trip: fixture submissions are posted to a receiver on
+an ephemeral port and checked against what lands in the store
+
+Run with: python -m unittest test_webhook_receiver  (or pytest)
+"""
+
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from response_store import ResponseStore
+from synthetic_survey import generate_responses
+from webhook_receiver import MAX_BODY_BYTES, SubmissionReceiver, WebhookHandler, post_submission
+from workshop_analytics import COL_SESSION, COL_SUBMISSION_ID
+
+FIXTURE_COUNT = 6
+
+
+def fixture_rows(count=FIXTURE_COUNT, seed=75):
+    """(submission id, sheet row) pairs, as post_fixtures() sends them"""
+    rows = generate_responses(count, seed=seed).to_dict('records')
+    return [(f'fixture-{i}', {k: v for k, v in row.items() if k != COL_SUBMISSION_ID}) for i, row in enumerate(rows)]
+
+
+class WebhookReceiverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResponseStore(os.path.join(self.tmp.name, 'responses.db'))
+        # Not started: the tests flush by hand so every assertion is deterministic
+        self.receiver = SubmissionReceiver(self.store)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookHandler)
+        self.server.receiver = self.receiver
+        self.server.field_map = {}
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.store.close()
+        self.tmp.cleanup()
+
+    def get(self, path):
+        with urlopen(self.url + path, timeout=10) as response:
+            return json.loads(response.read())
+
+    def post_json(self, payload):
+        request = Request(self.url, data=json.dumps(payload).encode('utf-8'),
+                          headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_posted_fixtures_are_stored(self):
+        fixtures = fixture_rows()
+        for submission_id, row in fixtures:
+            reply = post_submission(self.url, row, submission_id)
+            self.assertEqual(reply, {'accepted': True, 'submission_id': submission_id})
+        self.assertEqual(self.get('health')['pending'], FIXTURE_COUNT)
+
+        self.assertEqual(self.receiver.flush(), FIXTURE_COUNT)
+        stored = self.store.responses()
+        self.assertEqual(sorted(stored[COL_SUBMISSION_ID]), sorted(i for i, _ in fixtures))
+        expected = {i: row[COL_SESSION] for i, row in fixtures}
+        self.assertEqual(dict(zip(stored[COL_SUBMISSION_ID], stored[COL_SESSION])), expected)
+
+        # A JotForm retry of a stored submission adds nothing
+        submission_id, row = fixtures[0]
+        post_submission(self.url, row, submission_id)
+        self.assertEqual(self.receiver.flush(), 0)
+
+        summary = self.get('summary')
+        self.assertEqual(summary['stored'], FIXTURE_COUNT)
+        self.assertEqual(summary['pending'], 0)
+        per_workshop = {workshop: values['total'] for workshop, values in summary['workshops'].items()}
+        self.assertEqual(per_workshop, stored[COL_SESSION].value_counts().to_dict())
+
+    def post_raw(self, headers, body=b''):
+        """POST with exactly these headers (urllib would fill in Content-Length)"""
+        conn = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=10)
+        try:
+            conn.putrequest('POST', '/', skip_accept_encoding=True)
+            for name, value in headers.items():
+                conn.putheader(name, value)
+            conn.endheaders(body)
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            conn.close()
+
+    def test_resubmitted_answers_under_a_new_id_are_dropped(self):
+        (first_id, row), (other_id, other) = fixture_rows(2)
+        post_submission(self.url, row, first_id)
+        post_submission(self.url, row, 'double-click')
+        post_submission(self.url, other, other_id)
+        self.assertEqual(self.receiver.flush(), 2)
+        self.assertEqual(sorted(self.store.responses()[COL_SUBMISSION_ID]), sorted([first_id, other_id]))
+
+        # Against what is already stored, not just the current batch
+        post_submission(self.url, row, 'late-double-click')
+        self.assertEqual(self.receiver.flush(), 0)
+        self.assertEqual(self.store.count(), 2)
+        self.assertEqual(self.get('summary')['stored'], 2)
+
+    def test_bad_content_length_is_rejected(self):
+        body = b'{}'
+        for headers in ({}, {'Content-Length': 'lots'}, {'Content-Length': '-1'}):
+            status, reply = self.post_raw({'Content-Type': 'application/json', **headers}, body)
+            self.assertEqual(status, 400, headers)
+            self.assertIn('error', reply)
+        status, _ = self.post_raw({'Content-Type': 'application/json', 'Content-Length': str(MAX_BODY_BYTES + 1)})
+        self.assertEqual(status, 413)
+        self.assertEqual(self.get('health'), {'ok': True, 'pending': 0})
+
+    def test_non_object_bodies_are_rejected(self):
+        for payload in ([1, 2, 3], 'hello', 42, {'rawRequest': '[1, 2]'}):
+            status, reply = self.post_json(payload)
+            self.assertEqual(status, 422, payload)
+            self.assertIn('error', reply)
+        self.assertEqual(self.get('health'), {'ok': True, 'pending': 0})
+
+    def test_failed_flush_requeues_the_batch(self):
+        for submission_id, row in fixture_rows(3):
+            post_submission(self.url, row, submission_id)
+
+        with mock.patch.object(self.store, 'append', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.receiver.flush()
+        self.assertEqual(self.receiver.pending(), 3)
+
+        self.assertEqual(self.receiver.flush(), 3)
+        self.assertEqual(self.store.count(), 3)
+        self.assertEqual(self.get('summary')['stored'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Shared analytics helpers: feedback classifier routing, near-duplicate
+clustering and incremental trends
+
+Run with: python -m unittest test_workshop_analytics  (or pytest)
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from synthetic_survey import generate_responses
+from workshop_analytics import (
+    COL_FEEDBACK, COL_FEEDBACK_CLUSTER, COL_FEEDBACK_LABELS, COL_SUBMISSION_ID, SUGGESTION_LABELS, TrendEngine,
+    add_duplicate_clusters, add_feedback_labels, classify_feedback, compute_trends, filter_by_labels,
+    lsh_clusters, minhash_signatures, prepare_responses
+)
+
+
+def labelled(comments):
+    return add_feedback_labels(pd.DataFrame({COL_FEEDBACK: comments}))
+
+
+class FeedbackClassifierTest(unittest.TestCase):
+
+    def test_praise_that_mentions_pacing_stays_praise(self):
+        comments = ["Pacing was spot-on. Solid content.", "Great pacing and structure.",
+                    "The pace was perfect, thank you!"]
+        df = labelled(comments)
+        self.assertTrue(df[COL_FEEDBACK_LABELS].str.contains('pacing').all())
+        self.assertEqual(filter_by_labels(df, SUGGESTION_LABELS, exclude=True)[COL_FEEDBACK].tolist(), comments)
+        self.assertTrue(filter_by_labels(df, SUGGESTION_LABELS).empty)
+
+    def test_directional_pacing_complaints_are_suggestions(self):
+        comments = ["Too fast for me, slow down!", "Could go a bit slower on the demos.", "Felt rushed at the end.",
+                    "I wish we had more time for Q&A.", "One suggestion: share the slides."]
+        df = labelled(comments)
+        self.assertEqual(filter_by_labels(df, SUGGESTION_LABELS)[COL_FEEDBACK].tolist(), comments)
+
+    def test_labels_are_joined_in_category_order(self):
+        df = labelled(["Too fast, but great examples", "Nothing to add", None])
+        self.assertEqual(df[COL_FEEDBACK_LABELS].tolist(), ['praise, suggestion, pacing, content', '', ''])
+
+    def test_keywords_match_on_word_boundaries(self):
+        labels = classify_feedback(pd.Series(["Room for improvement", "The demonstration was unclear"]))
+        self.assertTrue(labels.loc[0, 'suggestion'])
+        # 'clear' must not fire inside 'unclear'
+        self.assertFalse(labels.loc[1, 'praise'])
+
+
+class DuplicateClusterTest(unittest.TestCase):
+
+    def test_near_duplicates_share_a_cluster(self):
+        texts = ["The facilitator explained everything clearly, great session!",
+                 "the facilitator explained everything clearly - great session",
+                 "Audio kept cutting out during the demo.",
+                 "Audio kept cutting out during the demo!!",
+                 "Please share the slides and the notebook afterwards."]
+        clusters = lsh_clusters(minhash_signatures(texts))
+        self.assertEqual(clusters[0], clusters[1])
+        self.assertEqual(clusters[2], clusters[3])
+        self.assertEqual(len(set(clusters)), 3)
+
+    def test_distinct_texts_stay_apart(self):
+        texts = ["Loved the hands-on exercises.", "Too much theory, not enough practice.",
+                 "Room was cold.", "Loved it", "Would attend again next month."]
+        self.assertEqual(sorted(lsh_clusters(minhash_signatures(texts))), list(range(len(texts))))
+
+    def test_signatures_are_reproducible(self):
+        texts = ["Great pacing", "More examples please"]
+        np.testing.assert_array_equal(minhash_signatures(texts), minhash_signatures(list(texts)))
+
+    def test_blank_feedback_has_no_cluster(self):
+        df = add_duplicate_clusters(pd.DataFrame({COL_FEEDBACK: ["Great demo!", None, "  ", "great demo"]}))
+        clusters = df[COL_FEEDBACK_CLUSTER]
+        self.assertEqual(clusters.isna().tolist(), [False, True, True, False])
+        self.assertEqual(clusters[0], clusters[3])
+
+
+class TrendEngineSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.df = prepare_responses(generate_responses(120, seed=5))
+
+    def assertTrendsMatch(self, engine, df):
+        pd.testing.assert_frame_equal(engine.trends(), compute_trends(df), check_dtype=False)
+
+    def test_repeated_sync_folds_rows_once(self):
+        engine = TrendEngine().sync(self.df).sync(self.df)
+        self.assertEqual(engine.rows_seen, len(self.df))
+        self.assertTrendsMatch(engine, self.df)
+
+    def test_appended_rows_are_folded_in(self):
+        engine = TrendEngine().sync(self.df.iloc[:80])
+        engine.sync(self.df)
+        self.assertEqual(engine.rows_seen, len(self.df))
+        self.assertTrendsMatch(engine, self.df)
+
+    def test_removed_rows_start_over(self):
+        engine = TrendEngine().sync(self.df)
+        trimmed = self.df.drop(self.df.index[79]).reset_index(drop=True)
+        engine.sync(trimmed)
+        self.assertEqual(engine.rows_seen, len(trimmed))
+        self.assertTrendsMatch(engine, trimmed)
+
+    def test_rows_without_ids_sync_alike(self):
+        df = self.df.assign(**{COL_SUBMISSION_ID: ''})
+        engine = TrendEngine().sync(df.iloc[:80]).sync(df).sync(df)
+        self.assertEqual(engine.rows_seen, len(df))
+        self.assertTrendsMatch(engine, df)
+
+
+if __name__ == '__main__':
+    unittest.main()
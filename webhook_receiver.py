@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+75HER Workshop Webhook Receiver
+Accepts JotForm submission webhooks, validates them against the survey
+schema and appends them to the local response store, so reports and the
+dashboard see new responses without re-downloading the sheet
+"""
+
+import argparse
+import email.parser
+import email.policy
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+from response_records import ResponseBuffer
+from response_store import DEFAULT_DB_FILE, ResponseStore, metric_rates
+from telemetry import telemetry
+from workshop_analytics import (
+    COL_SESSION, COL_SUBMISSION_ID, REQUIRED_FIELDS, SCHEMA_FIELDS, SUBMISSION_TIME_COLUMNS, SchemaError,
+    TrendEngine, apply_schema, find_duplicate_submissions, prepare_responses, resolve_schema, score_texts
+)
+
+# ============================================
+# CONFIGURATION
+# ============================================
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8075
+
+# Optional {JotForm field name: sheet question} map, e.g. {"q3_whichSession": "Which session did you attend?"}.
+# Without it the submission's keys must be the sheet questions themselves.
+FIELD_MAP_FILE = 'jotform_fields.json'
+
+# Submissions arriving within this window are prepared and stored as one batch
+FLUSH_INTERVAL = 0.25
+
+MAX_BODY_BYTES = 1_000_000
+CONFIDENCE_RANGE = (1, 5)
+
+# ============================================
+# PARSING
+# ============================================
+
+def load_field_map(path=FIELD_MAP_FILE) -> dict:
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def parse_form(body: bytes, content_type: str) -> dict:
+    """Form fields of a urlencoded, multipart or JSON request body"""
+    content_type = content_type or ''
+    if content_type.startswith('application/json'):
+        return json.loads(body or b'{}')
+    if content_type.startswith('multipart/form-data'):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+        )
+        return {
+            part.get_param('name', header='content-disposition'): part.get_content()
+            for part in message.iter_parts()
+        }
+    return {key: values[-1] for key, values in parse_qs(body.decode('utf-8')).items()}
+
+
+def submission_row(form: dict, field_map=None) -> dict:
+    """One sheet-shaped response from a JotForm webhook (answers in its rawRequest JSON)
+
+    Raises SchemaError (or ValueError) when the submission can't be a survey response.
+    """
+    if not isinstance(form, dict):
+        raise ValueError("Submission must be a JSON object")
+    answers = form.get('rawRequest', form)
+    if isinstance(answers, str):
+        answers = json.loads(answers)
+    if not isinstance(answers, dict):
+        raise ValueError("rawRequest must be a JSON object")
+    field_map = field_map or {}
+    row = {field_map.get(key, key): value for key, value in answers.items()}
+
+    schema = resolve_schema(list(row), required=REQUIRED_FIELDS)
+    row = {SCHEMA_FIELDS[field][0]: row[header] for field, header in schema.columns.items()}
+
+    if not str(row[COL_SESSION] or '').strip():
+        raise ValueError("No session selected")
+    low, high = CONFIDENCE_RANGE
+    confidence = pd.to_numeric(row[SCHEMA_FIELDS['confidence'][0]], errors='coerce')
+    if pd.isna(confidence) or not low <= confidence <= high:
+        raise ValueError(f"Confidence must be a number from {low} to {high}")
+
+    row[COL_SUBMISSION_ID] = str(form.get('submissionID') or row.get(COL_SUBMISSION_ID) or f'webhook:{uuid.uuid4().hex}')
+    row.setdefault(SUBMISSION_TIME_COLUMNS[0], datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return row
+
+# ============================================
+# RECEIVER
+# ============================================
+
+class SubmissionReceiver:
+    """Buffers accepted submissions and flushes them to the store in small batches"""
+
+    def __init__(self, store: ResponseStore, flush_interval=FLUSH_INTERVAL):
+        self.store = store
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()     # one flush at a time (timer thread vs stop())
+        self._pending = ResponseBuffer()
+        self._pending_ids = set()
+        self._stop = threading.Event()
+
+        # Running per-day aggregates, seeded once from what is already stored
+        self.trends = TrendEngine(by=COL_SESSION)
+        stored = store.responses()
+        if len(stored):
+            self.trends.update(stored)
+
+        # Running per-workshop counts for /summary, topped up from the rows
+        # stored after `_stored_upto` on every flush
+        self._stored_upto = store.last_rowid()
+        self._counts = store.metric_counts(rowids=(0, self._stored_upto))
+        self._thread = threading.Thread(target=self._run, name='webhook-flush', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, row: dict) -> bool:
+        """Queue one validated response; False if it's a repeat of a queued one"""
+        with self._lock:
+            if row[COL_SUBMISSION_ID] in self._pending_ids:
+                return False
+            self._pending_ids.add(row[COL_SUBMISSION_ID])
+            self._pending.append(row)
+        telemetry.count('webhook_submissions')
+        return True
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Prepare and store everything queued so far; returns rows added
+
+        If preparing or storing fails the batch goes back on the queue, so
+        submissions that were already answered 202 are retried, not lost.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, batch_ids = self._pending, self._pending_ids
+                self._pending, self._pending_ids = ResponseBuffer(), set()
+            if not len(batch):
+                return 0
+            with telemetry.span('webhook_flush', rows=len(batch)) as span:
+                try:
+                    # JotForm retries resend the same submission, and a double-clicked
+                    # submit sends the same answers under a new id; drop both, whether
+                    # the first copy is in this batch or already stored
+                    raw = apply_schema(batch.to_dataframe())
+                    duplicates = find_duplicate_submissions(raw, earlier=self.store.resubmission_candidates(raw))
+                    df = prepare_responses(raw[~duplicates.to_numpy()], dedup=False)
+                    added = self.store.append(df)
+                except Exception:
+                    self._requeue(batch, batch_ids)
+                    raise
+                telemetry.count('webhook_duplicates', int(duplicates.sum()))
+                self.trends.update(df)
+                self._refresh_counts()
+                span['added'] = added
+            return added
+
+    def _requeue(self, batch: ResponseBuffer, batch_ids: set):
+        """Put a batch that failed to store back ahead of anything queued since"""
+        with self._lock:
+            pending = ResponseBuffer().extend(record.as_row() for record in batch)
+            pending.extend(record.as_row() for record in self._pending if record.submission_id not in batch_ids)
+            self._pending, self._pending_ids = pending, batch_ids | self._pending_ids
+        telemetry.count('webhook_requeued', len(batch))
+
+    def _refresh_counts(self):
+        """Add the rows stored since the last flush to the running per-workshop counts"""
+        upto = self.store.last_rowid()
+        if upto == self._stored_upto:
+            return
+        new = self.store.metric_counts(rowids=(self._stored_upto, upto))
+        with self._lock:
+            self._counts = self._counts.add(new, fill_value=0)
+            self._stored_upto = upto
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Could not store submissions: {e.__class__.__name__}: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def summary(self) -> dict:
+        """Stored totals per workshop from the running counts (no query per request)"""
+        with self._lock:
+            counts = self._counts
+        metrics = metric_rates(counts)
+        return {
+            'stored': int(metrics['total'].sum()) if len(metrics) else 0,
+            'pending': self.pending(),
+            'workshops': json.loads(metrics.to_json(orient='index')),
+        }
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """POST /  (a submission)  GET /health  GET /summary  GET /trends  GET /metrics"""
+
+    server_version = '75HERWebhook/1.0'
+
+    @property
+    def receiver(self) -> SubmissionReceiver:
+        return self.server.receiver
+
+    def _send(self, status, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            return self._send(400, {'error': 'A numeric Content-Length header is required'})
+        if length < 0:
+            return self._send(400, {'error': 'Content-Length must not be negative'})
+        if length > MAX_BODY_BYTES:
+            return self._send(413, {'error': 'Submission too large'})
+        try:
+            form = parse_form(self.rfile.read(length), self.headers.get('Content-Type'))
+            row = submission_row(form, self.server.field_map)
+        except (SchemaError, ValueError, TypeError) as e:
+            telemetry.count('webhook_rejected')
+            return self._send(422, {'error': str(e)})
+        accepted = self.receiver.submit(row)
+        self._send(202, {'accepted': accepted, 'submission_id': row[COL_SUBMISSION_ID]})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            return self._send(200, {'ok': True, 'pending': self.receiver.pending()})
+        if url.path == '/summary':
+            return self._send(200, self.receiver.summary())
+        if url.path == '/trends':
+            workshop = parse_qs(url.query).get('workshop', [None])[0]
+            trends = self.receiver.trends.trends(group=workshop)
+            return self._send(200, trends.to_json(orient='index', date_format='iso').encode('utf-8'))
+        if url.path == '/metrics':
+            return self._send(200, telemetry.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+        self._send(404, {'error': 'Not found'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, db=DEFAULT_DB_FILE, field_map_file=FIELD_MAP_FILE):
+    """Run the receiver until interrupted"""
+    receiver = SubmissionReceiver(ResponseStore(db)).start()
+    # Load the sentiment model now rather than on the first submission
+    score_texts(['Warming up'])
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    server.receiver = receiver
+    server.field_map = load_field_map(field_map_file)
+    print(f"📬 Listening on http://{host}:{server.server_port}/ (storing into {db})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping receiver")
+    finally:
+        server.server_close()
+        receiver.stop()
+        receiver.store.close()
+
+# ============================================
+# FIXTURE CLIENT
+# ============================================
+
+def post_submission(url, row: dict, submission_id=None):
+    """POST one response the way JotForm does (urlencoded form with a rawRequest JSON field)"""
+    form = {'rawRequest': json.dumps(row, default=str), 'formID': '75her'}
+    if submission_id:
+        form['submissionID'] = submission_id
+    request = Request(url, data=urlencode(form).encode('utf-8'),
+                      headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    with urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def post_fixtures(url, path=None, count=10, seed=75):
+    """Send fixture submissions from a JSON list (or synthetic ones) to a running receiver"""
+    if path:
+        with open(path, encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        from synthetic_survey import generate_responses
+        rows = generate_responses(count, seed=seed).to_dict('records')
+
+    start = time.perf_counter()
+    for row in rows:
+        submission_id = row.pop(COL_SUBMISSION_ID, None)
+        post_submission(url, row, str(submission_id) if submission_id is not None else None)
+    print(f"📨 Posted {len(rows)} submissions to {url} in {time.perf_counter() - start:.2f}s")
+
+# ============================================
+# MAIN EXECUTION
+# ============================================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Receive JotForm webhooks into the 75HER response store")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    server = commands.add_parser('serve', help="run the receiver")
+    server.add_argument('--host', default=DEFAULT_HOST)
+    server.add_argument('--port', type=int, default=DEFAULT_PORT)
+    server.add_argument('--db', default=DEFAULT_DB_FILE, help="SQLite store to append to (default: %(default)s)")
+    server.add_argument('--field-map', default=FIELD_MAP_FILE,
+                        help="JSON map of JotForm field names to sheet questions (default: %(default)s)")
+
+    client = commands.add_parser('post', help="send fixture submissions to a running receiver")
+    client.add_argument('--url', default=f'http://{DEFAULT_HOST}:{DEFAULT_PORT}/')
+    client.add_argument('--fixtures', metavar='JSON', help="JSON list of responses keyed by sheet question")
+    client.add_argument('--count', type=int, default=10, help="synthetic submissions to send without --fixtures")
+    client.add_argument('--seed', type=int, default=75)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == 'serve':
+        telemetry.service = 'webhook_receiver'
+        serve(args.host, args.port, args.db, args.field_map)
+    else:
+        post_fixtures(args.url, args.fixtures, args.count, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1187 @@
+#!/usr/bin/env python3
+"""
+75HER Workshop Analytics - shared analysis helpers
+Used by the Streamlit dashboard and both report generators
+"""
+
+import difflib
+import heapq
+import json
+import math
+import os
+import re
+import statistics
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+# ============================================
+# COLUMN NAMES
+# ============================================
+COL_SESSION = 'Which session did you attend?'
+COL_CONFIDENCE = 'How confident do you feel implementing what you learned today? '
+COL_FACILITATOR_RATING = 'The facilitator today was:'
+COL_PACE = 'Was the workshop pace/level right for you?'
+COL_HANDS_ON = 'Did you create a hands-on deliverable today?'
+COL_STRENGTHS = 'The facilitator today: (Select all that apply)'
+COL_FEEDBACK = 'What did the facilitator do especially well? Any suggestions for improvement?'
+COL_ONE_THING = "What's ONE thing you'll try this week based on today's workshop?"
+COL_BACKGROUND = 'Your background in this topic:'
+COL_AFTER_WORKSHOP = "After today's workshop, I feel:"
+COL_SUBMISSION_ID = 'Submission ID'
+
+# Added when responses from several events/cohorts are merged
+COL_EVENT = 'Event'
+COL_COHORT = 'Cohort'
+
+# JotForm exports 'Submission Date'; Google Forms style sheets use 'Timestamp'
+SUBMISSION_TIME_COLUMNS = ('Submission Date', 'Timestamp', 'Submitted At')
+
+# Answer options
+RATING_EXCELLENT = '🌟 Excellent - Clear, engaging, well-paced'
+RATING_GOOD = '✅ Good - Helpful and informative'
+PACE_JUST_RIGHT = 'Just right - Perfect pace for my level'
+PACE_TOO_FAST = ('Slightly too fast - I could barely keep up', 'Too advanced - I felt lost')
+PACE_TOO_SLOW = ('Slightly too slow - I wanted to go deeper', 'Too basic - I already knew most of this')
+HANDS_CREATED = 'Yes - I created/started [code sample / prototype / document / project file]'
+HANDS_FOLLOWED = 'Yes - I followed along but need to finish it'
+
+# Derived columns added at ingest
+COL_FEEDBACK_LABELS = 'Feedback labels'
+COL_FEEDBACK_SENTIMENT = 'Feedback sentiment'
+COL_ONE_THING_SENTIMENT = 'One thing sentiment'
+COL_FEEDBACK_CLUSTER = 'Feedback cluster'
+COL_ONE_THING_CLUSTER = 'One thing cluster'
+
+# One indicator column per selected strength
+STRENGTH_PREFIX = 'Strength: '
+
+# ============================================
+# SCHEMA REGISTRY
+# ============================================
+
+# Logical field -> accepted sheet headers; the first one is the spelling the
+# rest of the code uses
+SCHEMA_FIELDS = {
+    'session': (COL_SESSION,),
+    'submission_id': (COL_SUBMISSION_ID,),
+    'submitted_at': SUBMISSION_TIME_COLUMNS,
+    'background': (COL_BACKGROUND,),
+    'confidence': (COL_CONFIDENCE,),
+    'rating': (COL_FACILITATOR_RATING,),
+    'pace': (COL_PACE,),
+    'hands_on': (COL_HANDS_ON,),
+    'strengths': (COL_STRENGTHS,),
+    'after_workshop': (COL_AFTER_WORKSHOP,),
+    'feedback': (COL_FEEDBACK,),
+    'one_thing': (COL_ONE_THING,),
+    'event': (COL_EVENT,),
+    'cohort': (COL_COHORT,),
+}
+
+# Fields every report needs; a sheet without them is rejected up front
+REQUIRED_FIELDS = ('session', 'confidence', 'rating', 'pace', 'hands_on')
+
+# How close (0-1) an edited question must be to still count as the same field
+FUZZY_MATCH_CUTOFF = 0.85
+
+
+class SchemaError(ValueError):
+    """The sheet is missing questions the reports depend on"""
+
+
+def _normalize_header(label):
+    return ' '.join(str(label).split()).casefold()
+
+
+class SurveySchema:
+    """Sheet headers resolved to logical fields, with each field's column position"""
+
+    def __init__(self, headers, positions, fuzzy=None):
+        self.headers = tuple(headers)
+        self.positions = positions              # field -> column position
+        self.fuzzy = fuzzy or {}                # field -> header matched only approximately
+
+    @property
+    def columns(self) -> dict:
+        """field -> actual header"""
+        return {field: self.headers[pos] for field, pos in self.positions.items()}
+
+    def rename_map(self) -> dict:
+        """Actual header -> the canonical header code looks up"""
+        return {self.headers[pos]: SCHEMA_FIELDS[field][0] for field, pos in self.positions.items()}
+
+    def matches(self, columns) -> bool:
+        """True while `columns` still has every resolved field at its recorded position"""
+        return all(pos < len(columns) and columns[pos] == self.headers[pos] for pos in self.positions.values())
+
+    def series(self, df: pd.DataFrame, field) -> pd.Series:
+        """A field's column by position (all-NA when the sheet doesn't have it)"""
+        pos = self.positions.get(field)
+        if pos is None:
+            return pd.Series(pd.NA, index=df.index, dtype=object)
+        return df.iloc[:, pos]
+
+    def describe(self) -> str:
+        line = f"{len(self.positions)}/{len(SCHEMA_FIELDS)} survey fields resolved"
+        if self.fuzzy:
+            line += ' (approximate: ' + ', '.join(f"{f} <- '{h}'" for f, h in self.fuzzy.items()) + ')'
+        return line
+
+
+def resolve_schema(headers, required=REQUIRED_FIELDS, cutoff=FUZZY_MATCH_CUTOFF) -> SurveySchema:
+    """Map sheet headers to logical fields once per load
+
+    Headers match ignoring case and whitespace; any field still unmatched then
+    takes the closest remaining header above `cutoff`. Raises SchemaError
+    naming every missing required field.
+    """
+    headers = list(headers)
+    free = {}
+    for pos, header in enumerate(headers):
+        free.setdefault(_normalize_header(header), pos)
+
+    positions, fuzzy = {}, {}
+
+    def take(field, key):
+        positions[field] = free.pop(key)
+
+    # Exact (whitespace/case-insensitive) matches first, so a fuzzy match can
+    # never claim a header that belongs to another field
+    for field, aliases in SCHEMA_FIELDS.items():
+        key = next((k for k in map(_normalize_header, aliases) if k in free), None)
+        if key is not None:
+            take(field, key)
+
+    for field, aliases in SCHEMA_FIELDS.items():
+        if field in positions or not free:
+            continue
+        close = difflib.get_close_matches(_normalize_header(aliases[0]), list(free), n=1, cutoff=cutoff)
+        if close:
+            take(field, close[0])
+            fuzzy[field] = headers[positions[field]]
+
+    missing = [field for field in required if field not in positions]
+    if missing:
+        raise SchemaError(
+            'Sheet is missing required questions: '
+            + '; '.join(f"{field} ('{SCHEMA_FIELDS[field][0].strip()}')" for field in missing)
+        )
+    return SurveySchema(headers, positions, fuzzy)
+
+
+def apply_schema(df: pd.DataFrame, required=REQUIRED_FIELDS) -> pd.DataFrame:
+    """Validate the sheet and rename its headers to the canonical spellings"""
+    schema = resolve_schema(df.columns, required=required)
+    df = df.rename(columns=schema.rename_map())
+    df.attrs['schema'] = SurveySchema(df.columns, schema.positions, schema.fuzzy)
+    return df
+
+
+def get_schema(df: pd.DataFrame) -> SurveySchema:
+    """The schema resolved at ingest, re-resolved if the columns were reshuffled since"""
+    schema = df.attrs.get('schema')
+    if isinstance(schema, SurveySchema) and schema.matches(df.columns):
+        return schema
+    return resolve_schema(df.columns, required=())
+
+# ============================================
+# FEEDBACK CLASSIFIER
+# ============================================
+
+# Keyword sets per feedback label. Entries are matched case-insensitively on
+# word boundaries, so 'improve' also matches 'improvement'. 'pacing' tags any
+# mention of pace; only the directional complaints (too fast, slow down, ...)
+# also count as a suggestion, so "Great pacing" stays praise.
+FEEDBACK_CATEGORIES = {
+    'praise': ['great', 'clear', 'loved', 'love', 'amazing', 'excellent', 'helpful',
+               'engaging', 'energy', 'thank', 'awesome', 'fantastic', 'inspiring',
+               'well explained', 'solid', 'spot-on'],
+    'suggestion': ['suggestion', 'improve', 'wish', 'would have liked', 'next time',
+                   'more time', 'faster', 'slower', 'too fast', 'too slow',
+                   'slow down', 'rushed', 'speed up'],
+    'pacing': ['faster', 'slower', 'too fast', 'too slow', 'pace', 'pacing',
+               'slow down', 'rushed', 'speed up'],
+    'content': ['example', 'content', 'demo', 'slides', 'code', 'material',
+                'exercise', 'hands-on', 'depth', 'advanced', 'basic'],
+    'logistics': ['audio', 'sound', 'mic', 'link', 'zoom', 'room', 'schedule',
+                  'start time', 'late', 'recording', 'wifi', 'screen'],
+}
+
+# Labels that mark a comment as constructive rather than pure praise
+SUGGESTION_LABELS = ('suggestion',)
+
+LABEL_SEPARATOR = ', '
+
+
+class FeedbackClassifier:
+    """Every keyword set compiled into one regex, with a group per distinct keyword
+
+    Groups are named g0, g1, ... so any label string works as a category, and a
+    keyword listed under several labels counts toward each of them.
+    """
+
+    def __init__(self, categories=None):
+        self.categories = categories or FEEDBACK_CATEGORIES
+        keyword_labels = {}
+        for label, keywords in self.categories.items():
+            for keyword in keywords:
+                keyword_labels.setdefault(keyword.lower(), []).append(label)
+
+        # Longest keywords first so 'too fast' wins over 'fast'
+        keywords = sorted(keyword_labels, key=len, reverse=True)
+        self.group_labels = {f'g{i}': tuple(keyword_labels[k]) for i, k in enumerate(keywords)}
+        self.pattern = re.compile(
+            '|'.join(f"(?P<g{i}>\\b{re.escape(k)})" for i, k in enumerate(keywords)), re.IGNORECASE
+        )
+
+    def labels(self, text) -> set:
+        """Labels whose keywords appear in one comment"""
+        return {label for m in self.pattern.finditer(text) for label in self.group_labels[m.lastgroup]}
+
+
+def build_feedback_classifier(categories=None) -> FeedbackClassifier:
+    return FeedbackClassifier(categories)
+
+
+def classify_feedback(text_series: pd.Series, categories=None) -> pd.DataFrame:
+    """Label every comment in one pass, returning one boolean column per label"""
+    classifier = build_feedback_classifier(categories)
+    labels = pd.DataFrame(False, index=text_series.index, columns=list(classifier.categories))
+
+    text = text_series.dropna().astype(str)
+    if text.empty:
+        return labels
+
+    matches = text.str.extractall(classifier.pattern)
+    if not matches.empty:
+        hits = matches.notna().groupby(level=0).any()
+        for group, group_labels in classifier.group_labels.items():
+            matched = hits.index[hits[group]]
+            for label in group_labels:
+                labels.loc[matched, label] = True
+    return labels
+
+
+def add_feedback_labels(df: pd.DataFrame, text_col=COL_FEEDBACK, categories=None) -> pd.DataFrame:
+    """Store the classifier labels as a comma-separated column on the DataFrame"""
+    df = df.copy()
+    if text_col not in df.columns:
+        df[COL_FEEDBACK_LABELS] = ''
+        return df
+
+    labels = classify_feedback(df[text_col], categories)
+    names = np.asarray(labels.columns, dtype=object)
+    df[COL_FEEDBACK_LABELS] = [LABEL_SEPARATOR.join(names[row]) for row in labels.to_numpy(dtype=bool)]
+    return df
+
+
+def filter_by_labels(df: pd.DataFrame, labels, exclude=False) -> pd.DataFrame:
+    """Keep rows tagged with any of `labels` (or drop them when exclude=True)"""
+    if isinstance(labels, str):
+        labels = [labels]
+    if not labels or COL_FEEDBACK_LABELS not in df.columns:
+        return df
+
+    pattern = r'(?:^|, )(?:' + '|'.join(re.escape(l) for l in labels) + r')(?:,|$)'
+    mask = df[COL_FEEDBACK_LABELS].fillna('').str.contains(pattern, regex=True)
+    return df[~mask] if exclude else df[mask]
+
+# ============================================
+# SENTIMENT SCORING
+# ============================================
+SENTIMENT_CACHE_FILE = 'sentiment_cache.json'
+
+# Free-text column -> sentiment column it feeds
+SENTIMENT_COLUMNS = {
+    COL_FEEDBACK: COL_FEEDBACK_SENTIMENT,
+    COL_ONE_THING: COL_ONE_THING_SENTIMENT,
+}
+
+# Below this many unscored texts a worker pool costs more than it saves
+SENTIMENT_POOL_THRESHOLD = 500
+SENTIMENT_CHUNK_SIZE = 250
+
+# TextBlob polarity cut-offs used for summaries
+NEGATIVE_POLARITY = -0.05
+POSITIVE_POLARITY = 0.05
+
+
+def score_texts(texts):
+    """TextBlob polarity (-1 to 1) for each text"""
+    from textblob import TextBlob  # NLP stack loads only when something needs scoring
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+def text_hashes(text_series: pd.Series) -> pd.Series:
+    """Stable content hash per response, used as the sentiment cache key"""
+    return pd.util.hash_pandas_object(text_series, index=False).map('{:016x}'.format)
+
+
+def load_sentiment_cache(cache_path=SENTIMENT_CACHE_FILE) -> dict:
+    """Read cached scores from disk (empty cache if missing or unreadable)"""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Warning: Ignoring unreadable sentiment cache - {e}")
+        return {}
+
+
+def save_sentiment_cache(cache: dict, cache_path=SENTIMENT_CACHE_FILE):
+    """Write the cache atomically so a crash never leaves a half-written file"""
+    if not cache_path:
+        return
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def _score_pending(texts, workers=None):
+    """Score texts inline, or across a process pool for large backlogs"""
+    if workers == 1 or len(texts) < SENTIMENT_POOL_THRESHOLD:
+        return score_texts(texts)
+
+    chunks = [texts[i:i + SENTIMENT_CHUNK_SIZE] for i in range(0, len(texts), SENTIMENT_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [score for chunk in pool.map(score_texts, chunks) for score in chunk]
+
+
+def add_sentiment_scores(df: pd.DataFrame, cache_path=SENTIMENT_CACHE_FILE, workers=None) -> pd.DataFrame:
+    """Add a polarity column per free-text question, scoring only unseen texts"""
+    df = df.copy()
+    cache = load_sentiment_cache(cache_path)
+
+    keys_by_col = {}
+    pending = {}
+    for text_col, score_col in SENTIMENT_COLUMNS.items():
+        if text_col not in df.columns:
+            continue
+        text = df[text_col].dropna().astype(str).str.strip()
+        text = text[text != '']
+        keys = text_hashes(text)
+        keys_by_col[score_col] = keys
+
+        new = ~keys.isin(cache.keys())
+        pending.update(zip(keys[new], text[new]))
+
+    if pending:
+        print(f"💭 Scoring sentiment for {len(pending)} new responses...")
+        cache.update(zip(pending, _score_pending(list(pending.values()), workers)))
+        save_sentiment_cache(cache, cache_path)
+
+    for score_col, keys in keys_by_col.items():
+        df[score_col] = keys.map(cache).reindex(df.index).astype(float)
+    return df
+
+
+def summarize_sentiment(df: pd.DataFrame, score_col=COL_FEEDBACK_SENTIMENT) -> dict:
+    """Average polarity plus positive/negative shares for one sentiment column"""
+    scores = df[score_col].dropna() if score_col in df.columns else pd.Series(dtype=float)
+    scored = len(scores)
+    return {
+        'scored': scored,
+        'average': float(scores.mean()) if scored else 0.0,
+        'positive_pct': ((scores > POSITIVE_POLARITY).sum() / scored * 100) if scored else 0,
+        'negative_pct': ((scores < NEGATIVE_POLARITY).sum() / scored * 100) if scored else 0,
+    }
+
+# ============================================
+# FACILITATOR STRENGTHS (MULTI-SELECT)
+# ============================================
+
+# Items inside a string-encoded list such as "['Clear, concise', 'Patient']";
+# shared with the row-at-a-time parser in response_records
+QUOTED_ITEM = r"""(['"])(?P<item>.*?)\1(?=\s*(?:,|\]|$))"""
+
+
+def parse_multi_select(series: pd.Series) -> pd.DataFrame:
+    """Multi-hot boolean matrix (rows x options) for a select-all-that-apply column
+
+    Handles real lists, string-encoded lists with quoted items (commas inside a
+    label are kept) and JotForm's newline-separated answers.
+    """
+    answers = series.dropna()
+    is_list = answers.map(lambda v: isinstance(v, (list, tuple)))
+    if is_list.any():
+        answers = answers.mask(is_list, answers[is_list].str.join('\n'))
+    answers = answers.astype(str).str.strip()
+
+    bracketed = answers.str.startswith('[')
+    quoted = answers[bracketed].str.extractall(QUOTED_ITEM)['item'].droplevel(1)
+    plain = answers[~bracketed].str.split(r'\s*\n\s*', regex=True).explode()
+
+    items = pd.concat([quoted, plain]).astype(str).str.strip()
+    items = items[items != '']
+    if items.empty:
+        return pd.DataFrame(index=series.index)
+
+    indicators = pd.crosstab(items.index, items).gt(0)
+    indicators = indicators.reindex(series.index, fill_value=False)
+    indicators.columns.name = None
+    return indicators
+
+
+def add_strength_indicators(df: pd.DataFrame, strengths_col=COL_STRENGTHS) -> pd.DataFrame:
+    """Parse the strengths column once into sparse 'Strength: <option>' columns"""
+    df = df.drop(columns=strength_columns(df))
+    if strengths_col not in df.columns:
+        return df
+
+    indicators = parse_multi_select(df[strengths_col])
+    indicators = indicators.add_prefix(STRENGTH_PREFIX).astype(pd.SparseDtype(bool, False))
+    return pd.concat([df, indicators], axis=1)
+
+
+def strength_columns(df: pd.DataFrame) -> list:
+    """Names of the strength indicator columns added at ingest"""
+    return [c for c in df.columns if isinstance(c, str) and c.startswith(STRENGTH_PREFIX)]
+
+
+def strength_counts(df: pd.DataFrame, by=None):
+    """How often each strength was selected: a column sum over the indicators
+
+    Returns a Series, or a DataFrame with one row per group when `by` is given.
+    """
+    columns = strength_columns(df)
+    if not columns:
+        return pd.DataFrame(index=pd.Index([], name=by)) if by else pd.Series(dtype='int64')
+
+    matrix = df[columns].astype(pd.SparseDtype('int64', 0))
+    matrix.columns = [c[len(STRENGTH_PREFIX):] for c in columns]
+    counts = matrix.groupby(df[by]).sum() if by else matrix.sum()
+    return counts.sparse.to_dense()
+
+
+def analyze_facilitator_strengths(df: pd.DataFrame, n=6):
+    """Top N (strength, count) pairs, most selected first"""
+    if not strength_columns(df):
+        df = add_strength_indicators(df, get_schema(df).columns.get('strengths', COL_STRENGTHS))
+    counts = strength_counts(df).sort_values(ascending=False, kind='stable')
+    return [(strength, int(count)) for strength, count in counts.head(n).items() if count > 0]
+
+def strength_cooccurrence(df: pd.DataFrame, by=None):
+    """How often each pair of strengths was selected together
+
+    Computed as the sparse product X.T @ X of the rows x strengths one-hot
+    matrix; the diagonal holds plain selection counts. With `by`, returns a
+    dict of group -> matrix, all produced by a single block-sparse product.
+    """
+    import scipy.sparse as sp
+
+    columns = strength_columns(df)
+    labels = [c[len(STRENGTH_PREFIX):] for c in columns]
+    if not columns:
+        return {} if by else pd.DataFrame()
+
+    onehot = sp.csr_matrix(df[columns].sparse.to_coo().astype(np.int64))
+    if by is None:
+        return pd.DataFrame((onehot.T @ onehot).toarray(), index=labels, columns=labels)
+
+    # Shift each row's strengths into its group's block of columns, so one
+    # product yields every group's k x k matrix stacked vertically
+    codes, groups = pd.factorize(df[by])
+    k = len(columns)
+    coo = onehot.tocoo()
+    keep = codes[coo.row] >= 0
+    blocked = sp.csr_matrix(
+        (coo.data[keep], (coo.row[keep], codes[coo.row[keep]] * k + coo.col[keep])),
+        shape=(onehot.shape[0], len(groups) * k),
+    )
+    stacked = (blocked.T @ onehot).toarray()
+    return {
+        group: pd.DataFrame(stacked[i * k:(i + 1) * k], index=labels, columns=labels)
+        for i, group in enumerate(groups)
+    }
+
+
+def top_strength_pairs(cooccurrence: pd.DataFrame, n=3):
+    """Most frequent ((strength_a, strength_b), count) pairs, excluding the diagonal"""
+    if cooccurrence.empty:
+        return []
+    upper = np.triu(cooccurrence.to_numpy(), k=1)
+    order = np.argsort(-upper, axis=None, kind='stable')[:n]
+    rows, cols = np.unravel_index(order, upper.shape)
+    return [
+        ((cooccurrence.index[i], cooccurrence.columns[j]), int(upper[i, j]))
+        for i, j in zip(rows, cols) if upper[i, j] > 0
+    ]
+
+# ============================================
+# NEAR-DUPLICATE DETECTION
+# ============================================
+
+# Free-text column -> near-duplicate cluster column it feeds
+CLUSTER_COLUMNS = {
+    COL_FEEDBACK: COL_FEEDBACK_CLUSTER,
+    COL_ONE_THING: COL_ONE_THING_CLUSTER,
+}
+
+SHINGLE_SIZE = 5            # character n-grams per shingle
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16              # 16 bands x 4 rows catches pairs above ~50% similarity
+DUPLICATE_THRESHOLD = 0.6   # estimated Jaccard similarity that counts as a duplicate
+MINHASH_CHUNK_SHINGLES = 50_000  # shingles permuted per vectorized block (~25 MB at 64 permutations)
+
+# Mersenne prime 2**31 - 1: with a, b and every shingle hash below it,
+# a * x + b stays under 2**62 and never overflows uint64 before the modulo
+_MINHASH_PRIME = 2**31 - 1
+
+
+def _shingle_hashes(text, size=SHINGLE_SIZE):
+    """31-bit hashes of the character shingles of a normalized text"""
+    normalized = ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+    if len(normalized) <= size:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+    return [zlib.crc32(s.encode('utf-8')) % _MINHASH_PRIME for s in shingles]
+
+
+def _shingle_chunks(texts, budget=MINHASH_CHUNK_SHINGLES):
+    """(first row, shingle hashes per text) blocks holding about `budget` shingles each"""
+    start, block, size = 0, [], 0
+    for i, text in enumerate(texts):
+        hashes = _shingle_hashes(text)
+        block.append(hashes)
+        size += len(hashes)
+        if size >= budget:
+            yield start, block
+            start, block, size = i + 1, [], 0
+    if block:
+        yield start, block
+
+
+def minhash_signatures(texts, num_perm=MINHASH_PERMUTATIONS, seed=75):
+    """MinHash signature matrix (texts x num_perm) using universal hashing"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MINHASH_PRIME, size=num_perm, dtype=np.uint64)[:, None]
+    b = rng.integers(0, _MINHASH_PRIME, size=num_perm, dtype=np.uint64)[:, None]
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for start, hashed in _shingle_chunks(texts):
+        lengths = np.fromiter((len(h) for h in hashed), dtype=np.int64, count=len(hashed))
+        flat = np.fromiter((x for h in hashed for x in h), dtype=np.uint64, count=int(lengths.sum()))
+
+        # Permute every shingle at once, then take the minimum per text
+        permuted = (a * flat[None, :] + b) % _MINHASH_PRIME
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        signatures[start:start + len(hashed)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return signatures
+
+
+def lsh_clusters(signatures, bands=LSH_BANDS, threshold=DUPLICATE_THRESHOLD):
+    """Cluster id per row: rows sharing an LSH bucket and similar signatures are merged"""
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    parent = np.arange(n)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        _, first, bucket = np.unique(
+            chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel(),
+            return_index=True, return_inverse=True,
+        )
+        # Candidate pairs: every row against the first row of its bucket
+        leaders = first[bucket]
+        candidates = np.nonzero(leaders != np.arange(n))[0]
+        if len(candidates) == 0:
+            continue
+        similarity = (signatures[candidates] == signatures[leaders[candidates]]).mean(axis=1)
+        matched = candidates[similarity >= threshold]
+        for i, j in zip(matched, leaders[matched]):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    roots = np.array([find(i) for i in range(n)])
+    return np.unique(roots, return_inverse=True)[1]
+
+
+def add_duplicate_clusters(df: pd.DataFrame) -> pd.DataFrame:
+    """Add a near-duplicate cluster id per free-text question (NA for blanks)"""
+    df = df.copy()
+    for text_col, cluster_col in CLUSTER_COLUMNS.items():
+        if text_col not in df.columns:
+            continue
+        text = df[text_col].dropna().astype(str).str.strip()
+        text = text[text != '']
+        clusters = pd.Series(pd.NA, index=df.index, dtype='Int64')
+        if len(text):
+            clusters[text.index] = lsh_clusters(minhash_signatures(text.tolist()))
+        df[cluster_col] = clusters
+    return df
+
+
+def feedback_theme_counts(df: pd.DataFrame) -> pd.Series:
+    """Responses per feedback label, counting each near-duplicate cluster once"""
+    if COL_FEEDBACK_LABELS not in df.columns:
+        return pd.Series(0, index=list(FEEDBACK_CATEGORIES))
+
+    labelled = df[df[COL_FEEDBACK_LABELS].fillna('') != '']
+    if COL_FEEDBACK_CLUSTER in labelled.columns:
+        labelled = labelled.drop_duplicates(subset=COL_FEEDBACK_CLUSTER)
+
+    counts = labelled[COL_FEEDBACK_LABELS].str.split(LABEL_SEPARATOR).explode().value_counts()
+    return counts.reindex(list(FEEDBACK_CATEGORIES), fill_value=0)
+
+# ============================================
+# QUOTE SELECTION
+# ============================================
+MIN_QUOTE_LENGTH = 10
+
+# Quotes inside this character band read best in a report
+QUOTE_LENGTH_BAND = (40, 280)
+
+# Relative weight of each ranking criterion (set one to 0 to ignore it)
+QUOTE_WEIGHTS = {
+    'length': 1.0,
+    'sentiment': 1.0,
+    'keywords': 0.5,
+    'recency': 0.25,
+}
+
+
+def score_quote(text, sentiment=None, position=1.0, weights=None,
+                length_band=QUOTE_LENGTH_BAND, classifier=None, n_labels=1):
+    """Score one quote on length band, sentiment, keyword coverage and recency"""
+    weights = weights or QUOTE_WEIGHTS
+    low, high = length_band
+    length = len(text)
+
+    # 1.0 inside the band, tapering off for quotes that are too short or too long
+    length_score = 1.0 if low <= length <= high else (length / low if length < low else high / length)
+    sentiment_score = 0.5 if sentiment is None or math.isnan(sentiment) else (sentiment + 1) / 2
+    keyword_score = 0.0
+    if classifier is not None and weights.get('keywords'):
+        keyword_score = len(classifier.labels(text)) / n_labels
+
+    return (
+        weights.get('length', 0) * length_score
+        + weights.get('sentiment', 0) * sentiment_score
+        + weights.get('keywords', 0) * keyword_score
+        + weights.get('recency', 0) * position
+    )
+
+
+def _quote_candidates(text_series):
+    """Yield each response stripped, or None when it is too short to quote"""
+    for response in text_series:
+        text = str(response).strip() if pd.notna(response) else ''
+        yield text if len(text) > MIN_QUOTE_LENGTH else None
+
+
+def extract_top_quotes(text_series: pd.Series, n=5, mode='first', sentiment=None, clusters=None,
+                       weights=None, length_band=QUOTE_LENGTH_BAND, categories=None, recency=None):
+    """Extract up to N quotes from open-ended responses
+
+    mode='first' keeps the first N usable responses; mode='ranked' streams the
+    column through a bounded heap and keeps the N best-scoring ones, so memory
+    stays O(N) whatever the response count. When near-duplicate `clusters` are
+    given, each cluster contributes at most one quote. `recency` gives each
+    response's 0-1 recency explicitly, for candidates drawn from a longer
+    history; by default it is the response's position in `text_series`.
+    """
+    candidates = _quote_candidates(text_series)
+    cluster_ids = repeat(None) if clusters is None else clusters
+
+    if mode == 'first':
+        seen = set()
+        quotes = []
+        for text, cluster in zip(candidates, cluster_ids):
+            if text is None or (pd.notna(cluster) and cluster in seen):
+                continue
+            if pd.notna(cluster):
+                seen.add(cluster)
+            quotes.append(text)
+            if len(quotes) == n:
+                break
+        return quotes
+
+    categories = categories or FEEDBACK_CATEGORIES
+    classifier = build_feedback_classifier(categories)
+    last_position = max(len(text_series) - 1, 1)
+    scores = repeat(None) if sentiment is None else sentiment
+    recencies = (position / last_position for position in range(len(text_series))) if recency is None else recency
+
+    heap = []
+    in_heap = {}  # cluster -> its entry currently in the heap (at most N)
+    for position, (text, polarity, cluster, recent) in enumerate(zip(candidates, scores, cluster_ids, recencies)):
+        if text is None:
+            continue
+        score = score_quote(
+            text,
+            sentiment=None if polarity is None else float(polarity),
+            position=float(recent),
+            weights=weights,
+            length_band=length_band,
+            classifier=classifier,
+            n_labels=len(categories),
+        )
+        # Ties go to the earlier response
+        entry = (score, -position, text)
+        has_cluster = cluster is not None and pd.notna(cluster)
+
+        if has_cluster and cluster in in_heap:
+            # Keep only the better of two near-duplicates
+            current = in_heap[cluster]
+            if entry > current:
+                heap[heap.index(current)] = entry
+                heapq.heapify(heap)
+                in_heap[cluster] = entry
+            continue
+
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+            dropped = None
+        else:
+            dropped = heapq.heappushpop(heap, entry)
+        if dropped is entry:
+            continue
+        if has_cluster:
+            in_heap[cluster] = entry
+        if dropped is not None:
+            in_heap = {c: e for c, e in in_heap.items() if e is not dropped}
+
+    return [text for _, _, text in sorted(heap, reverse=True)]
+
+# ============================================
+# METRICS OVER TIME
+# ============================================
+
+# Percentage metrics, in the same units as the dashboard's calculate_metrics()
+PERCENT_METRICS = ('excellent_pct', 'good_pct', 'pace_just', 'pace_fast', 'pace_slow',
+                   'hands_created', 'hands_followed', 'hands_completion')
+
+
+def metric_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-response numeric columns whose means are the headline metrics
+
+    'confidence' is the 1-5 score (NaN when missing); every other column is a
+    0/100 indicator, so a plain mean gives the percentage.
+    """
+    schema = get_schema(df)
+    rating, pace, hands = (schema.series(df, field) for field in ('rating', 'pace', 'hands_on'))
+    created = hands.eq(HANDS_CREATED)
+    followed = hands.eq(HANDS_FOLLOWED)
+    indicators = pd.DataFrame({
+        'confidence': pd.to_numeric(schema.series(df, 'confidence'), errors='coerce').astype(float),
+        'excellent_pct': rating.eq(RATING_EXCELLENT),
+        'good_pct': rating.isin([RATING_EXCELLENT, RATING_GOOD]),
+        'pace_just': pace.eq(PACE_JUST_RIGHT),
+        'pace_fast': pace.isin(PACE_TOO_FAST),
+        'pace_slow': pace.isin(PACE_TOO_SLOW),
+        'hands_created': created,
+        'hands_followed': followed,
+        'hands_completion': created | followed,
+    }, index=df.index)
+    indicators[list(PERCENT_METRICS)] = indicators[list(PERCENT_METRICS)].astype(float) * 100
+    return indicators
+
+
+def health_score(confidence, excellent_pct, hands_created, pace_just):
+    """0-100 overall health: four metrics weighted equally (works on scalars or Series)"""
+    return (
+        (confidence / 5.0) * 25
+        + (excellent_pct / 100) * 25
+        + (hands_created / 100) * 25
+        + (pace_just / 100) * 25
+    )
+
+
+def compare_workshops(df: pd.DataFrame, by=COL_SESSION) -> pd.DataFrame:
+    """Every workshop's headline metrics and health score from one grouped aggregation
+
+    Returns one row per workshop, best health score first, with the same
+    metric names the dashboard's calculate_metrics() uses.
+    """
+    indicators = metric_indicators(df)
+    grouped = indicators.groupby(df[by].to_numpy(), sort=False)
+    comparison = grouped.mean()
+    comparison['confidence'] = comparison['confidence'].fillna(0.0)
+    comparison.insert(0, 'total', grouped.size())
+    comparison['health'] = health_score(
+        comparison['confidence'], comparison['excellent_pct'],
+        comparison['hands_created'], comparison['pace_just'],
+    )
+    comparison = comparison.sort_values('health', ascending=False, kind='stable')
+    comparison.insert(0, 'rank', range(1, len(comparison) + 1))
+    comparison.index.name = 'workshop'
+    return comparison
+
+
+# Metrics that get bootstrap intervals
+INTERVAL_METRICS = ('confidence', 'excellent_pct', 'pace_just', 'pace_fast', 'pace_slow', 'hands_completion')
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_CHUNK_CELLS = 4_000_000   # resample weights drawn per block (~32 MB)
+BOOTSTRAP_NORMAL_MIN = 5000         # larger groups use the normal approximation
+
+
+def bootstrap_intervals(df: pd.DataFrame, by=None, n_boot=BOOTSTRAP_RESAMPLES, level=0.95,
+                        metrics=INTERVAL_METRICS, seed=75) -> pd.DataFrame:
+    """Percentile bootstrap intervals for the headline metrics
+
+    Resample means come from (resamples x n) multinomial weight matrices
+    times the indicator values, drawn in blocks of BOOTSTRAP_CHUNK_CELLS so
+    memory stays flat as a workshop grows. Groups of BOOTSTRAP_NORMAL_MIN or
+    more use the normal approximation, which the bootstrap converges to for
+    means of bounded scores. Returns columns '<metric>_low' / '<metric>_high',
+    one row per group (or a single 'all' row).
+    """
+    rng = np.random.default_rng(seed)
+    indicators = metric_indicators(df)[list(metrics)].to_numpy(dtype=float)
+    keys = df[by].to_numpy() if by else np.full(len(df), 'all', dtype=object)
+    tail = (1 - level) / 2 * 100
+    z = statistics.NormalDist().inv_cdf(1 - tail / 100)
+
+    rows = {}
+    for group, positions in pd.Series(np.arange(len(df))).groupby(keys, sort=False):
+        values = indicators[positions.to_numpy()]
+        n = len(values)
+        if n == 0:
+            continue
+
+        present = ~np.isnan(values)
+        if n == 1:
+            low = high = values[0]
+        elif n >= BOOTSTRAP_NORMAL_MIN:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                margin = z * np.nanstd(values, axis=0, ddof=1) / np.sqrt(present.sum(axis=0))
+            mean = np.nanmean(values, axis=0)
+            low = np.clip(mean - margin, np.nanmin(values, axis=0), None)
+            high = np.clip(mean + margin, None, np.nanmax(values, axis=0))
+        else:
+            # Resample counts per response; NaN answers (missing confidence) get zero weight
+            filled = np.where(present, values, 0.0)
+            means = np.empty((n_boot, values.shape[1]))
+            block = max(1, BOOTSTRAP_CHUNK_CELLS // n)
+            for start in range(0, n_boot, block):
+                size = min(block, n_boot - start)
+                weights = rng.multinomial(n, np.full(n, 1 / n), size=size).astype(float)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    means[start:start + size] = (weights @ filled) / (weights @ present)
+            low, high = np.nanpercentile(means, [tail, 100 - tail], axis=0)
+
+        rows[group] = {
+            **{f"{m}_low": lo for m, lo in zip(metrics, low)},
+            **{f"{m}_high": hi for m, hi in zip(metrics, high)},
+        }
+
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def submission_times(df: pd.DataFrame) -> pd.Series:
+    """Parsed submission timestamps (NaT when the sheet has no time column)"""
+    for col in SUBMISSION_TIME_COLUMNS:
+        if col in df.columns:
+            return pd.to_datetime(df[col], errors='coerce')
+    return pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+
+
+def row_keys(df: pd.DataFrame) -> pd.Series:
+    """Stable identity per response: its Submission ID, else a hash of its answers and time
+
+    Repeats of the same hash get an occurrence number, so two people who
+    answered alike are both kept while reading the same sheet again gives the
+    same keys. The hash is answer_hashes(), so raw sheet rows, prepared rows
+    and rows read back from the store key alike.
+    """
+    ids = df[COL_SUBMISSION_ID] if COL_SUBMISSION_ID in df.columns else pd.Series(None, index=df.index, dtype=object)
+    present = (ids.notna() & (ids.astype(str).str.strip() != '')).to_numpy()
+    keys = ids.astype(str).astype(object).where(present, None)
+    if not present.all():
+        hashes = answer_hashes(df[~present], DEDUP_FIELDS, times=True)
+        occurrence = hashes.groupby(hashes.to_numpy()).cumcount()
+        keys[~present] = ('row:' + hashes.map('{:016x}'.format) + ':' + occurrence.astype(str)).to_numpy()
+    return keys
+
+
+class TrendEngine:
+    """Per-period metric sums and counts that grow as new responses arrive
+
+    Each update sorts only the new rows once and folds a vectorized resample
+    into the running totals, so history is never re-scanned.
+    """
+
+    def __init__(self, freq='D', by=COL_SESSION):
+        self.freq = freq
+        self.by = by
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.rows_seen = 0
+        self.rows_synced = 0        # leading rows of the frame last passed to sync()
+        self.synced_edge = None     # row_keys() of the last of those rows
+        self.sums = pd.DataFrame()
+        self.counts = pd.DataFrame()
+
+    def update(self, new_rows: pd.DataFrame):
+        """Fold a batch of new responses into the running totals"""
+        self.rows_seen += len(new_rows)
+        times = submission_times(new_rows).to_numpy()
+        dated = np.flatnonzero(~pd.isna(times))
+        if len(dated) == 0:
+            return self
+
+        # The one sort: dated rows in submission order
+        order = dated[np.argsort(times[dated], kind='stable')]
+        batch = new_rows.iloc[order]
+        indicators = metric_indicators(batch).set_index(pd.DatetimeIndex(times[order]))
+        keys = [batch[self.by].to_numpy()] if self.by in batch.columns else []
+        grouped = indicators.groupby(keys + [pd.Grouper(freq=self.freq)])
+        sums, counts = grouped.sum(), grouped.count()
+
+        self.sums = sums if self.sums.empty else self.sums.add(sums, fill_value=0)
+        self.counts = counts if self.counts.empty else self.counts.add(counts, fill_value=0)
+        return self
+
+    def sync(self, df: pd.DataFrame):
+        """Fold in the rows appended since the last call
+
+        Responses only ever append, so the rows folded in last time are a
+        prefix of `df`. Only the last of them is keyed to check that, and only
+        the rows after it are read; if it has moved (rows removed or
+        reordered), start over from the whole frame.
+        """
+        with self._lock:
+            synced = self.rows_synced
+            if synced and (len(df) < synced or row_keys(df.iloc[synced - 1:synced]).iloc[0] != self.synced_edge):
+                self._reset()
+                synced = 0
+            if len(df) > synced:
+                self.update(df.iloc[synced:])
+                self.rows_synced = len(df)
+                self.synced_edge = row_keys(df.iloc[-1:]).iloc[0]
+        return self
+
+    def trends(self, group=None, window=7) -> pd.DataFrame:
+        """Metric values per period plus rolling-window values over `window` periods"""
+        sums, counts = self.sums, self.counts
+        if sums.empty:
+            return pd.DataFrame()
+        if isinstance(sums.index, pd.MultiIndex):
+            if group is None:
+                sums = sums.groupby(level=-1).sum()
+                counts = counts.groupby(level=-1).sum()
+            elif group in sums.index.get_level_values(0):
+                sums, counts = sums.xs(group, level=0), counts.xs(group, level=0)
+            else:
+                return pd.DataFrame()
+
+        # Empty periods stay in the index so rolling windows span real time
+        periods = pd.date_range(sums.index.min(), sums.index.max(), freq=self.freq)
+        sums = sums.reindex(periods, fill_value=0)
+        counts = counts.reindex(periods, fill_value=0)
+
+        current = sums / counts.where(counts > 0)
+        rolling = sums.rolling(window, min_periods=1).sum() / counts.rolling(window, min_periods=1).sum()
+        rolling.columns = [f"{c} (rolling {window})" for c in rolling.columns]
+        trend = pd.concat([current, rolling], axis=1)
+        trend['responses'] = counts['excellent_pct']
+        trend.index.name = 'period'
+        return trend
+
+
+def compute_trends(df: pd.DataFrame, freq='D', window=7, group=None) -> pd.DataFrame:
+    """One-off trend table for a DataFrame (see TrendEngine for the incremental form)"""
+    return TrendEngine(freq=freq).update(df).trends(group=group, window=window)
+
+# ============================================
+# CHANGE DETECTION
+# ============================================
+
+def workshop_fingerprints(df: pd.DataFrame, by=COL_SESSION) -> dict:
+    """{workshop: fingerprint} that changes whenever a workshop's responses do
+
+    Built from per-row hashes of the survey answers, summed per workshop, so
+    re-fetching or re-sorting the same sheet gives the same fingerprints.
+    """
+    if len(df) == 0 or by not in df.columns:
+        return {}
+    positions = sorted(get_schema(df).positions.values())
+    rows = pd.util.hash_pandas_object(df.iloc[:, positions], index=False).to_numpy()
+    # Split each hash in halves so the per-group sums can't overflow
+    halves = pd.DataFrame({'lo': (rows & 0xFFFFFFFF).astype(np.int64), 'hi': (rows >> 32).astype(np.int64)})
+    sums = halves.groupby(df[by].astype(object).to_numpy()).agg(['sum', 'size'])
+    return {
+        workshop: f"{row[('lo', 'size')]}:{row[('lo', 'sum')]:x}:{row[('hi', 'sum')]:x}"
+        for workshop, row in sums.iterrows()
+    }
+
+# ============================================
+# DUPLICATE SUBMISSIONS
+# ============================================
+
+# Answers compared when looking for resubmissions (IDs and timestamps differ
+# between a double-click's two rows, so they're left out)
+DEDUP_FIELDS = ('session', 'event', 'cohort', 'background', 'confidence', 'rating', 'pace', 'hands_on',
+                'strengths', 'after_workshop', 'feedback', 'one_thing')
+
+# Identical answers with no free text count as a duplicate only this close
+# together; two people can easily tick the same boxes in one session
+DUPLICATE_WINDOW = '10min'
+
+
+def _answer_hash(series: pd.Series) -> np.ndarray:
+    """uint64 per row, equal for answers that match after trimming, casing and
+    whitespace, with whole numbers read back as floats ('4.0') matching '4' (0 = blank)
+
+    Only the distinct answers are normalized and hashed, and the hash depends
+    on the answer alone, so it agrees across separately loaded frames.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    normalized = (pd.Series(uniques, dtype=object).astype(str)
+                  .str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+                  .str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True))
+    hashed = pd.util.hash_array(normalized.to_numpy(dtype=object))
+    hashed[normalized.eq('').to_numpy()] = 0
+    return np.where(codes < 0, np.uint64(0), hashed[codes] if len(hashed) else np.uint64(0))
+
+
+def _answer_columns(df: pd.DataFrame, fields, times=False) -> pd.DataFrame:
+    """_answer_hash() of each schema field (plus the submission time when asked)"""
+    schema = get_schema(df)
+    columns = {field: _answer_hash(schema.series(df, field)) for field in fields}
+    if times:
+        columns['submitted_at'] = _answer_hash(submission_times(df).dt.strftime('%Y-%m-%d %H:%M:%S'))
+    return pd.DataFrame(columns, index=df.index)
+
+
+def answer_hashes(df: pd.DataFrame, fields=DEDUP_FIELDS, times=False) -> pd.Series:
+    """One stable 64-bit hash per row of the given schema fields' normalized answers
+
+    The single row hash behind dedup fingerprints, store keys and trend keys;
+    `times` adds the submission time.
+    """
+    return pd.util.hash_pandas_object(_answer_columns(df, fields, times), index=False)
+
+
+def find_duplicate_submissions(df: pd.DataFrame, window=DUPLICATE_WINDOW, earlier=None) -> pd.Series:
+    """True for every row that repeats an earlier submission (the first copy is kept)
+
+    A row is a duplicate when its submission ID was already seen, or when its
+    normalized answers hash the same as an earlier row's and either it has
+    free text or it arrived within `window` of that row. One hashing pass and
+    one hash-table pass, so it stays linear on multi-million-row histories.
+
+    `earlier` holds responses accepted before `df` (e.g. read back from the
+    store); rows of `df` repeating one of them are flagged as well.
+    """
+    if len(df) == 0:
+        return pd.Series(False, index=df.index)
+    if earlier is not None and len(earlier):
+        combined = pd.concat([earlier.reindex(columns=df.columns), df], ignore_index=True)
+        flags = find_duplicate_submissions(combined, window).to_numpy()[len(earlier):]
+        return pd.Series(flags, index=df.index)
+
+    ids = pd.Series(_answer_hash(get_schema(df).series(df, 'submission_id')), index=df.index)
+    repeated_id = ids.ne(0) & ids.duplicated()
+
+    answers = _answer_columns(df, DEDUP_FIELDS)
+    keys = pd.util.hash_pandas_object(answers, index=False)
+    repeated = keys.duplicated()
+    if not repeated.any():
+        return repeated_id
+
+    has_text = answers['feedback'].ne(0) | answers['one_thing'].ne(0)
+    gap = submission_times(df).groupby(keys.to_numpy()).diff().abs()
+    close = gap.le(pd.Timedelta(window)).fillna(False).to_numpy()
+    return repeated_id | (repeated & (has_text | close))
+
+
+def drop_duplicate_submissions(df: pd.DataFrame, window=DUPLICATE_WINDOW):
+    """(responses without resubmissions, number of rows removed)"""
+    duplicates = find_duplicate_submissions(df, window=window)
+    removed = int(duplicates.sum())
+    if removed:
+        df = df[~duplicates.to_numpy()].reset_index(drop=True)
+    return df, removed
+
+# ============================================
+# INGEST
+# ============================================
+
+# Long free-text answers; always stored as Arrow strings when pyarrow is available
+FREE_TEXT_COLUMNS = (COL_FEEDBACK, COL_ONE_THING)
+
+
+def arrow_string_dtype():
+    """Arrow-backed string dtype with NaN for missing values, or None without pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    # pandas 3 (and 2.x with future.infer_string) already defaults to it as 'str';
+    # 2.3 spells it with na_value and 2.1-2.2 as 'pyarrow_numpy'
+    candidates = (
+        lambda: pd.api.types.pandas_dtype('str'),
+        lambda: pd.StringDtype('pyarrow', na_value=np.nan),
+        lambda: pd.StringDtype('pyarrow_numpy'),
+    )
+    for candidate in candidates:
+        try:
+            dtype = candidate()
+        except (TypeError, ValueError):
+            continue
+        if getattr(dtype, 'storage', None) in ('pyarrow', 'pyarrow_numpy'):
+            return dtype
+    return None
+
+
+def compact_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Move Python-object string columns into contiguous Arrow buffers
+
+    The free-text answers dominate the cached DataFrame's memory; as object
+    columns every answer is a separate Python str. Other object columns are
+    converted only when they hold nothing but strings.
+    """
+    dtype = arrow_string_dtype()
+    if dtype is None:
+        return df
+    targets = {
+        col: dtype for col in df.columns
+        if df[col].dtype == object and (col in FREE_TEXT_COLUMNS or pd.api.types.infer_dtype(df[col]) == 'string')
+    }
+    if not targets:
+        return df
+    # Mixed answers (a bare number typed into a text box) become their text
+    for col in FREE_TEXT_COLUMNS:
+        if col in targets:
+            df = df.assign(**{col: df[col].map(lambda v: v if pd.isna(v) else str(v))})
+    return df.astype(targets)
+
+
+def prepare_responses(df: pd.DataFrame, sentiment_cache=SENTIMENT_CACHE_FILE, dedup=True) -> pd.DataFrame:
+    """Derive analysis columns once, right after the sheet is loaded"""
+    if df is None or len(df) == 0:
+        return df
+    df = apply_schema(df)
+    schema = df.attrs['schema']
+    df = compact_text_columns(df)
+    if dedup:
+        df, removed = drop_duplicate_submissions(df)
+        if removed:
+            print(f"🧹 Removed {removed} duplicate submissions")
+    df = add_feedback_labels(df)
+    df = add_strength_indicators(df)
+    df = add_duplicate_clusters(df)
+    df = add_sentiment_scores(df, cache_path=sentiment_cache)
+
+    # Derived columns only append, so the resolved positions still hold; concat
+    # along the way drops attrs, so carry the schema over explicitly
+    df.attrs['schema'] = schema
+    return df
@@ -4,13 +4,21 @@
 Pulls data from JotForm → Google Sheets, analyzes, and generates report
 """
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import argparse
+
 import pandas as pd
-import numpy as np
-from collections import Counter
 from datetime import datetime
-from textblob import TextBlob
+
+from workshop_analytics import (
+    COL_FEEDBACK, COL_FEEDBACK_CLUSTER, COL_FEEDBACK_SENTIMENT, COL_ONE_THING, COL_ONE_THING_CLUSTER,
+    COL_ONE_THING_SENTIMENT, COL_SESSION, FEEDBACK_CATEGORIES,
+    analyze_facilitator_strengths, compare_workshops, extract_top_quotes, feedback_theme_counts,
+    filter_by_labels, get_schema, prepare_responses, strength_cooccurrence, summarize_sentiment,
+    top_strength_pairs
+)
+from response_store import open_store
+from sheet_loader import SHEET_SOURCES_FILE, load_responses, load_sources
+from telemetry import telemetry
 
 # ============================================
 # CONFIGURATION
@@ -25,11 +33,21 @@ WORKSHOPS = {
     'Voice': 'Voice & Pitch for Power: Communicating Technical Ideas With Clarity and Authority'
 }
 
+# --workshop flag values -> the interactive menu's numbers
+WORKSHOP_CHOICES = {'all': '1', 'ai': '2', 'visibility': '3', 'voice': '4'}
+
 # ============================================
 # GOOGLE SHEETS CONNECTION
 # ============================================
-def get_survey_data():
-    """Connect to Google Sheets and pull all survey responses"""
+def get_survey_data(sources_file=SHEET_SOURCES_FILE, prepare=True):
+    """Connect to Google Sheets and pull all survey responses (every configured sheet)
+
+    prepare=False returns the raw merged sheet, for callers that only
+    derive the analysis columns when something changed.
+    """
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     print("🔗 Connecting to Google Sheets...")
     
     scope = [
@@ -42,11 +60,14 @@ def get_survey_data():
             CREDENTIALS_FILE, scope
         )
         client = gspread.authorize(creds)
-        sheet = client.open(SHEET_NAME).sheet1
-        data = sheet.get_all_records()
+        sources = load_sources(sources_file, default_sheet=SHEET_NAME)
+        data = load_responses(client, sources)
         
-        print(f"✅ Connected! Found {len(data)} survey responses")
-        return pd.DataFrame(data)
+        print(f"✅ Connected! Found {len(data)} survey responses across {len(sources)} sheet(s)")
+        if not prepare:
+            return data
+        with telemetry.span('dataframe_build', rows=len(data)):
+            return prepare_responses(data)
     
     except FileNotFoundError:
         print("❌ Error: credentials.json not found!")
@@ -60,11 +81,11 @@ def get_survey_data():
 # ANALYSIS FUNCTIONS
 # ============================================
 
-def calculate_confidence_score(df, confidence_col):
+def calculate_confidence_score(df, field='confidence'):
     """Calculate average confidence score (1-5 scale)"""
     try:
         # Convert to numeric, handling any text values
-        scores = pd.to_numeric(df[confidence_col], errors='coerce')
+        scores = pd.to_numeric(get_schema(df).series(df, field), errors='coerce')
         avg = scores.mean()
         
         # Return 0 if no valid scores, otherwise return the average
@@ -73,9 +94,9 @@ def calculate_confidence_score(df, confidence_col):
         print(f"⚠️ Warning: Could not calculate confidence score - {e}")
         return 0.0
 
-def analyze_facilitator_rating(df, rating_col):
+def analyze_facilitator_rating(df, field='rating'):
     """Analyze facilitator rating distribution"""
-    ratings = df[rating_col].value_counts()
+    ratings = get_schema(df).series(df, field).value_counts()
     
     # Map emoji ratings to scores
     rating_map = {
@@ -100,9 +121,9 @@ def analyze_facilitator_rating(df, rating_col):
         'total': total
     }
 
-def analyze_pace(df, pace_col):
+def analyze_pace(df, field='pace'):
     """Analyze workshop pacing feedback"""
-    pace_counts = df[pace_col].value_counts()
+    pace_counts = get_schema(df).series(df, field).value_counts()
     total = len(df)
     
     just_right = pace_counts.get('Just right - Perfect pace for my level', 0)
@@ -120,20 +141,9 @@ def analyze_pace(df, pace_col):
         'too_slow_pct': (too_slow / total * 100) if total > 0 else 0
     }
 
-def extract_top_quotes(text_series, n=5):
-    """Extract top N quotes from open-ended responses"""
-    quotes = []
-    for response in text_series.dropna():
-        response = str(response).strip()
-        if len(response) > 10:  # Skip very short responses
-            quotes.append(response)
-    
-    # Return up to n random quotes (or all if fewer)
-    return quotes[:n]
-
-def analyze_hands_on(df, hands_on_col):
+def analyze_hands_on(df, field='hands_on'):
     """Analyze hands-on deliverable completion"""
-    counts = df[hands_on_col].value_counts()
+    counts = get_schema(df).series(df, field).value_counts()
     total = len(df)
     
     created = counts.get('Yes - I created/started [code sample / prototype / document / project file]', 0)
@@ -145,78 +155,103 @@ def analyze_hands_on(df, hands_on_col):
         'completion_rate': ((created + followed) / total * 100) if total > 0 else 0
     }
 
-def analyze_facilitator_strengths(df, strengths_col):
-    """Analyze what facilitators did well (multi-select)"""
-    # This column contains arrays, need to parse
-    all_strengths = []
-    for response in df[strengths_col].dropna():
-        # Response might be a string like "['item1', 'item2']" or actual list
-        if isinstance(response, str):
-            # Parse string representation of list
-            items = response.strip('[]').split(',')
-            items = [item.strip().strip('"\'') for item in items]
-            all_strengths.extend(items)
-        else:
-            all_strengths.append(response)
-    
-    strength_counts = Counter(all_strengths)
-    return strength_counts.most_common(6)
-
 # ============================================
 # REPORT GENERATION
 # ============================================
 
-def generate_report(df, workshop_filter=None):
-    """Generate workshop facilitator report"""
+def format_comparison(comparison):
+    """Markdown ranking table of every workshop (used by the All Workshops report)"""
+    section = """
+## 🏆 Workshop Comparison
 
-    # DEBUG: Print column names to verify
-    print("\n🔍 DEBUG - Column names in your sheet:")
-    for col in df.columns:
-        print(f"   - '{col}'")
-    print()
-    
-    # Filter by workshop if specified
-    if workshop_filter:
-        df = df[df['Which session did you attend?'] == workshop_filter]
-        workshop_name = workshop_filter
+| Rank | Workshop | Health | Responses | Confidence | Excellent | Just Right Pace | Hands-On Completion |
+|------|----------|--------|-----------|------------|-----------|-----------------|---------------------|
+"""
+    for workshop, row in comparison.iterrows():
+        section += (
+            f"| {row['rank']:.0f} | {workshop} | {row['health']:.0f}/100 | {row['total']:.0f} "
+            f"| {row['confidence']:.1f} | {row['excellent_pct']:.0f}% | {row['pace_just']:.0f}% "
+            f"| {row['hands_completion']:.0f}% |\n"
+        )
+    return section + "\n---\n"
+
+
+@telemetry.timed('report_build')
+def generate_report(df, workshop_filter=None, label_filter=None, store=None):
+    """Generate workshop facilitator report
+
+    With a ResponseStore every number, quote and strength comes from SQL
+    queries and `df` may be None.
+    """
+
+    workshop_name = workshop_filter or "All Workshops"
+    if label_filter:
+        workshop_name = f"{workshop_name} ({', '.join(label_filter)})"
+
+    if store is not None:
+        total_responses = store.count(workshop_filter, labels=label_filter)
     else:
-        workshop_name = "All Workshops"
+        print(f"\n🧭 {get_schema(df).describe()}\n")
+
+        # Filter by workshop if specified
+        if workshop_filter:
+            df = df[df[COL_SESSION] == workshop_filter]
+
+        # Only keep responses tagged with the requested feedback themes
+        if label_filter:
+            df = filter_by_labels(df, label_filter)
+        total_responses = len(df)
     
-    if len(df) == 0:
+    if total_responses == 0:
         print(f"❌ No responses found for: {workshop_name}")
         return None
     
-    print(f"📊 Analyzing {len(df)} responses for: {workshop_name}")
-    
-    # Column names from your JotForm
-    COL_SESSION = 'Which session did you attend?'
-    COL_CONFIDENCE = 'How confident do you feel implementing what you learned today? '
-    COL_FACILITATOR_RATING = 'The facilitator today was:'
-    COL_PACE = 'Was the workshop pace/level right for you?'
-    COL_HANDS_ON = 'Did you create a hands-on deliverable today?'
-    COL_FACILITATOR_STRENGTHS = 'The facilitator today: (Select all that apply)'
-    COL_FACILITATOR_FEEDBACK = 'What did the facilitator do especially well? Any suggestions for improvement?'
-    COL_ONE_THING = "What's ONE thing you'll try this week based on today's workshop?"
-    COL_AFTER_WORKSHOP = "After today's workshop, I feel:"
-    COL_BACKGROUND = 'Your background in this topic:'
+    print(f"📊 Analyzing {total_responses} responses for: {workshop_name}")
     
     # Calculate metrics
-    total_responses = len(df)
-    confidence_score = calculate_confidence_score(df, COL_CONFIDENCE)
-    facilitator_rating = analyze_facilitator_rating(df, COL_FACILITATOR_RATING)
-    pace_analysis = analyze_pace(df, COL_PACE)
-    hands_on_analysis = analyze_hands_on(df, COL_HANDS_ON)
-    
+    with telemetry.span('metrics', rows=total_responses):
+        if store is not None:
+            pushed_down = store.report_metrics(workshop_filter, labels=label_filter)
+            confidence_score = pushed_down['confidence']
+            facilitator_rating = pushed_down['facilitator_rating']
+            pace_analysis = pushed_down['pace']
+            hands_on_analysis = pushed_down['hands_on']
+            sentiment = pushed_down['sentiment']
+            comparison = store.comparison(labels=label_filter) if not workshop_filter else None
+        else:
+            confidence_score = calculate_confidence_score(df)
+            facilitator_rating = analyze_facilitator_rating(df)
+            pace_analysis = analyze_pace(df)
+            hands_on_analysis = analyze_hands_on(df)
+            sentiment = summarize_sentiment(df)
+            comparison = compare_workshops(df, by=COL_SESSION) if not workshop_filter else None
+
     # Extract quotes
-    what_well_quotes = extract_top_quotes(df[COL_FACILITATOR_FEEDBACK], n=5)
-    one_thing_quotes = extract_top_quotes(df[COL_ONE_THING], n=5)
-    
-    # Analyze facilitator strengths
-    try:
-        facilitator_strengths = analyze_facilitator_strengths(df, COL_FACILITATOR_STRENGTHS)
-    except:
-        facilitator_strengths = []
-    
+    with telemetry.span('quotes', rows=total_responses):
+        if store is not None:
+            what_well_quotes = store.quotes(COL_FEEDBACK, workshop_filter, n=5, labels=label_filter)
+            one_thing_quotes = store.quotes(COL_ONE_THING, workshop_filter, n=5, labels=label_filter)
+        else:
+            what_well_quotes = extract_top_quotes(
+                df[COL_FEEDBACK], n=5, mode='ranked',
+                sentiment=df.get(COL_FEEDBACK_SENTIMENT), clusters=df.get(COL_FEEDBACK_CLUSTER)
+            )
+            one_thing_quotes = extract_top_quotes(
+                df[COL_ONE_THING], n=5, mode='ranked',
+                sentiment=df.get(COL_ONE_THING_SENTIMENT), clusters=df.get(COL_ONE_THING_CLUSTER)
+            )
+
+    # Feedback themes and facilitator strengths (multi-select, parsed into indicator columns at ingest)
+    with telemetry.span('strengths', rows=total_responses):
+        if store is not None:
+            theme_counts = store.theme_counts(workshop_filter, labels=label_filter)
+            facilitator_strengths = store.top_strengths(workshop_filter, labels=label_filter, n=6)
+            strength_pairs = top_strength_pairs(store.strength_cooccurrence(workshop_filter, labels=label_filter), n=3)
+        else:
+            theme_counts = feedback_theme_counts(df)
+            facilitator_strengths = analyze_facilitator_strengths(df, n=6)
+            strength_pairs = top_strength_pairs(strength_cooccurrence(df), n=3)
+
     # Build the report
     report = f"""
 # Workshop Report: {workshop_name}
@@ -225,7 +260,7 @@ def generate_report(df, workshop_filter=None):
 **Total Responses:** {total_responses}
 
 ---
-
+{format_comparison(comparison) if comparison is not None else ''}
 ## 📊 Overall Performance Summary
 
 ### ⭐ Confidence Score
@@ -235,6 +270,14 @@ def generate_report(df, workshop_filter=None):
 
 ---
 
+### 💭 Feedback Sentiment
+**{sentiment['average']:+.2f}** average tone (-1 negative to +1 positive) across {sentiment['scored']} written comments
+
+- 😊 **Positive:** {sentiment['positive_pct']:.0f}%
+- 😟 **Negative:** {sentiment['negative_pct']:.0f}%
+
+---
+
 ### 👩‍🏫 Facilitator Rating
 
 **Overall Quality:**
@@ -280,8 +323,26 @@ def generate_report(df, workshop_filter=None):
             report += f"{i}. **{strength}** - {count} mentions ({pct:.0f}%)\n"
     else:
         report += "*Analyzing facilitator strengths...*\n"
+
+    if strength_pairs:
+        report += "\n**Often selected together:**\n\n"
+        for (first, second), count in strength_pairs:
+            report += f"- **{first}** + **{second}** - {count} builders\n"
     
-    report += f"""
+    report += """
+
+---
+
+## 🏷️ Feedback Themes
+
+**Distinct comments per theme (near-duplicates counted once):**
+
+"""
+
+    for theme, count in theme_counts.items():
+        report += f"- **{theme.title()}:** {count}\n"
+
+    report += """
 
 ---
 
@@ -294,7 +355,7 @@ def generate_report(df, workshop_filter=None):
     for i, quote in enumerate(what_well_quotes[:5], 1):
         report += f'{i}. > "{quote}"\n\n'
     
-    report += f"""
+    report += """
 
 ---
 
@@ -307,7 +368,7 @@ def generate_report(df, workshop_filter=None):
     for i, quote in enumerate(one_thing_quotes[:5], 1):
         report += f'{i}. "{quote}"\n'
     
-    report += f"""
+    report += """
 
 ---
 
@@ -355,32 +416,67 @@ def generate_report(df, workshop_filter=None):
 # MAIN EXECUTION
 # ============================================
 
+def parse_args():
+    """Optional flags; anything not given is asked for interactively"""
+    parser = argparse.ArgumentParser(description="Generate a Markdown facilitator report from the 75HER survey sheet")
+    parser.add_argument('--workshop', choices=list(WORKSHOP_CHOICES), help="skip the workshop prompt")
+    parser.add_argument('--sources', default=SHEET_SOURCES_FILE,
+                        help="JSON list of spreadsheets/tabs to merge (default: %(default)s, else the main sheet)")
+    parser.add_argument('--db', metavar='PATH',
+                        help="sync new responses into this SQLite file and build the report from it "
+                             "(uses what is stored when the sheet can't be reached)")
+    parser.add_argument('--themes', help=f"comma-separated feedback themes ({', '.join(FEEDBACK_CATEGORIES)}), skips the theme prompt")
+    return parser.parse_args()
+
+
 def main():
     """Main workflow"""
+    args = parse_args()
+    telemetry.service = 'workshop_report'
     print("="*60)
     print("   75HER WORKSHOP FACILITATOR REPORT GENERATOR")
     print("="*60)
     print()
     
-    # Get data
-    df = get_survey_data()
-    
-    if df is None or len(df) == 0:
-        print("\n❌ No data available. Exiting.")
-        return
+    # Get data; with a store only the sheet's new rows are prepared, and the
+    # report is built from SQL without loading the history into pandas
+    store = None
+    if args.db:
+        df = None
+        store = open_store(args.db, raw=get_survey_data(args.sources, prepare=False))
+        if store.count() == 0:
+            print("\n❌ No data available. Exiting.")
+            return
+        workshop_count = len(store.workshops())
+    else:
+        df = get_survey_data(args.sources)
+        if df is None or len(df) == 0:
+            print("\n❌ No data available. Exiting.")
+            return
+        workshop_count = df[COL_SESSION].nunique()
     
-    print(f"\n📋 Found responses for {df['Which session did you attend?'].nunique()} workshop(s)")
+    print(f"\n📋 Found responses for {workshop_count} workshop(s)")
     print()
     
     # Ask user which workshop to analyze
-    print("Which workshop would you like to analyze?")
-    print("1. All workshops (combined report)")
-    print("2. AI Agent Workshop")
-    print("3. Confidence VISIBLE Workshop")
-    print("4. Voice & Pitch Workshop")
-    print()
-    
-    choice = input("Enter number (1-4): ").strip()
+    if args.workshop:
+        choice = WORKSHOP_CHOICES[args.workshop]
+    else:
+        print("Which workshop would you like to analyze?")
+        print("1. All workshops (combined report)")
+        print("2. AI Agent Workshop")
+        print("3. Confidence VISIBLE Workshop")
+        print("4. Voice & Pitch Workshop")
+        print()
+    
+        choice = input("Enter number (1-4): ").strip()
+
+    themes = args.themes
+    if themes is None:
+        print()
+        print(f"Filter by feedback theme? ({', '.join(FEEDBACK_CATEGORIES)})")
+        themes = input("Enter themes separated by commas, or press Enter for all: ").strip()
+    label_filter = [t.strip().lower() for t in themes.split(',') if t.strip().lower() in FEEDBACK_CATEGORIES]
     
     workshop_filter = None
     if choice == "2":
@@ -392,7 +488,7 @@ def main():
     
     # Generate report
     print("\n📈 Analyzing data...\n")
-    report = generate_report(df, workshop_filter)
+    report = generate_report(df, workshop_filter, label_filter, store=store)
     
     if report is None:
         return
@@ -401,6 +497,7 @@ def main():
     filename = f"workshop_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(report)
+    telemetry.count('reports_generated', format='markdown')
     
     # Display report
     print("\n" + "="*60)
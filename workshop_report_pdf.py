@@ -4,13 +4,22 @@
 Creates beautifully branded PDF reports from JotForm survey data
 """
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import argparse
+import os
+import re
+from html import escape
+
 import pandas as pd
 from datetime import datetime
-from weasyprint import HTML, CSS
-from io import StringIO
-import base64
+
+from workshop_analytics import (
+    COL_FEEDBACK, COL_FEEDBACK_CLUSTER, COL_FEEDBACK_SENTIMENT, COL_ONE_THING, COL_ONE_THING_CLUSTER,
+    COL_ONE_THING_SENTIMENT, COL_SESSION, FEEDBACK_CATEGORIES, extract_top_quotes,
+    filter_by_labels, get_schema, prepare_responses, summarize_sentiment
+)
+from response_store import open_store
+from sheet_loader import SHEET_SOURCES_FILE, load_responses, load_sources
+from telemetry import telemetry
 
 # ============================================
 # CONFIGURATION
@@ -34,11 +43,20 @@ WORKSHOPS = {
     'Voice': 'Voice & Pitch for Power: Communicating Technical Ideas With Clarity and Authority'
 }
 
+# --workshop flag values -> the interactive menu's numbers
+WORKSHOP_CHOICES = {'all': '1', 'ai': '2', 'visibility': '3', 'voice': '4'}
+
 # ============================================
 # GOOGLE SHEETS CONNECTION
 # ============================================
-def get_survey_data():
-    """Connect to Google Sheets and pull all survey responses"""
+def get_survey_data(sources_file=SHEET_SOURCES_FILE, prepare=True):
+    """Connect to Google Sheets and pull all survey responses (every configured sheet)
+
+    prepare=False returns the raw merged sheet (for syncing into a store).
+    """
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     print("🔗 Connecting to Google Sheets...")
     
     scope = [
@@ -51,11 +69,14 @@ def get_survey_data():
             CREDENTIALS_FILE, scope
         )
         client = gspread.authorize(creds)
-        sheet = client.open(SHEET_NAME).sheet1
-        data = sheet.get_all_records()
+        sources = load_sources(sources_file, default_sheet=SHEET_NAME)
+        data = load_responses(client, sources)
         
-        print(f"✅ Connected! Found {len(data)} survey responses")
-        return pd.DataFrame(data)
+        print(f"✅ Connected! Found {len(data)} survey responses across {len(sources)} sheet(s)")
+        if not prepare:
+            return data
+        with telemetry.span('dataframe_build', rows=len(data)):
+            return prepare_responses(data)
     
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -65,18 +86,18 @@ def get_survey_data():
 # ANALYSIS FUNCTIONS
 # ============================================
 
-def calculate_confidence_score(df, confidence_col):
+def calculate_confidence_score(df, field='confidence'):
     """Calculate average confidence score (1-5 scale)"""
     try:
-        scores = pd.to_numeric(df[confidence_col], errors='coerce')
+        scores = pd.to_numeric(get_schema(df).series(df, field), errors='coerce')
         avg = scores.mean()
         return 0.0 if pd.isna(avg) else float(avg)
     except:
         return 0.0
 
-def analyze_facilitator_rating(df, rating_col):
+def analyze_facilitator_rating(df, field='rating'):
     """Analyze facilitator rating"""
-    ratings = df[rating_col].value_counts()
+    ratings = get_schema(df).series(df, field).value_counts()
     total = len(df)
     
     excellent = ratings.get('🌟 Excellent - Clear, engaging, well-paced', 0)
@@ -93,9 +114,9 @@ def analyze_facilitator_rating(df, rating_col):
         'total': total
     }
 
-def analyze_pace(df, pace_col):
+def analyze_pace(df, field='pace'):
     """Analyze workshop pacing"""
-    pace_counts = df[pace_col].value_counts()
+    pace_counts = get_schema(df).series(df, field).value_counts()
     total = len(df)
     
     just_right = pace_counts.get('Just right - Perfect pace for my level', 0)
@@ -113,9 +134,9 @@ def analyze_pace(df, pace_col):
         'too_slow_pct': (too_slow / total * 100) if total > 0 else 0
     }
 
-def analyze_hands_on(df, hands_on_col):
+def analyze_hands_on(df, field='hands_on'):
     """Analyze hands-on completion"""
-    counts = df[hands_on_col].value_counts()
+    counts = get_schema(df).series(df, field).value_counts()
     total = len(df)
     
     created = counts.get('Yes - I created/started [code sample / prototype / document / project file]', 0)
@@ -127,54 +148,71 @@ def analyze_hands_on(df, hands_on_col):
         'completion_rate': ((created + followed) / total * 100) if total > 0 else 0
     }
 
-def extract_top_quotes(text_series, n=5):
-    """Extract top quotes"""
-    quotes = []
-    for response in text_series.dropna():
-        response = str(response).strip()
-        if len(response) > 10:
-            quotes.append(response)
-    return quotes[:n]
-
 # ============================================
 # HTML REPORT GENERATION
 # ============================================
 
-def generate_html_report(df, workshop_filter=None):
-    """Generate beautifully branded HTML report"""
+@telemetry.timed('html_build')
+def generate_html_report(df, workshop_filter=None, label_filter=None, store=None):
+    """Generate beautifully branded HTML report
+
+    With a ResponseStore every number and quote comes from SQL queries and
+    `df` may be None.
+    """
     
-    # Filter by workshop
-    if workshop_filter:
-        df = df[df['Which session did you attend?'] == workshop_filter]
-        workshop_name = workshop_filter
+    workshop_name = workshop_filter or "All Workshops"
+    if label_filter:
+        workshop_name = f"{workshop_name} ({', '.join(label_filter)})"
+
+    if store is not None:
+        total_responses = store.count(workshop_filter, labels=label_filter)
     else:
-        workshop_name = "All Workshops"
+        # Filter by workshop
+        if workshop_filter:
+            df = df[df[COL_SESSION] == workshop_filter]
+
+        # Only keep responses tagged with the requested feedback themes
+        if label_filter:
+            df = filter_by_labels(df, label_filter)
+        total_responses = len(df)
     
-    if len(df) == 0:
+    if total_responses == 0:
         print(f"❌ No responses found for: {workshop_name}")
         return None
     
-    print(f"📊 Analyzing {len(df)} responses...")
-    
-    # Column references (with space fix)
-    COL_CONFIDENCE = 'How confident do you feel implementing what you learned today? '
-    COL_FACILITATOR_RATING = 'The facilitator today was:'
-    COL_PACE = 'Was the workshop pace/level right for you?'
-    COL_HANDS_ON = 'Did you create a hands-on deliverable today?'
-    COL_FEEDBACK = 'What did the facilitator do especially well? Any suggestions for improvement?'
-    COL_ONE_THING = "What's ONE thing you'll try this week based on today's workshop?"
+    print(f"📊 Analyzing {total_responses} responses...")
     
     # Calculate metrics
-    total_responses = len(df)
-    confidence_score = calculate_confidence_score(df, COL_CONFIDENCE)
-    facilitator_rating = analyze_facilitator_rating(df, COL_FACILITATOR_RATING)
-    pace_analysis = analyze_pace(df, COL_PACE)
-    hands_on_analysis = analyze_hands_on(df, COL_HANDS_ON)
-    
+    with telemetry.span('metrics', rows=total_responses):
+        if store is not None:
+            pushed_down = store.report_metrics(workshop_filter, labels=label_filter)
+            confidence_score = pushed_down['confidence']
+            facilitator_rating = pushed_down['facilitator_rating']
+            pace_analysis = pushed_down['pace']
+            hands_on_analysis = pushed_down['hands_on']
+            sentiment = pushed_down['sentiment']
+        else:
+            confidence_score = calculate_confidence_score(df)
+            facilitator_rating = analyze_facilitator_rating(df)
+            pace_analysis = analyze_pace(df)
+            hands_on_analysis = analyze_hands_on(df)
+            sentiment = summarize_sentiment(df)
+
     # Extract quotes
-    feedback_quotes = extract_top_quotes(df[COL_FEEDBACK], n=4)
-    action_quotes = extract_top_quotes(df[COL_ONE_THING], n=4)
-    
+    with telemetry.span('quotes', rows=total_responses):
+        if store is not None:
+            feedback_quotes = store.quotes(COL_FEEDBACK, workshop_filter, n=4, labels=label_filter)
+            action_quotes = store.quotes(COL_ONE_THING, workshop_filter, n=4, labels=label_filter)
+        else:
+            feedback_quotes = extract_top_quotes(
+                df[COL_FEEDBACK], n=4, mode='ranked',
+                sentiment=df.get(COL_FEEDBACK_SENTIMENT), clusters=df.get(COL_FEEDBACK_CLUSTER)
+            )
+            action_quotes = extract_top_quotes(
+                df[COL_ONE_THING], n=4, mode='ranked',
+                sentiment=df.get(COL_ONE_THING_SENTIMENT), clusters=df.get(COL_ONE_THING_CLUSTER)
+            )
+
     # Generate HTML
     html_content = f"""
     <!DOCTYPE html>
@@ -515,6 +553,16 @@ def generate_html_report(df, workshop_filter=None):
                         <li>🔄 Started but need to finish: {hands_on_analysis['followed']} builders</li>
                     </ul>
                 </div>
+                
+                <!-- SENTIMENT -->
+                <div class="section">
+                    <h3>💭 Feedback Sentiment</h3>
+                    <p>Average tone: <strong>{sentiment['average']:+.2f}</strong> (-1 negative to +1 positive) across {sentiment['scored']} written comments</p>
+                    <ul style="margin-left: 20px; margin-top: 10px; font-size: 13px;">
+                        <li>😊 Positive: {sentiment['positive_pct']:.0f}%</li>
+                        <li>😟 Negative: {sentiment['negative_pct']:.0f}%</li>
+                    </ul>
+                </div>
             </div>
         </div>
         
@@ -592,16 +640,22 @@ def generate_html_report(df, workshop_filter=None):
 # PDF GENERATION
 # ============================================
 
-def generate_pdf(html_content, workshop_name):
-    """Convert HTML to PDF using WeasyPrint"""
+def generate_pdf(html_content, workshop_name, filename=None):
+    """Convert HTML to PDF using WeasyPrint (timestamped filename unless one is given)"""
     print("🎨 Generating branded PDF...")
     
     try:
+        from weasyprint import HTML  # heavy (Pango/Cairo); only the PDF step needs it
+
         # Generate filename
-        filename = f"workshop_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        filename = filename or f"workshop_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         
         # Convert HTML to PDF
-        HTML(string=html_content).write_pdf(filename)
+        with telemetry.span('pdf_render') as span:
+            HTML(string=html_content).write_pdf(filename)
+            span['bytes'] = os.path.getsize(filename)
+        telemetry.count('reports_generated', format='pdf')
+        telemetry.count('pdf_bytes', span['bytes'])
         
         print(f"✅ PDF generated: {filename}")
         return filename
@@ -610,36 +664,219 @@ def generate_pdf(html_content, workshop_name):
         print(f"❌ Error generating PDF: {e}")
         return None
 
+def render_pdf_bytes(df, workshop_filter=None, label_filter=None, store=None):
+    """The report as PDF bytes (no file written), or None when nothing matches"""
+    html_content = generate_html_report(df, workshop_filter, label_filter, store=store)
+    if html_content is None:
+        return None
+    from weasyprint import HTML
+
+    with telemetry.span('pdf_render') as span:
+        pdf = HTML(string=html_content).write_pdf()
+        span['bytes'] = len(pdf)
+    telemetry.count('reports_generated', format='pdf')
+    telemetry.count('pdf_bytes', len(pdf))
+    return pdf
+
+# ============================================
+# ORGANIZER BUNDLE
+# ============================================
+
+# Extra styles for the bundle's cover, table of contents and page numbers
+BUNDLE_CSS = f"""
+    @page {{ @bottom-center {{ content: counter(page); font-size: 9px; color: {COLORS['text']}; }} }}
+    .bundle-cover {{ page-break-after: always; padding: 160px 60px; text-align: center; color: white;
+                     background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['accent']} 100%); }}
+    .bundle-cover h1 {{ font-family: 'Urbanist', sans-serif; font-size: 46px; font-weight: 800; margin: 20px 0; }}
+    .toc {{ page-break-after: always; padding: 60px; }}
+    .toc h2 {{ font-family: 'Urbanist', sans-serif; color: {COLORS['primary']}; margin-bottom: 24px; }}
+    .toc a {{ display: block; color: {COLORS['dark']}; text-decoration: none; font-size: 14px; padding: 8px 0;
+              border-bottom: 1px solid {COLORS['light_bg']}; }}
+    .toc a::after {{ content: leader('.') target-counter(attr(href), page); }}
+"""
+
+
+def _html_part(html_content, tag):
+    """Inner HTML of the first <tag> element of a generated report"""
+    match = re.search(rf'<{tag}[^>]*>(.*?)</{tag}>', html_content, re.S)
+    return match.group(1) if match else ''
+
+
+def generate_bundle_html(df, workshops=None, label_filter=None, store=None):
+    """Cover, table of contents and every workshop's report in one HTML document
+
+    Returns (html, [(workshop, anchor id), ...]) for the workshops that had responses.
+    """
+    if store is not None:
+        workshops = workshops or store.workshops()
+        total_responses = store.count(labels=label_filter)
+    else:
+        workshops = workshops or sorted(df[COL_SESSION].dropna().unique())
+        total_responses = len(filter_by_labels(df, label_filter) if label_filter else df)
+    sections, bodies, style = [], [], ''
+    for i, workshop in enumerate(workshops, 1):
+        html_content = generate_html_report(df, workshop, label_filter, store=store)
+        if html_content is None:
+            continue
+        # Every report carries the same stylesheet; it only needs parsing once
+        style = style or _html_part(html_content, 'style')
+        anchor = f'workshop-{i}'
+        sections.append((workshop, anchor))
+        bodies.append(f'<section id="{anchor}">{_html_part(html_content, "body")}</section>')
+
+    toc = '\n'.join(f'<a href="#{anchor}">{escape(workshop)}</a>' for workshop, anchor in sections)
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <title>#75HER Organizer Packet</title>
+        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=Urbanist:wght@600;700;800&display=swap" rel="stylesheet">
+        <style>{style}{BUNDLE_CSS}</style>
+    </head>
+    <body>
+        <div class="bundle-cover">
+            <div class="brand">📊 #75HER Workshop Analysis</div>
+            <h1>Organizer Packet</h1>
+            <p>{len(sections)} workshops • {total_responses} responses • {datetime.now().strftime('%B %d, %Y')}</p>
+        </div>
+        <div class="toc">
+            <h2>Contents</h2>
+            {toc}
+        </div>
+        {''.join(bodies)}
+    </body>
+    </html>
+    """
+    return html_content, sections
+
+
+def section_pages(document, sections):
+    """{workshop: page indexes} for a rendered bundle, found from each section's anchor"""
+    starts = {}
+    for index, page in enumerate(document.pages):
+        for workshop, anchor in sections:
+            if anchor in page.anchors:
+                starts.setdefault(workshop, index)
+    ordered = sorted(starts.items(), key=lambda item: item[1])
+    ends = [start for _, start in ordered[1:]] + [len(document.pages)]
+    return {workshop: list(range(start, end)) for (workshop, start), end in zip(ordered, ends)}
+
+
+def generate_pdf_bundle(df, workshops=None, label_filter=None, store=None, filename=None, split_dir=None):
+    """Lay out every workshop in a single WeasyPrint pass; optionally split it per workshop
+
+    Each workshop has one facilitator, so the split files are the facilitator
+    copies. They reuse the laid-out pages (Document.copy), with no second layout.
+    """
+    print("🎨 Generating organizer packet...")
+    html_content, sections = generate_bundle_html(df, workshops, label_filter, store)
+    if not sections:
+        print("❌ No workshops with responses to bundle")
+        return None
+
+    try:
+        from weasyprint import HTML
+
+        filename = filename or f"workshop_packet_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        with telemetry.span('pdf_render', workshops=len(sections)) as span:
+            document = HTML(string=html_content).render()
+            document.write_pdf(filename)
+            span['pages'] = len(document.pages)
+            span['bytes'] = os.path.getsize(filename)
+        telemetry.count('reports_generated', format='pdf_bundle')
+        telemetry.count('pdf_bytes', span['bytes'])
+        print(f"✅ Packet generated: {filename} ({span['pages']} pages, {len(sections)} workshops)")
+
+        if split_dir:
+            os.makedirs(split_dir, exist_ok=True)
+            with telemetry.span('pdf_split', workshops=len(sections)):
+                for workshop, pages in section_pages(document, sections).items():
+                    slug = re.sub(r'[^a-z0-9]+', '_', workshop.lower()).strip('_')[:60]
+                    path = os.path.join(split_dir, f'{slug}.pdf')
+                    document.copy(pages).write_pdf(path)
+                    print(f"   📄 {path} ({len(pages)} pages)")
+        return filename
+
+    except Exception as e:
+        print(f"❌ Error generating PDF packet: {e}")
+        return None
+
 # ============================================
 # MAIN EXECUTION
 # ============================================
 
+def parse_args():
+    """Optional flags; anything not given is asked for interactively"""
+    parser = argparse.ArgumentParser(description="Generate a branded PDF facilitator report from the 75HER survey sheet")
+    parser.add_argument('--workshop', choices=list(WORKSHOP_CHOICES), help="skip the workshop prompt")
+    parser.add_argument('--sources', default=SHEET_SOURCES_FILE,
+                        help="JSON list of spreadsheets/tabs to merge (default: %(default)s, else the main sheet)")
+    parser.add_argument('--db', metavar='PATH',
+                        help="sync new responses into this SQLite file and build the report from it "
+                             "(uses what is stored when the sheet can't be reached)")
+    parser.add_argument('--themes', help=f"comma-separated feedback themes ({', '.join(FEEDBACK_CATEGORIES)}), skips the theme prompt")
+    parser.add_argument('--bundle', action='store_true',
+                        help="one organizer packet (cover, contents, every workshop) instead of a single report")
+    parser.add_argument('--split', metavar='DIR', help="with --bundle, also save each workshop's pages as its own PDF")
+    return parser.parse_args()
+
+
 def main():
     """Main workflow"""
+    args = parse_args()
+    telemetry.service = 'workshop_report_pdf'
     print("="*60)
     print("   75HER WORKSHOP REPORT GENERATOR - PDF")
     print("="*60)
     print()
     
-    # Get data
-    df = get_survey_data()
-    
-    if df is None or len(df) == 0:
-        print("❌ No data available. Exiting.")
-        return
+    # Get data; with a store only the sheet's new rows are prepared, and the
+    # report is built from SQL without loading the history into pandas
+    store = None
+    if args.db:
+        df = None
+        store = open_store(args.db, raw=get_survey_data(args.sources, prepare=False))
+        if store.count() == 0:
+            print("❌ No data available. Exiting.")
+            return
+        workshop_count = len(store.workshops())
+    else:
+        df = get_survey_data(args.sources)
+        if df is None or len(df) == 0:
+            print("❌ No data available. Exiting.")
+            return
+        workshop_count = df[COL_SESSION].nunique()
     
-    print(f"\n📋 Found responses for {df['Which session did you attend?'].nunique()} workshop(s)")
+    print(f"\n📋 Found responses for {workshop_count} workshop(s)")
     print()
     
+    # Organizer packet: every workshop, no prompts
+    if args.bundle:
+        themes = args.themes or ''
+        label_filter = [t.strip().lower() for t in themes.split(',') if t.strip().lower() in FEEDBACK_CATEGORIES]
+        generate_pdf_bundle(df, label_filter=label_filter, store=store, split_dir=args.split)
+        return
+
     # Ask user which workshop
-    print("Which workshop would you like to analyze?")
-    print("1. All workshops (combined report)")
-    print("2. AI Agent Workshop")
-    print("3. Confidence VISIBLE Workshop")
-    print("4. Voice & Pitch Workshop")
-    print()
-    
-    choice = input("Enter number (1-4): ").strip()
+    if args.workshop:
+        choice = WORKSHOP_CHOICES[args.workshop]
+    else:
+        print("Which workshop would you like to analyze?")
+        print("1. All workshops (combined report)")
+        print("2. AI Agent Workshop")
+        print("3. Confidence VISIBLE Workshop")
+        print("4. Voice & Pitch Workshop")
+        print()
+    
+        choice = input("Enter number (1-4): ").strip()
+
+    themes = args.themes
+    if themes is None:
+        print()
+        print(f"Filter by feedback theme? ({', '.join(FEEDBACK_CATEGORIES)})")
+        themes = input("Enter themes separated by commas, or press Enter for all: ").strip()
+    label_filter = [t.strip().lower() for t in themes.split(',') if t.strip().lower() in FEEDBACK_CATEGORIES]
     
     workshop_filter = None
     workshop_name = "All Workshops"
@@ -656,7 +893,7 @@ def main():
     
     # Generate HTML report
     print("\n📈 Analyzing data...\n")
-    html_content = generate_html_report(df, workshop_filter)
+    html_content = generate_html_report(df, workshop_filter, label_filter, store=store)
     
     if html_content is None:
         return